@@ -1,6 +1,12 @@
 /*
  * JAUNDICE Robot Arduino Code (LED Expressions Version)
  * Controls LEDs for expressions based on serial commands from Python
+ *
+ * Speaks two protocols on the same port:
+ *  - legacy: single command letters, answered with a text line
+ *  - framed: 0xA5 | seq | length | commands | crc8, answered with an ack
+ *    frame. Each command is the letter plus a big-endian duration in ms
+ *    (0 = default). See expression_protocol.py for the Python side.
  */
 
 #include <Arduino.h>
@@ -18,8 +24,25 @@ const int SHORT_PULSE = 300;
 const int MEDIUM_PULSE = 500;
 const int LONG_PULSE = 1000;
 
+// Serial speed; Python tries 115200 first and falls back to 9600
+const long BAUD_RATE = 115200;
+
+// Framed protocol
+const byte FRAME_START = 0xA5;
+const byte MAX_PAYLOAD = 48;        // 16 commands of 3 bytes
+const byte STATUS_OK = 0;
+const byte STATUS_BAD_CHECKSUM = 1;
+const byte STATUS_UNKNOWN_COMMAND = 2;
+const byte STATUS_TOO_LONG = 3;
+const unsigned long FRAME_TIMEOUT = 100;  // drop a frame that stops arriving halfway (ms)
+
+byte frame[MAX_PAYLOAD + 2];        // seq, length, payload
+byte frameIndex = 0;
+bool inFrame = false;
+unsigned long frameStarted = 0;
+
 void setup() {
-  Serial.begin(9600);
+  Serial.begin(BAUD_RATE);
   
   // Setup LED pins
   pinMode(happyLED, OUTPUT);
@@ -37,7 +60,7 @@ void setup() {
   digitalWrite(statusLED, LOW);
   digitalWrite(builtInLED, LOW);
   
-  Serial.println("JAUNDICE Robot Ready!");
+  Serial.println("JAUNDICE Robot Ready! proto=2");
   
   // Startup sequence - flash all LEDs
   startupSequence();
@@ -59,67 +82,152 @@ void allLEDs(int state) {
   digitalWrite(builtInLED, state);
 }
 
+// Pulse length: the frame's duration if one was given, else the default.
+// unsigned long like delay() takes: an int overflows above 32767 ms on AVR
+unsigned long pulse(unsigned int duration, unsigned long fallback) {
+  return duration ? duration : fallback;
+}
+
+// Play one expression; returns false for an unknown command
+bool runCommand(char command, unsigned int duration, bool verbose) {
+  switch(command) {
+    case 'u': // Lights up / activate
+      digitalWrite(statusLED, HIGH);
+      digitalWrite(builtInLED, HIGH);
+      if (verbose) Serial.println("Activated!");
+      return true;
+      
+    case 'l': // Lights off / deactivate  
+      digitalWrite(statusLED, LOW);
+      digitalWrite(builtInLED, LOW);
+      if (verbose) Serial.println("Deactivated!");
+      return true;
+      
+    case 'U': // Uppercut expression (replaced with Angry pulse)
+      if (verbose) Serial.println("Angry!");
+      for(int i = 0; i < 3; i++) {
+        digitalWrite(angryLED, HIGH);
+        delay(pulse(duration, SHORT_PULSE));
+        digitalWrite(angryLED, LOW);
+        delay(pulse(duration, SHORT_PULSE));
+      }
+      return true;
+      
+    case 'p': // Punch expression (replaced with Quick Happy)
+      if (verbose) Serial.println("Happy!");
+      digitalWrite(happyLED, HIGH);
+      delay(pulse(duration, MEDIUM_PULSE));
+      digitalWrite(happyLED, LOW);
+      return true;
+      
+    case 's': // Smash expression (replaced with Sad)
+      if (verbose) Serial.println("Sad!");
+      digitalWrite(sadLED, HIGH);
+      delay(pulse(duration, LONG_PULSE));
+      digitalWrite(sadLED, LOW);
+      return true;
+      
+    case 'h': // Hand wave (replaced with Thinking pattern)
+      if (verbose) Serial.println("Thinking!");
+      for(int i = 0; i < 3; i++) {
+        digitalWrite(thinkingLED, HIGH);
+        delay(pulse(duration, MEDIUM_PULSE));
+        digitalWrite(thinkingLED, LOW);
+        delay(SHORT_PULSE);
+      }
+      return true;
+
+    case 'a': // All LEDs on (new expression - Surprise)
+      if (verbose) Serial.println("Surprised!");
+      allLEDs(HIGH);
+      delay(pulse(duration, MEDIUM_PULSE));
+      allLEDs(LOW);
+      return true;
+
+    case 'V': // Protocol probe (framed only), nothing to show
+      if (!verbose) return true;
+      break;
+  }
+  if (verbose) Serial.println("Unknown command: " + String(command));
+  return false;
+}
+
+// CRC-8, polynomial 0x07 (same as crc8() in expression_protocol.py)
+byte crc8(const byte *data, byte length) {
+  byte crc = 0;
+  for (byte i = 0; i < length; i++) {
+    crc ^= data[i];
+    for (byte bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void sendAck(byte seq, byte status) {
+  byte ack[3] = {seq, 1, status};
+  Serial.write(FRAME_START);
+  Serial.write(ack, 3);
+  Serial.write(crc8(ack, 3));
+}
+
+// Acknowledge a complete frame, then play its commands in order
+void handleFrame(byte checksum) {
+  byte seq = frame[0];
+  byte length = frame[1];
+  if (crc8(frame, length + 2) != checksum) {
+    sendAck(seq, STATUS_BAD_CHECKSUM);
+    return;
+  }
+  bool known = true;
+  for (byte i = 2; i + 3 <= length + 2; i += 3) {
+    if (frame[i] == 0 || strchr("VulUpsha", frame[i]) == NULL) {
+      known = false;
+    }
+  }
+  sendAck(seq, known ? STATUS_OK : STATUS_UNKNOWN_COMMAND);
+  for (byte i = 2; i + 3 <= length + 2; i += 3) {
+    unsigned int duration = ((unsigned int)frame[i + 1] << 8) | frame[i + 2];
+    runCommand(frame[i], duration, false);
+  }
+}
+
+// Feed one received byte to the frame parser
+void readFrameByte(byte value) {
+  if (frameIndex < 2) {
+    frame[frameIndex++] = value;
+    if (frameIndex == 2 && frame[1] > MAX_PAYLOAD) {
+      sendAck(frame[0], STATUS_TOO_LONG);
+      inFrame = false;
+    }
+    return;
+  }
+  if (frameIndex < frame[1] + 2) {
+    frame[frameIndex++] = value;
+    return;
+  }
+  inFrame = false;
+  handleFrame(value);
+}
+
 void loop() {
+  // Give up on a frame that stopped arriving
+  if (inFrame && millis() - frameStarted > FRAME_TIMEOUT) {
+    inFrame = false;
+  }
+
   if (Serial.available() > 0) {
-    char command = Serial.read();
-    
-    switch(command) {
-      case 'u': // Lights up / activate
-        digitalWrite(statusLED, HIGH);
-        digitalWrite(builtInLED, HIGH);
-        Serial.println("Activated!");
-        break;
-        
-      case 'l': // Lights off / deactivate  
-        digitalWrite(statusLED, LOW);
-        digitalWrite(builtInLED, LOW);
-        Serial.println("Deactivated!");
-        break;
-        
-      case 'U': // Uppercut expression (replaced with Angry pulse)
-        Serial.println("Angry!");
-        for(int i = 0; i < 3; i++) {
-          digitalWrite(angryLED, HIGH);
-          delay(SHORT_PULSE);
-          digitalWrite(angryLED, LOW);
-          delay(SHORT_PULSE);
-        }
-        break;
-        
-      case 'p': // Punch expression (replaced with Quick Happy)
-        Serial.println("Happy!");
-        digitalWrite(happyLED, HIGH);
-        delay(MEDIUM_PULSE);
-        digitalWrite(happyLED, LOW);
-        break;
-        
-      case 's': // Smash expression (replaced with Sad)
-        Serial.println("Sad!");
-        digitalWrite(sadLED, HIGH);
-        delay(LONG_PULSE);
-        digitalWrite(sadLED, LOW);
-        break;
-        
-      case 'h': // Hand wave (replaced with Thinking pattern)
-        Serial.println("Thinking!");
-        for(int i = 0; i < 3; i++) {
-          digitalWrite(thinkingLED, HIGH);
-          delay(MEDIUM_PULSE);
-          digitalWrite(thinkingLED, LOW);
-          delay(SHORT_PULSE);
-        }
-        break;
-
-      case 'a': // All LEDs on (new expression - Surprise)
-        Serial.println("Surprised!");
-        allLEDs(HIGH);
-        delay(MEDIUM_PULSE);
-        allLEDs(LOW);
-        break;
-        
-      default:
-        Serial.println("Unknown command: " + String(command));
-        break;
+    byte value = Serial.read();
+
+    if (inFrame) {
+      readFrameByte(value);
+    } else if (value == FRAME_START) {
+      inFrame = true;
+      frameIndex = 0;
+      frameStarted = millis();
+    } else {
+      // Legacy single-letter command
+      runCommand((char)value, 0, true);
     }
   }
 }
@@ -0,0 +1,161 @@
+"""
+Persistent microphone capture for Jarvis
+Opens the microphone once, keeps a background thread reading frames into a
+bounded ring buffer, and lets the speech recognizer read phrases from it.
+"""
+
+import audioop                    # for audio energy calculations
+import collections                # for the ring buffer
+import threading                  # for the capture thread
+import time                       # for frame timestamps
+
+import speech_recognition as sr   # voice recognition library
+
+
+class BufferedMicrophone(sr.AudioSource):
+    """A microphone that is opened once and read through a ring buffer
+
+    The capture thread never stops between turns, so frames spoken while
+    Jarvis was busy are still waiting in the buffer for the next listen().
+    """
+
+    live = True
+    backend = None                    # transcripts come from the configured recognizer
+
+    def __init__(self, device_index=None, sample_rate=None, chunk_size=1024, buffer_seconds=10, calibration_seconds=0.5,
+                 microphone=None):
+        if microphone is None:
+            microphone = sr.Microphone(device_index=device_index, sample_rate=sample_rate, chunk_size=chunk_size)
+        self.microphone = microphone
+        self.SAMPLE_RATE = self.microphone.SAMPLE_RATE
+        self.SAMPLE_WIDTH = self.microphone.SAMPLE_WIDTH
+        self.CHUNK = self.microphone.CHUNK
+
+        seconds_per_buffer = float(self.CHUNK) / self.SAMPLE_RATE
+        self.frames = collections.deque(maxlen=max(1, int(buffer_seconds / seconds_per_buffer)))
+        # Recent frames are also kept here for calibration, even after the recognizer consumed them
+        self.history = collections.deque(maxlen=max(1, int(calibration_seconds / seconds_per_buffer)))
+        self.captured_frames = 0
+        self.calibrated_frames = 0     # captured_frames at the last calibrate(), so no frame is used twice
+        self.dropped_frames = 0
+        self.last_frame_at = None      # when the capture thread last got audio
+
+        self.stream = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Open the microphone and start the capture thread"""
+        if self._running:
+            return self
+        self.microphone.__enter__()
+        if self.microphone.stream is None:
+            raise OSError("Could not open the microphone stream")
+        self._running = True
+        self.stream = BufferedMicrophone.BufferStream(self)
+        self._thread = threading.Thread(target=self._capture_loop, name="mic-capture", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the capture thread and close the microphone"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+        try:
+            self.microphone.__exit__(None, None, None)
+        except Exception:
+            pass
+        self.stream = None
+
+    @property
+    def alive(self):
+        """True while the capture thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _capture_loop(self):
+        """Read frames from the microphone for as long as we are running"""
+        while self._running:
+            try:
+                frame = self.microphone.stream.read(self.CHUNK)
+            except Exception as e:
+                print(f"\nMicrophone capture error: {e}")
+                time.sleep(0.1)
+                continue
+
+            with self._condition:
+                if len(self.frames) == self.frames.maxlen:
+                    self.dropped_frames += 1  # oldest frame is about to be overwritten
+                self.frames.append(frame)
+                self.history.append(frame)
+                self.captured_frames += 1
+                self.last_frame_at = time.time()
+                self._condition.notify_all()
+
+    def read_frame(self, timeout=None):
+        """Take the oldest buffered frame, waiting for one if needed"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.frames or not self._running, timeout=timeout):
+                return b""
+            if not self.frames:
+                return b""  # stopped, tell the recognizer the stream has ended
+            return self.frames.popleft()
+
+    def unread(self, frames):
+        """Put frames back at the front of the buffer so they are read next"""
+        with self._condition:
+            for frame in reversed(list(frames)):
+                self.frames.appendleft(frame)
+            self._condition.notify_all()
+
+    def discard_pending(self):
+        """Drop frames that have not been read yet (e.g. Jarvis' own voice)"""
+        with self._condition:
+            self.frames.clear()
+
+    def calibrate(self, recognizer):
+        """Adjust the recognizer's energy threshold from frames already buffered
+
+        Uses the same weighted average as Recognizer.adjust_for_ambient_noise(),
+        but on audio we already have instead of blocking to record new audio.
+        Only frames captured since the last calibration are used.
+        """
+        with self._condition:
+            new = min(self.captured_frames - self.calibrated_frames, len(self.history))
+            recent = list(self.history)[len(self.history) - new:]
+            self.calibrated_frames = self.captured_frames
+        if not recent:
+            return recognizer.energy_threshold
+
+        seconds_per_buffer = float(self.CHUNK) / self.SAMPLE_RATE
+        damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_buffer
+        for frame in recent:
+            energy = audioop.rms(frame, self.SAMPLE_WIDTH)
+            if energy > recognizer.energy_threshold:
+                continue  # probably speech, don't calibrate on it
+            target_energy = energy * recognizer.dynamic_energy_ratio
+            recognizer.energy_threshold = recognizer.energy_threshold * damping + target_energy * (1 - damping)
+        return recognizer.energy_threshold
+
+    def __enter__(self):
+        # The stream stays open across turns, so entering just makes sure it is running
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    class BufferStream(object):
+        """Stream object handed to the recognizer, backed by the ring buffer"""
+
+        def __init__(self, microphone):
+            self.microphone = microphone
+
+        def read(self, size):
+            return self.microphone.read_frame()
+
+        def close(self):
+            pass
@@ -0,0 +1,245 @@
+"""
+Structured command log for Jarvis
+Commands are written as JSON lines by a background thread that batches
+writes, so logging never blocks the main loop. The log rotates by size
+and age, and the reader streams the rotated files to report latency
+percentiles over weeks of history in constant memory.
+
+Usage:
+    python command_log.py [--days 28] [--intent weather]
+"""
+
+import argparse                   # for the report command line
+import glob                       # for finding rotated logs
+import json                       # for the record format
+import math                       # for histogram buckets
+import os                         # for file paths and sizes
+import queue                      # for the bounded write queue
+import threading                  # for the writer thread
+import time                       # for rotation and flush timing
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILE = os.path.join(BASE_DIR, "command_log.jsonl")
+
+MAX_BYTES = 1024 * 1024         # rotate after 1 MB...
+ROTATE_SECONDS = 24 * 3600      # ...or once a day, whichever comes first
+BACKUP_COUNT = 60               # rotated files to keep (about two months)
+QUEUE_SIZE = 1000               # records waiting to be written before new ones are dropped
+FLUSH_INTERVAL = 1.0            # seconds between batched writes
+BATCH_SIZE = 100
+
+# Latency fields reported by the reader, in milliseconds
+LATENCY_FIELDS = ["recognizer_ms", "handler_ms", "tts_ms"]
+
+
+class CommandLog(object):
+    """Writes command records as JSON lines on a background thread"""
+
+    def __init__(self, path=LOG_FILE, max_bytes=MAX_BYTES, rotate_seconds=ROTATE_SECONDS,
+                 backup_count=BACKUP_COUNT, queue_size=QUEUE_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self._file_started = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the writer thread if it isn't running yet"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="command-log", daemon=True)
+                self._thread.start()
+        return self
+
+    def write(self, record):
+        """Queue a record (a dict) without blocking; returns False if it was dropped"""
+        record.setdefault('ts', datetime.now().isoformat(timespec='milliseconds'))
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout=5):
+        """Write everything still queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            deadline = time.time() + self.flush_interval
+            while len(batch) < BATCH_SIZE:
+                try:
+                    record = self._queue.get(timeout=max(0.0, deadline - time.time()))
+                except queue.Empty:
+                    break
+                if record is None:
+                    stopping = True
+                    break
+                batch.append(record)
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        try:
+            if self._should_rotate():
+                self._rotate()
+            lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self.written += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            print(f"Error writing command log: {e}")
+
+    def _should_rotate(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if stat.st_size >= self.max_bytes:
+            return True
+        if self._file_started is None:
+            self._file_started = _started_at(self.path, stat)
+        return time.time() - self._file_started >= self.rotate_seconds
+
+    def _rotate(self):
+        """Rename the current log with its start time and prune old ones"""
+        started = self._file_started or _started_at(self.path)
+        self._file_started = None
+        stamp = datetime.fromtimestamp(started).strftime("%Y%m%d-%H%M%S")
+        root, ext = os.path.splitext(self.path)
+        target = f"{root}.{stamp}{ext}"
+        suffix = 1
+        while os.path.exists(target):
+            target = f"{root}.{stamp}-{suffix}{ext}"
+            suffix += 1
+        os.replace(self.path, target)
+        self.rotations += 1
+        for old in rotated_files(self.path)[:-self.backup_count or None]:
+            os.remove(old)
+
+
+def _started_at(path, stat=None):
+    """When the log file was started, taken from its first record"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            first = json.loads(f.readline())
+        return datetime.fromisoformat(first['ts']).timestamp()
+    except Exception:
+        return (stat or os.stat(path)).st_mtime
+
+
+def rotated_files(path=LOG_FILE):
+    """Rotated logs for path, oldest first"""
+    root, ext = os.path.splitext(path)
+    return sorted(glob.glob(f"{glob.escape(root)}.*{ext}"))
+
+
+def iter_records(path=LOG_FILE, since=None):
+    """Stream records from the rotated logs and the current one, oldest first
+
+    since is a Unix time; whole files last written before it are skipped
+    without being opened.
+    """
+    since_ts = datetime.fromtimestamp(since).isoformat() if since else None
+    for name in rotated_files(path) + [path]:
+        try:
+            if since and os.path.getmtime(name) < since:
+                continue
+            f = open(name, "r", encoding="utf-8")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # partial line from a crash
+                if since_ts and record.get('ts', '') < since_ts:  # ISO timestamps sort as text
+                    continue
+                yield record
+
+
+class LatencyHistogram(object):
+    """Percentiles in constant memory using buckets 5% apart"""
+
+    GROWTH = 1.05
+    SMALLEST = 0.1  # ms
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.maximum = 0.0
+
+    def add(self, value_ms):
+        index = 0 if value_ms <= self.SMALLEST else int(math.ceil(math.log(value_ms / self.SMALLEST, self.GROWTH)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.maximum = max(self.maximum, value_ms)
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (nearest rank)"""
+        if not self.count:
+            return None
+        rank = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.SMALLEST * self.GROWTH ** index, self.maximum)
+        return self.maximum
+
+
+def latency_report(records, fields=LATENCY_FIELDS, intent=None):
+    """Build {field: LatencyHistogram} from a stream of records"""
+    histograms = dict((field, LatencyHistogram()) for field in fields)
+    for record in records:
+        if intent and record.get('intent') != intent:
+            continue
+        for field in fields:
+            value = record.get(field)
+            if value is not None:
+                histograms[field].add(value)
+    return histograms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency percentiles from the Jarvis command log")
+    parser.add_argument("--log", default=LOG_FILE, help="path of the current log file")
+    parser.add_argument("--days", type=float, default=28, help="how far back to look (0 for everything)")
+    parser.add_argument("--intent", help="only count commands routed to this intent")
+    args = parser.parse_args()
+
+    since = time.time() - args.days * 86400 if args.days else None
+    started = time.time()
+    histograms = latency_report(iter_records(args.log, since), intent=args.intent)
+    elapsed = time.time() - started
+
+    print(f"{'field':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for field, histogram in histograms.items():
+        if not histogram.count:
+            print(f"{field:<16}{0:>8}")
+            continue
+        p50, p95, p99 = (histogram.percentile(p) for p in (50, 95, 99))
+        print(f"{field:<16}{histogram.count:>8}{p50:>10.0f}{p95:>10.0f}{p99:>10.0f}{histogram.maximum:>10.0f}")
+    print(f"\n(read in {elapsed:.2f} s, latencies in ms)")
+
+
+if __name__ == "__main__":
+    main()
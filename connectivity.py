@@ -0,0 +1,136 @@
+"""
+Connectivity monitor for Jarvis
+Probes a host with short TCP connects on a background thread and keeps a
+cached online/offline state with hysteresis, so the rest of Jarvis can go
+straight to its offline paths instead of waiting on a doomed request.
+
+The probe target defaults to www.google.com:80 and can be changed with
+the JARVIS_PROBE environment variable (host:port), e.g. to a local
+stand-in in tests.
+"""
+
+import os                         # for the probe target setting
+import socket                     # for the probe connection
+import threading                  # for the probe thread
+import time                       # for probe timing
+
+DEFAULT_TARGET = ("www.google.com", 80)
+
+UNKNOWN = "unknown"
+ONLINE = "online"
+OFFLINE = "offline"
+
+
+def probe_target(value=None):
+    """(host, port) from a "host:port" string, JARVIS_PROBE or the default"""
+    value = value or os.environ.get("JARVIS_PROBE")
+    if not value:
+        return DEFAULT_TARGET
+    host, _, port = value.rpartition(":")
+    return (host or value, int(port) if host else 80)
+
+
+class ConnectivityMonitor(object):
+    """Cached reachability of the internet, kept up to date by a probe thread
+
+    The state only flips after `up_after` successful or `down_after`
+    failed probes in a row, so one lost packet doesn't send Jarvis
+    offline. While offline the probe runs more often, to notice quickly
+    when the connection is back.
+    """
+
+    def __init__(self, target=None, interval=15.0, offline_interval=3.0, timeout=1.5,
+                 up_after=2, down_after=2, connect=socket.create_connection):
+        self.target = target or probe_target()
+        self.interval = interval
+        self.offline_interval = offline_interval
+        self.timeout = timeout
+        self.up_after = up_after
+        self.down_after = down_after
+        self.connect = connect
+        self.state = UNKNOWN
+        self.changed_at = time.time()
+        self.probes = 0
+        self.failures = 0
+        self.transitions = 0
+        self.last_latency = None
+        self.last_error = None
+        self.listeners = []
+        self._streak = 0              # consecutive probes that disagree with the state
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @property
+    def online(self):
+        """False only once the connection is known to be down; never blocks"""
+        return self.state != OFFLINE
+
+    def probe(self):
+        """One connection attempt to the target; True if it answered"""
+        started = time.time()
+        self.probes += 1
+        try:
+            with self.connect(self.target, timeout=self.timeout):
+                pass
+        except OSError as e:
+            self.failures += 1
+            self.last_error = str(e)
+            return False
+        self.last_latency = time.time() - started
+        return True
+
+    def record(self, reachable):
+        """Feed a probe result through the hysteresis; returns the state"""
+        with self._lock:
+            wanted = ONLINE if reachable else OFFLINE
+            if self.state == wanted:
+                self._streak = 0
+                return self.state
+            self._streak += 1
+            needed = self.up_after if reachable else self.down_after
+            # The first result decides straight away; after that it takes a streak
+            if self.state != UNKNOWN and self._streak < needed:
+                return self.state
+            self.state = wanted
+            self._streak = 0
+            self.changed_at = time.time()
+            self.transitions += 1
+            listeners = list(self.listeners)
+        print(f"\n🌐 Internet connection is {wanted}")
+        for listener in listeners:
+            try:
+                listener(wanted == ONLINE)
+            except Exception as e:
+                print(f"Connectivity listener failed: {e}")
+        return wanted
+
+    def check_now(self):
+        """Ask the probe thread for an early probe (e.g. after a request failed)"""
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="connectivity", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.record(self.probe())
+            # Confirm a change quickly, otherwise probe at the normal pace
+            if self._streak or self.state == OFFLINE:
+                wait = self.offline_interval
+            else:
+                wait = self.interval
+            self._wake.wait(wait)
+            self._wake.clear()
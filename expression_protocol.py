@@ -0,0 +1,155 @@
+"""
+Framed expression protocol for Jarvis
+Compact binary frames between Python and the Arduino sketches:
+
+    0xA5 | seq | length | payload (length bytes) | crc8(seq, length, payload)
+
+A host frame carries up to MAX_COMMANDS commands of three bytes each: the
+legacy command letter followed by a big-endian duration in milliseconds
+(0 keeps the sketch's default). The board answers every frame with an
+ack frame whose payload is one status byte. Bytes outside a frame are the
+legacy single-letter commands (host to board) or text lines (board to
+host), so old sketches keep working.
+"""
+
+import collections                # for the frame type
+import struct                     # for packing durations
+
+START = 0xA5
+PROBE_SEQ = 0                     # sequence number reserved for the protocol probe
+PROBE = b'V'                      # no-op command; only framed sketches acknowledge it
+MAX_COMMANDS = 16                 # keeps a frame well inside the Arduino's 64-byte receive buffer
+MAX_PAYLOAD = MAX_COMMANDS * 3
+COMMAND_SIZE = 3
+
+# Ack status bytes
+STATUS_OK = 0
+STATUS_BAD_CHECKSUM = 1
+STATUS_UNKNOWN_COMMAND = 2
+STATUS_TOO_LONG = 3
+STATUS_NAMES = {
+    STATUS_OK: "ok",
+    STATUS_BAD_CHECKSUM: "bad checksum",
+    STATUS_UNKNOWN_COMMAND: "unknown command",
+    STATUS_TOO_LONG: "too long",
+}
+
+Frame = collections.namedtuple('Frame', ['seq', 'payload'])
+
+
+def _crc8_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return table
+
+
+CRC8_TABLE = _crc8_table()
+
+
+def crc8(data, crc=0):
+    """CRC-8 (polynomial 0x07), the same as crc8() in the sketches"""
+    for byte in data:
+        crc = CRC8_TABLE[crc ^ byte]
+    return crc
+
+
+def encode_frame(seq, payload):
+    """Wrap a payload in a frame"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"payload of {len(payload)} bytes is over the {MAX_PAYLOAD} byte limit")
+    header = bytes((seq & 0xFF, len(payload)))
+    return bytes((START,)) + header + payload + bytes((crc8(header + payload),))
+
+
+def encode_commands(seq, commands):
+    """Frame a list of (command byte, duration in ms) pairs"""
+    if not commands or len(commands) > MAX_COMMANDS:
+        raise ValueError(f"a frame carries 1 to {MAX_COMMANDS} commands, not {len(commands)}")
+    payload = b"".join(code + struct.pack(">H", min(int(duration or 0), 0xFFFF)) for code, duration in commands)
+    return encode_frame(seq, payload)
+
+
+def decode_commands(payload):
+    """Split a command payload back into (command byte, duration) pairs"""
+    if len(payload) % COMMAND_SIZE:
+        raise ValueError("truncated command")
+    return [(payload[i:i + 1], struct.unpack(">H", payload[i + 1:i + 3])[0])
+            for i in range(0, len(payload), COMMAND_SIZE)]
+
+
+def encode_ack(seq, status=STATUS_OK):
+    return encode_frame(seq, bytes((status,)))
+
+
+def probe_frame():
+    """The frame sent to find out whether the sketch speaks this protocol"""
+    return encode_commands(PROBE_SEQ, [(PROBE, 0)])
+
+
+class Decoder(object):
+    """Splits a byte stream into frames and legacy traffic
+
+    feed() returns a list of events:
+        ('frame', Frame)          a frame with a valid checksum
+        ('error', (seq, reason))  a corrupt frame, which is dropped
+        ('line', text)            a text line, when legacy='lines' (board to host)
+        ('byte', b'x')            a legacy command byte, when legacy='bytes' (host to board)
+    """
+
+    def __init__(self, legacy='lines'):
+        self.legacy = legacy
+        self.frames = 0
+        self.errors = 0
+        self._buffer = bytearray()
+        self._line = bytearray()
+
+    def feed(self, data):
+        self._buffer += data
+        events = []
+        buffer = self._buffer
+        while buffer:
+            if buffer[0] != START:
+                # Legacy traffic up to the next frame
+                end = buffer.find(START)
+                end = len(buffer) if end < 0 else end
+                self._legacy(bytes(buffer[:end]), events)
+                del buffer[:end]
+                continue
+
+            if len(buffer) < 3:
+                break
+            length = buffer[2]
+            if length > MAX_PAYLOAD:
+                # The length can't be trusted, so look for the next start byte
+                self.errors += 1
+                events.append(('error', (buffer[1], "frame too long")))
+                del buffer[:1]
+                continue
+            if len(buffer) < 4 + length:
+                break
+            body = bytes(buffer[1:3 + length])
+            if crc8(body) != buffer[3 + length]:
+                self.errors += 1
+                events.append(('error', (body[0], "bad checksum")))
+                del buffer[:4 + length]
+                continue
+            self.frames += 1
+            events.append(('frame', Frame(body[0], body[2:])))
+            del buffer[:4 + length]
+        return events
+
+    def _legacy(self, data, events):
+        if self.legacy == 'bytes':
+            events.extend(('byte', data[i:i + 1]) for i in range(len(data)))
+            return
+        self._line += data
+        while b"\n" in self._line:
+            line, _, rest = bytes(self._line).partition(b"\n")
+            self._line = bytearray(rest)
+            text = line.decode(errors='replace').strip()
+            if text:
+                events.append(('line', text))
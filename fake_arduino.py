@@ -0,0 +1,123 @@
+"""
+Fake Arduino for Jarvis tests
+Emulates arduino_led_expressions.ino on a pseudo-terminal, so the serial
+code can be tested with a real serial port but without the board. The
+expressions answer instantly unless a delay is set. With framed=False it
+behaves like the older sketches that only understand single bytes.
+"""
+
+import os                         # for the pseudo-terminal
+import select                     # for waiting on input
+import threading                  # for the board thread
+import time                       # for the simulated LED patterns
+import tty                        # for raw mode on the pseudo-terminal
+
+import expression_protocol        # framed protocol encoder/decoder
+
+REPLIES = {
+    b'u': "Activated!",
+    b'l': "Deactivated!",
+    b'U': "Angry!",
+    b'p': "Happy!",
+    b's': "Sad!",
+    b'h': "Thinking!",
+    b'a': "Surprised!",
+}
+
+
+class FakeArduino(object):
+    """A pseudo-terminal that answers like the LED expressions sketch"""
+
+    def __init__(self, delay=0.0, ready=True, framed=True):
+        self.delay = delay            # how long each expression "plays"
+        self.ready = ready            # print the ready banner like setup() does
+        self.framed = framed          # understand the framed protocol
+        self.corrupt_next = False     # flip a bit in the next frame, like line noise
+        self.received = []
+        self.durations = []
+        self.frames = 0
+        self.master = None
+        self.path = None
+        self._thread = None
+        self._running = False
+
+    def plug_in(self):
+        """Create a new pseudo-terminal and start answering on it"""
+        self.master, slave = os.openpty()
+        tty.setraw(slave)
+        self.path = os.ttyname(slave)
+        self._slave = slave
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="fake-arduino", daemon=True)
+        self._thread.start()
+        if self.ready:
+            self.println("JAUNDICE Robot Ready! proto=2" if self.framed else "JAUNDICE Robot Ready!")
+        return self.path
+
+    def unplug(self):
+        """Close the pseudo-terminal, like pulling the USB cable"""
+        self._running = False
+        if self._thread:
+            self._thread.join(1)
+            self._thread = None
+        for fd in (self.master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.master = None
+        self.path = None
+
+    def println(self, text):
+        os.write(self.master, (text + "\r\n").encode())
+
+    def _run(self):
+        master = self.master
+        decoder = expression_protocol.Decoder(legacy='bytes')
+        while self._running:
+            readable, _, _ = select.select([master], [], [], 0.05)
+            if not readable:
+                continue
+            try:
+                data = os.read(master, 1024)
+            except OSError:
+                break
+            if not self.framed:
+                for i in range(len(data)):
+                    self.handle(data[i:i + 1])
+                continue
+            if self.corrupt_next and expression_protocol.START in data:
+                self.corrupt_next = False
+                index = data.index(expression_protocol.START) + 3
+                data = data[:index] + bytes((data[index] ^ 0x01,)) + data[index + 1:]
+            for kind, value in decoder.feed(data):
+                if kind == 'byte':
+                    self.handle(value)
+                elif kind == 'error':
+                    os.write(master, expression_protocol.encode_ack(value[0], expression_protocol.STATUS_BAD_CHECKSUM))
+                else:
+                    self.handle_frame(value)
+
+    def handle_frame(self, frame):
+        """Record a frame's commands, acknowledge it, then play them"""
+        self.frames += 1
+        commands = expression_protocol.decode_commands(frame.payload)
+        known = all(code in REPLIES or code == expression_protocol.PROBE for code, _ in commands)
+        status = expression_protocol.STATUS_OK if known else expression_protocol.STATUS_UNKNOWN_COMMAND
+        played = [(code, duration) for code, duration in commands if code in REPLIES]
+        # Recorded before the ack, so a test that saw the link go idle also sees the commands
+        for code, duration in played:
+            self.received.append(code)
+            self.durations.append(duration)
+        os.write(self.master, expression_protocol.encode_ack(frame.seq, status))
+        for _ in played:
+            if self.delay:
+                time.sleep(self.delay)
+
+    def handle(self, command):
+        """Answer one legacy command byte"""
+        self.received.append(command)
+        reply = REPLIES.get(command)
+        self.println(reply if reply else "Unknown command: " + command.decode(errors='replace'))
+        if self.delay:
+            time.sleep(self.delay)
@@ -0,0 +1,169 @@
+"""
+Shared HTTP client for Jarvis
+One keep-alive session for all web lookups, with per-endpoint connect/read
+timeouts, bounded retries and a TTL cache that serves stale answers while
+it refreshes them in the background.
+"""
+
+import collections                # for the cached result type
+import json                       # for decoding cached JSON bodies
+import threading                  # for the cache lock and background refreshes
+import time                       # for cache ages
+
+# Per-endpoint settings: (connect, read) timeouts in seconds, how long an
+# answer stays fresh, and how much longer a stale answer may still be served
+ENDPOINTS = {
+    'weather': {'timeout': (3.05, 5), 'ttl': 10 * 60, 'stale_ttl': 30 * 60},
+    # Not cached here: location_service keeps the location on disk and refreshes it hourly
+    'geolocation': {'timeout': (3.05, 5), 'ttl': 0, 'stale_ttl': 0},
+    'default': {'timeout': (3.05, 10), 'ttl': 0, 'stale_ttl': 0},
+}
+
+RETRIES = 2  # extra attempts for connection errors and 429/5xx answers
+
+
+class OfflineError(IOError):
+    """Raised instead of sending a request while the connection is known to be down"""
+
+
+class HttpResult(collections.namedtuple('HttpResult', ['status_code', 'text', 'fetched_at', 'from_cache'])):
+    """The parts of a response Jarvis uses, safe to keep in the cache"""
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HttpClient(object):
+    """Keep-alive session with timeouts, retries and a TTL cache"""
+
+    def __init__(self, endpoints=None, retries=RETRIES, backoff_factor=0.3):
+        self.endpoints = dict(ENDPOINTS)
+        self.endpoints.update(endpoints or {})
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.cache = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.observer = None          # observer(endpoint, seconds) after every request, even failed ones
+        self.online = None            # online() -> False skips the network and answers from the cache
+        self._session = None
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The shared requests session, created on first use"""
+        if self._session is None:
+            import requests                   # for API requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(total=self.retries, connect=self.retries, read=self.retries,
+                          status=self.retries, backoff_factor=self.backoff_factor,
+                          status_forcelist=[429, 500, 502, 503, 504],
+                          allowed_methods=["GET"], raise_on_status=False)
+            adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=4)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def settings(self, endpoint):
+        return self.endpoints.get(endpoint, self.endpoints['default'])
+
+    def get(self, url, endpoint='default', params=None):
+        """GET url, answering from the cache when the endpoint allows it"""
+        settings = self.settings(endpoint)
+        key = (url, tuple(sorted((params or {}).items())))
+
+        with self._lock:
+            cached = self.cache.get(key)
+        if cached and settings['ttl']:
+            age = time.time() - cached.fetched_at
+            if age < settings['ttl']:
+                self.hits += 1
+                return cached._replace(from_cache=True)
+            if age < settings['ttl'] + settings['stale_ttl']:
+                # Serve the stale answer now and refresh it for next time
+                self.stale_hits += 1
+                self._refresh_in_background(key, url, endpoint, params)
+                return cached._replace(from_cache=True)
+
+        if self.online is not None and not self.online():
+            if cached and settings['ttl']:
+                # Better an old answer now than a timeout later
+                self.stale_hits += 1
+                return cached._replace(from_cache=True)
+            raise OfflineError(f"Not requesting {url}, there is no internet connection")
+
+        self.misses += 1
+        try:
+            result = self._fetch(key, url, endpoint, params)
+        except Exception:
+            if cached and settings['ttl']:
+                print(f"Using cached answer for {url}, the request failed")
+                return cached._replace(from_cache=True)
+            raise
+        if result.status_code >= 500 and cached and settings['ttl']:
+            print(f"Using cached answer for {url}, the server answered {result.status_code}")
+            return cached._replace(from_cache=True)
+        return result
+
+    def _fetch(self, key, url, endpoint, params):
+        started = time.time()
+        try:
+            response = self.session.get(url, params=params, timeout=self.settings(endpoint)['timeout'])
+        finally:
+            if self.observer:
+                self.observer(endpoint, time.time() - started)
+        result = HttpResult(response.status_code, response.text, time.time(), False)
+        if response.status_code == 200 and self.settings(endpoint)['ttl']:
+            with self._lock:
+                self.cache[key] = result
+        return result
+
+    def _refresh_in_background(self, key, url, endpoint, params):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._fetch(key, url, endpoint, params)
+            except Exception as e:
+                print(f"Background refresh of {url} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="http-refresh", daemon=True).start()
+
+    def reset(self):
+        """Close the session and its pooled connections; the next request opens new ones"""
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    def clear(self):
+        """Forget all cached answers"""
+        with self._lock:
+            self.cache.clear()
+
+
+_client = None
+
+
+def get_client():
+    """The process-wide HTTP client"""
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+
+def get(url, endpoint='default', params=None):
+    """GET through the process-wide client"""
+    return get_client().get(url, endpoint, params)
@@ -0,0 +1,144 @@
+"""
+Input sources for Jarvis
+Recorded WAV files or plain transcripts can stand in for the microphone,
+so capture, recognition and command handling run without any audio
+hardware (tests, benchmarks, regression runs).
+
+Select one at startup with JARVIS_INPUT:
+    JARVIS_INPUT=wav:recordings/         every .wav file in a directory, by name
+    JARVIS_INPUT=wav:command.wav         a single recording
+    JARVIS_INPUT=text:command_log.txt    transcripts, one command per line
+"""
+
+import json                       # for command_log.jsonl corpora
+import os                         # for file paths
+import queue                      # for the pending utterances
+import time                       # for capture timeouts
+
+import speech_recognition as sr   # voice recognition library
+from recognizers import StubBackend
+
+TEXT_SAMPLE_RATE = 16000
+TEXT_SAMPLE_WIDTH = 2
+
+
+def load_transcripts(path):
+    """Commands from a corpus file
+
+    Understands command_log.jsonl records, the older command_log.txt
+    ("timestamp: text") and plain text with one command per line.
+    """
+    transcripts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                try:
+                    text = json.loads(line).get('transcript')
+                except ValueError:
+                    continue  # partial line from a crash
+            else:
+                stamp, sep, text = line.partition(": ")
+                text = text if sep and stamp[:1].isdigit() else line
+            if text:
+                transcripts.append(text)
+    return transcripts
+
+
+class ReplaySource(object):
+    """Hands out prepared utterances the way capture_utterance() gets them from the microphone
+
+    Replay sources have nothing to calibrate and never hear Jarvis
+    talking, so those calls do nothing. When backend is set, it knows the
+    transcript of every utterance and replaces the real recognizer.
+    """
+
+    live = False
+    backend = None
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        self.total = 0
+        self.delivered = 0
+        self.last_frame_at = None
+
+    def add(self, audio, heard_wake_word=False):
+        self.pending.put((audio, heard_wake_word))
+        self.total += 1
+
+    @property
+    def finished(self):
+        return self.delivered >= self.total
+
+    @property
+    def alive(self):
+        return True
+
+    def next_utterance(self, timeout=0.1):
+        """The next (audio, heard_wake_word), or None once everything was replayed"""
+        try:
+            utterance = self.pending.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        self.delivered += 1
+        self.last_frame_at = time.time()
+        return utterance
+
+    def calibrate(self, recognizer):
+        return recognizer.energy_threshold
+
+    def discard_pending(self):
+        pass
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+
+class WavSource(ReplaySource):
+    """Recorded commands from WAV files, recognized by the configured backend"""
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = list(paths)
+        recognizer = sr.Recognizer()
+        for path in self.paths:
+            with sr.AudioFile(path) as clip:
+                self.add(recognizer.record(clip))
+
+    @classmethod
+    def from_path(cls, path):
+        if os.path.isdir(path):
+            return cls(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".wav")))
+        return cls([path])
+
+
+class TranscriptSource(ReplaySource):
+    """Commands given as text; each gets a short silent clip its transcript is registered for"""
+
+    def __init__(self, transcripts):
+        super().__init__()
+        self.transcripts = list(transcripts)
+        self.backend = StubBackend()
+        for index, text in enumerate(self.transcripts):
+            # The index makes every clip unique, so repeated commands stay separate turns
+            frames = index.to_bytes(4, "little") + b"\0" * (TEXT_SAMPLE_RATE // 10 * TEXT_SAMPLE_WIDTH - 4)
+            audio = sr.AudioData(frames, TEXT_SAMPLE_RATE, TEXT_SAMPLE_WIDTH)
+            self.backend.add(audio, text)
+            self.add(audio)
+
+
+def from_setting(value):
+    """Build the source named by a JARVIS_INPUT value (wav:<path> or text:<path>)"""
+    kind, sep, path = value.partition(":")
+    if not sep or not path:
+        raise ValueError(f"JARVIS_INPUT should look like wav:<path> or text:<path>, not '{value}'")
+    if kind == "wav":
+        return WavSource.from_path(path)
+    if kind == "text":
+        return TranscriptSource(load_transcripts(path))
+    raise ValueError(f"Unknown input source '{kind}', choose from: wav, text")
@@ -25,7 +25,10 @@ def install_packages():
         "SpeechRecognition",
         "pywhatkit",
         "requests",
-        "PyAudio"
+        "psutil",
+        "PyAudio",
+        "numpy",
+        "pocketsphinx"
     ]
     
     print("\n📦 Installing required packages...")
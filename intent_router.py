@@ -0,0 +1,239 @@
+"""
+Intent routing for Jarvis
+A declarative table of intents compiled once into an Aho-Corasick automaton
+and word lookup tables, so a command is matched in a single pass instead of
+being re-scanned against every phrase list in turn.
+"""
+
+import collections                # for the Route result
+import re                         # for slot extraction
+import time                       # for match timing
+
+import skills                     # the skill manifest declares the intents
+
+question_starters = ["what", "who", "when", "where", "why", "how", "is", "can", "could", "would", "will", "should"]
+
+# Upper bounds (in microseconds) of the match-time histogram buckets
+HISTOGRAM_BUCKETS = [5, 10, 20, 50, 100, 200, 500, 1000, 5000, float('inf')]
+
+Route = collections.namedtuple('Route', ['intent', 'slots', 'expressions'])
+
+
+class Intent(object):
+    """One row of the intent table
+
+    Exactly one of the trigger kinds is normally given:
+      phrases      - matches if any phrase appears anywhere in the command
+      first_words  - matches if the first word is one of these
+      prefix       - matches if the command starts with these words
+      words        - matches if any single word is one of these
+      question     - matches questions of two or more words
+
+    Lower priority values win. Ties go to the earliest match in the
+    command, then to the order of the table. Non-terminal intents (like
+    the expression gestures) don't stop routing; they only contribute
+    their expression code if they rank above the winning intent.
+    """
+
+    def __init__(self, name, priority, phrases=(), first_words=(), prefix=(), words=(), question=False,
+                 slots=None, expression=None, terminal=True):
+        self.name = name
+        self.priority = priority
+        self.phrases = list(phrases)
+        self.first_words = list(first_words)
+        self.prefix = list(prefix)
+        self.words = list(words)
+        self.question = question
+        self.slots = slots
+        self.expression = expression
+        self.terminal = terminal
+
+
+# Slot extractors receive the words after the wake word and the lowercase text
+def _city_slot(word_list, full_text):
+    city_match = re.search(r"in ([a-zA-Z\s]+)$", full_text)
+    return {'city': city_match.group(1).strip() if city_match else None}
+
+
+def _rest_slot(skip):
+    def extract(word_list, full_text):
+        return {'query': ' '.join(word_list[skip:])}
+    return extract
+
+
+def _site_slot(word_list, full_text):
+    return {'site': ''.join(word_list[1:])}
+
+
+def _question_slot(word_list, full_text):
+    return {'query': ' '.join(word_list)}
+
+
+# Slot extractors by the name the skill manifest uses
+SLOT_EXTRACTORS = {
+    'city': _city_slot,
+    'rest': _rest_slot(1),
+    'rest_after_two': _rest_slot(2),
+    'site': _site_slot,
+    'question': _question_slot,
+}
+
+
+def intents_from_manifest(manifest):
+    """The intent table declared by the skills (intents without triggers, like wake, are left out)"""
+    intents = []
+    for skill in manifest:
+        for entry in skill['intents']:
+            if 'priority' not in entry:
+                continue
+            intents.append(Intent(entry['intent'], entry['priority'],
+                                  phrases=entry.get('phrases', ()),
+                                  first_words=entry.get('first_words', ()),
+                                  prefix=entry.get('prefix', ()),
+                                  words=entry.get('words', ()),
+                                  question=entry.get('question', False),
+                                  slots=SLOT_EXTRACTORS[entry['slots']] if entry.get('slots') else None,
+                                  expression=entry['expression'].encode() if entry.get('expression') else None,
+                                  terminal=entry.get('terminal', True)))
+    return intents
+
+
+# The priorities in skills/manifest.json reproduce the original if/elif chain in process()
+JARVIS_INTENTS = intents_from_manifest(skills.load_manifest())
+
+# random words list
+hi_words = next(intent.words for intent in JARVIS_INTENTS if intent.name == 'greeting')
+bye_words = next(intent.words for intent in JARVIS_INTENTS if intent.name == 'farewell')
+r_u_there = next(intent.words for intent in JARVIS_INTENTS if intent.name == 'presence')
+
+
+class _Automaton(object):
+    """Aho-Corasick automaton over the phrases of the intent table"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for text, value in patterns:
+            state = 0
+            for char in text:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append((len(text), value))
+
+        # Breadth-first pass to build failure links
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def search(self, text):
+        """Yield (start_position, value) for every pattern occurrence"""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                yield position - length + 1, value
+
+
+class IntentRouter(object):
+    """Matches commands against a compiled intent table"""
+
+    def __init__(self, intents=JARVIS_INTENTS, wake_word='jarvis'):
+        self.intents = list(intents)
+        self.wake_word = wake_word
+        patterns = []
+        self.first_words = {}
+        self.prefixes = []
+        self.words = {}
+        self.questions = []
+        for order, intent in enumerate(self.intents):
+            for phrase in intent.phrases:
+                patterns.append((phrase, order))
+            for word in intent.first_words:
+                self.first_words.setdefault(word, []).append(order)
+            if intent.prefix:
+                self.prefixes.append((intent.prefix, order))
+            for word in intent.words:
+                self.words.setdefault(word, []).append(order)
+            if intent.question:
+                self.questions.append(order)
+        self.automaton = _Automaton(patterns)
+        self.histogram = {}
+
+    def route(self, words):
+        """Return the Route (intent, slots, expressions) for a command starting with the wake word"""
+        started = time.perf_counter()
+        route = self._route(words)
+        self._record(route.intent, (time.perf_counter() - started) * 1e6)
+        return route
+
+    def match(self, words):
+        """Route a command without recording its match time (for speculative matches)"""
+        return self._route(words)
+
+    def _route(self, words):
+        # break words into list, ignoring wake word
+        word_list = words.split(' ')[1:]
+
+        # If just the wake word was said
+        if len(word_list) == 0 or (len(word_list) == 1 and word_list[0] == self.wake_word):
+            return Route('wake', {}, [])
+
+        full_text = ' '.join(word_list).lower()
+        candidates = []  # (priority, position, table order)
+
+        for position, order in self.automaton.search(full_text):
+            candidates.append((self.intents[order].priority, position, order))
+        for order in self.first_words.get(word_list[0], ()):
+            candidates.append((self.intents[order].priority, 0, order))
+        for prefix, order in self.prefixes:
+            if word_list[:len(prefix)] == prefix:
+                candidates.append((self.intents[order].priority, 0, order))
+        if len(word_list) >= 2 and word_list[0].lower() in question_starters:
+            for order in self.questions:
+                candidates.append((self.intents[order].priority, 0, order))
+        for position, word in enumerate(word_list):
+            for order in self.words.get(word, ()):
+                candidates.append((self.intents[order].priority, position, order))
+
+        candidates.sort()
+        expressions = []
+        for priority, position, order in candidates:
+            intent = self.intents[order]
+            if not intent.terminal:
+                if intent.expression and intent.expression not in expressions:
+                    expressions.append(intent.expression)
+                continue
+            slots = intent.slots(word_list, full_text) if intent.slots else {}
+            return Route(intent.name, slots, expressions)
+        return Route('fallback', {}, expressions)
+
+    def _record(self, intent, microseconds):
+        """Add one match time to the intent's histogram"""
+        buckets = self.histogram.setdefault(intent, [0] * len(HISTOGRAM_BUCKETS))
+        for i, bound in enumerate(HISTOGRAM_BUCKETS):
+            if microseconds <= bound:
+                buckets[i] += 1
+                break
+
+    def format_histogram(self):
+        """Per-intent match-time histogram as printable text"""
+        lines = ["Intent match time (microseconds):"]
+        labels = [f"<={b:g}" if b != float('inf') else f">{HISTOGRAM_BUCKETS[-2]:g}" for b in HISTOGRAM_BUCKETS]
+        for intent, buckets in sorted(self.histogram.items()):
+            counts = ", ".join(f"{label}: {count}" for label, count in zip(labels, buckets) if count)
+            lines.append(f"  {intent} ({sum(buckets)}): {counts}")
+        return "\n".join(lines)
@@ -0,0 +1,200 @@
+"""
+Knowledge cache for Jarvis
+Keeps the answers to "get info ..." lookups in a SQLite file, with the
+most recently used ones in memory in front of it, so asking about the
+same thing again is answered at once without a Wikipedia lookup.
+Answers are keyed by the normalized request ("tell me about Albert
+Einstein" and "get info albert einstein" share one, "when was Einstein
+born" and "where was Einstein born" don't), expire after a TTL and are
+evicted least recently used first once the cache is full. While the
+internet is down, expired answers are still served.
+
+Set JARVIS_KNOWLEDGE_TTL (days) and JARVIS_KNOWLEDGE_SIZE (answers) to
+change the defaults.
+
+Usage:
+    python knowledge_cache.py [--clear]
+"""
+
+import argparse                   # for the report command line
+import collections                # for the in-memory LRU
+import os                         # for the database path and configuration
+import re                         # for normalizing questions
+import threading                  # for the database lock
+import time                       # for expiry
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATABASE = os.path.join(BASE_DIR, ".jarvis_knowledge.sqlite3")
+
+TTL = float(os.environ.get('JARVIS_KNOWLEDGE_TTL') or 30) * 24 * 3600  # answers are fresh for 30 days...
+MAX_ENTRIES = int(os.environ.get('JARVIS_KNOWLEDGE_SIZE') or 2000)      # ...and the 2000 last used are kept
+MEMORY_ENTRIES = 64               # answers kept in memory in front of the database
+
+# Words that don't change what is being asked about (question words and tenses do, so they stay)
+FILLER_WORDS = {"the", "a", "an", "of", "tell", "me", "about", "get", "info", "please", "do", "you", "know",
+                "can", "could", "would", "search", "for", "look", "up", "find"}
+# "what's" and "what is" are the same question
+CONTRACTIONS = {"whats": "what is", "whos": "who is", "wheres": "where is", "whens": "when is", "hows": "how is"}
+
+SCHEMA = """CREATE TABLE IF NOT EXISTS answers (
+    query TEXT PRIMARY KEY,
+    answer TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)"""
+
+
+def normalize(query):
+    """The cache key for a question: lowercase words without punctuation and filler"""
+    words = re.sub(r"[^\w\s]", "", query.lower()).split()
+    words = " ".join(CONTRACTIONS.get(word, word) for word in words).split()
+    kept = [word for word in words if word not in FILLER_WORDS]
+    return " ".join(kept or words)
+
+
+class KnowledgeCache(object):
+    """Answers by normalized question, in memory and in a SQLite file"""
+
+    def __init__(self, path=DATABASE, ttl=TTL, max_entries=MAX_ENTRIES, memory_entries=MEMORY_ENTRIES,
+                 clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.clock = clock
+        self.memory = collections.OrderedDict()  # key -> (answer, stored_at), most recently used last
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'stale_hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+        self._db = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self):
+        """The database connection, opened on first use"""
+        if self._db is None:
+            import sqlite3                # for the answer file (only loaded when asked something)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(SCHEMA)
+            self._db.commit()
+        return self._db
+
+    def get(self, query, offline=False):
+        """The cached answer to query, or None; offline=True also serves expired answers"""
+        key = normalize(query)
+        now = self.clock()
+        with self._lock:
+            entry = self.memory.get(key)
+            source = 'memory_hits'
+            if entry is None:
+                row = self.db.execute("SELECT answer, stored_at FROM answers WHERE query = ?", (key,)).fetchone()
+                entry = tuple(row) if row else None
+                source = 'disk_hits'
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            if now - entry[1] > self.ttl:
+                if not offline:
+                    self.stats['misses'] += 1
+                    return None
+                source = 'stale_hits'
+            self.stats[source] += 1
+            self._remember(key, entry)
+            self.db.execute("UPDATE answers SET used_at = ?, hits = hits + 1 WHERE query = ?", (now, key))
+            self.db.commit()
+            return entry[0]
+
+    def has(self, query):
+        """True if there is an answer to query, even an expired one (not counted as a lookup)"""
+        key = normalize(query)
+        with self._lock:
+            return key in self.memory or self.db.execute("SELECT 1 FROM answers WHERE query = ?",
+                                                         (key,)).fetchone() is not None
+
+    def put(self, query, answer):
+        """Store the answer to query, evicting the least recently used answers beyond max_entries"""
+        if not answer:
+            return
+        key = normalize(query)
+        now = self.clock()
+        with self._lock:
+            self._remember(key, (answer, now))
+            self.db.execute("INSERT OR REPLACE INTO answers (query, answer, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                            (key, answer, now, now))
+            evicted = self.db.execute("DELETE FROM answers WHERE query IN (SELECT query FROM answers "
+                                      "ORDER BY used_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)).rowcount
+            self.db.commit()
+            self.stats['stored'] += 1
+            self.stats['evicted'] += max(0, evicted)
+            if evicted > 0:
+                self.memory.clear()  # cheaper than finding out which ones went; they reload from disk
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            self.db.execute("DELETE FROM answers")
+            self.db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def hit_rate(self):
+        """Share of lookups answered from the cache, or None before the first lookup"""
+        stats = self.stats
+        hits = stats['memory_hits'] + stats['disk_hits'] + stats['stale_hits']
+        return hits / (hits + stats['misses']) if hits + stats['misses'] else None
+
+    def format_report(self):
+        """Hit rate and counts for this session"""
+        stats, rate = self.stats, self.hit_rate()
+        if rate is None:
+            return "Knowledge cache: nothing asked"
+        return (f"Knowledge cache: {rate:.0%} hit rate ({stats['memory_hits']} from memory, "
+                f"{stats['disk_hits']} from disk, {stats['stale_hits']} expired but offline, "
+                f"{stats['misses']} misses), {stats['stored']} stored, {stats['evicted']} evicted")
+
+    def format_prometheus(self):
+        """Lookup counters in the Prometheus text format"""
+        lines = ["# HELP jarvis_knowledge_lookups_total Knowledge cache lookups by result",
+                 "# TYPE jarvis_knowledge_lookups_total counter"]
+        for result, counter in (('memory_hit', 'memory_hits'), ('disk_hit', 'disk_hits'),
+                                ('stale_hit', 'stale_hits'), ('miss', 'misses')):
+            lines.append(f'jarvis_knowledge_lookups_total{{result="{result}"}} {self.stats[counter]}')
+        lines += ["# HELP jarvis_knowledge_evictions_total Answers evicted to keep the cache within its size",
+                  "# TYPE jarvis_knowledge_evictions_total counter",
+                  f"jarvis_knowledge_evictions_total {self.stats['evicted']}"]
+        return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or clear Jarvis' cached answers")
+    parser.add_argument("--clear", action="store_true", help="forget every cached answer")
+    args = parser.parse_args()
+
+    cache = KnowledgeCache()
+    if args.clear:
+        cache.clear()
+        print("Cleared the knowledge cache")
+        return 0
+    rows = cache.db.execute("SELECT query, hits, stored_at FROM answers ORDER BY hits DESC, used_at DESC").fetchall()
+    print(f"{len(rows)} cached answers in {cache.path} (fresh for {cache.ttl / 86400:g} days, up to {cache.max_entries})")
+    for query, hits, stored_at in rows[:20]:
+        age = (time.time() - stored_at) / 86400
+        print(f"  {hits:>5} hits  {age:>5.1f} days old  {query}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
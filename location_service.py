@@ -0,0 +1,162 @@
+"""
+Location service for Jarvis
+Resolves the approximate location from the IP address once, keeps it on
+disk with an expiry, and refreshes it in the background when it gets old,
+so weather questions don't pay for a geolocation round trip every time.
+"""
+
+import collections                # for the location record
+import json                       # for the location file
+import os                         # for file paths and the TZ variable
+import threading                  # for the lock and background refreshes
+import time                       # for expiry and timing
+
+import http_client                # pooled HTTP session with timeouts and caching
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCATION_FILE = os.path.join(BASE_DIR, ".jarvis_location.json")
+GEOLOCATION_URL = "https://ipinfo.io/json"
+
+REFRESH_AFTER = 3600        # refresh in the background once the location is an hour old
+MAX_AGE = 24 * 3600         # after a day the saved location is no longer trusted
+
+Location = collections.namedtuple('Location', ['city', 'region', 'country', 'loc', 'timezone', 'resolved_at'])
+
+
+def fetch_ip_location():
+    """Look up the location of this machine's public IP address
+
+    Raises IOError unless the service answered, so an error reply (e.g. 429
+    when rate limited) doesn't replace the saved location with 'Unknown'.
+    """
+    response = http_client.get(GEOLOCATION_URL, endpoint='geolocation')
+    if response.status_code != 200:
+        raise IOError(f"the geolocation service answered {response.status_code}")
+    data = response.json()
+    return Location(
+        city=data.get('city', 'Unknown'),
+        region=data.get('region', 'Unknown'),
+        country=data.get('country', 'Unknown'),
+        loc=data.get('loc', ''),
+        timezone=data.get('timezone', ''),
+        resolved_at=time.time(),
+    )
+
+
+class LocationService(object):
+    """Resolves the location once and keeps it fresh in the background"""
+
+    def __init__(self, fetch=None, location_file=LOCATION_FILE,
+                 refresh_after=REFRESH_AFTER, max_age=MAX_AGE):
+        self.fetch = fetch or fetch_ip_location
+        self.location_file = location_file
+        self.refresh_after = refresh_after
+        self.max_age = max_age
+        self.location = None
+        self.fetches = 0
+        self.last_resolve_seconds = 0.0
+        self._loaded = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+    def get(self, wait=True):
+        """Return the current Location, or None if it can't be determined
+
+        A saved location is returned straight away; one that is getting
+        old is refreshed in the background. Only when there is no usable
+        location at all does this block on the network (unless wait=False).
+        """
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                self.location = self._load()
+            location = self.location
+
+        age = time.time() - location.resolved_at if location else None
+        if location and age < self.max_age:
+            if age >= self.refresh_after:
+                self.refresh_in_background()
+            return location
+        if not wait:
+            self.refresh_in_background()
+            return location
+        with self._fetch_lock:
+            # A background refresh may have finished while we waited
+            current = self.location
+            if current and time.time() - current.resolved_at < self.max_age:
+                return current
+            return self._refresh() or location
+
+    def city(self, default=None):
+        """Name of the current city, or default if unknown"""
+        location = self.get()
+        if location and location.city and location.city != 'Unknown':
+            return location.city
+        return default
+
+    def refresh(self):
+        """Resolve the location now and save it; returns None on failure"""
+        with self._fetch_lock:
+            return self._refresh()
+
+    def _refresh(self):
+        started = time.time()
+        try:
+            location = self.fetch()
+        except Exception as e:
+            print(f"Error getting location: {e}")
+            return None
+        finally:
+            self.last_resolve_seconds = time.time() - started
+        self.fetches += 1
+        with self._lock:
+            self.location = location
+            self._loaded = True
+        apply_timezone(location.timezone)
+        self._save(location)
+        return location
+
+    def refresh_in_background(self):
+        """Start a refresh on a worker thread unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name="location-refresh", daemon=True).start()
+
+    def _load(self):
+        try:
+            with open(self.location_file, 'r') as f:
+                location = Location(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring saved location: {e}")
+            return None
+        apply_timezone(location.timezone)
+        return location
+
+    def _save(self, location):
+        try:
+            with open(self.location_file, 'w') as f:
+                json.dump(location._asdict(), f, indent=2)
+        except Exception as e:
+            print(f"Could not save location: {e}")
+
+
+def apply_timezone(timezone):
+    """Use the location's timezone for local time, if it is known"""
+    if not timezone or os.environ.get('TZ') == timezone:
+        return
+    os.environ['TZ'] = timezone
+    if hasattr(time, 'tzset'):
+        time.tzset()
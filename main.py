@@ -9,838 +9,513 @@ General Public License (GPL3+)
 """
 
 
-import speech_recognition as sr   # voice recognition library
-import random                     # to choose random words from list
-import pyttsx3                    # offline Text to Speech
-import webbrowser                 # to open and perform web tasks
-import serial                     # for serial communication
-import pywhatkit                  # for more web automation
+# Heavy libraries and devices are loaded on first use (see the get_*() accessors
+# below), so importing this module stays cheap for scripts like test_system_info.py
+import intent_router              # compiled intent matching for process()
+import speech_queue               # non-blocking speech output
+import http_client                # pooled HTTP session with timeouts and caching
+import location_service           # cached IP geolocation
+import command_log                # buffered JSON-lines command log
+import supervisor                 # health checks and targeted restarts
+import telemetry                  # cached system metrics
+import connectivity               # cached internet reachability
+import phrase_cache               # pre-rendered recordings of constant phrases
+import streaming_tts              # long answers spoken chunk by chunk
+import prefetch                   # speculative lookups for slow intents
+import session_store              # conversation context for follow-up commands
+import knowledge_cache            # answers to questions asked before
+import tracing                    # step timings for --profile and the metrics endpoint
+import skills                     # command handlers, loaded on first use
+import sys                        # to hand this module to the skills
 import time                       # for sleep and timing functions
-import re                         # for regular expressions
 import os                         # for os related operations
-import platform                   # for system information
 import subprocess                 # for running system commands
-import requests                   # for API requests
-import socket                     # for network information
-import shutil                     # for disk usage information
-import json                       # for handling JSON data
-import psutil                     # for battery and system stats
-import locale                     # for system locale settings
-from urllib.parse import quote    # for URL encoding
-from datetime import datetime, timezone, timedelta
-
-# Global variables
-voice_engine = None  # Global TTS engine that will be initialized at startup
+from datetime import datetime
 
 # Declare robot name (Wake-Up word)
 robot_name = 'jarvis'
 
-# random words list
-hi_words = ['hi', 'hello', 'yo boss', 'greetings']
-bye_words = ['bye', 'goodbye', 'until next time']
-r_u_there = ['are you there', 'you there']
-
-# Initialize text to speech engine with Mac's system voice (female Siri-like)
-def setup_voice():
-    """Set up the text-to-speech engine with the preferred voice"""
-    engine = pyttsx3.init()
-    voices = engine.getProperty('voices')
-    voice_config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jarvis_voice_config.json")
-    
-    # Default voice settings
-    rate = 170  # slightly slower for clarity
-    volume = 1.0
-    selected_voice = None
-    
-    # Try to load saved voice preference
-    try:
-        if os.path.exists(voice_config_file):
-            with open(voice_config_file, 'r') as f:
-                config = json.load(f)
-                
-            voice_id = config.get('voice_id')
-            rate = config.get('rate', 170)
-            volume = config.get('volume', 1.0)
-            
-            # Find the voice in available voices
-            for voice in voices:
-                if voice.id == voice_id:
-                    selected_voice = voice
-                    print(f"Using saved voice preference: {voice.name}")
-                    break
-    except Exception as e:
-        print(f"Error loading voice config: {e}")
-    
-    # If no saved preference or it wasn't found, find a female voice
-    if not selected_voice:
-        print("No saved voice preference found, searching for a female voice...")
-        
-        # Print available voices for information
-        print("Available voices:")
-        for i, voice in enumerate(voices):
-            print(f"  {i}: {voice.name} ({voice.id})")
-        
-        # First try macOS specific voices that sound like Siri
-        female_names = ["samantha", "siri", "karen", "moira", "tessa", "fiona", "female", "woman", "girl"]
-        
-        # Look for voices with female names
-        for voice in voices:
-            voice_id_lower = voice.id.lower()
-            voice_name_lower = voice.name.lower()
-            
-            if any(female_name in voice_id_lower or female_name in voice_name_lower for female_name in female_names):
-                selected_voice = voice
-                print(f"Selected female voice: {voice.name}")
-                break
-        
-        # Fallback to any available voice
-        if not selected_voice and voices:
-            # Try to use second voice if available (often female in default setup)
-            selected_voice = voices[1] if len(voices) > 1 else voices[0]
-            print(f"Using fallback voice: {selected_voice.name}")
-    
-    # Set the voice properties
-    engine.setProperty('rate', rate)
-    engine.setProperty('volume', volume)
-    if selected_voice:
-        engine.setProperty('voice', selected_voice.id)
-    
-    # Inform user how to change voice
-    print(f"To select a different voice, run: python select_voice.py")
-    
-    return engine
-
-# Set up the voice engine
-try:
-    print("Initializing voice engine...")
-    engine = setup_voice()
-    print("Voice engine setup complete")
-except Exception as voice_error:
-    print(f"Error setting up voice engine: {voice_error}")
-    print("Attempting to use a basic voice engine setup")
-    try:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 170)
-        engine.setProperty('volume', 1.0)
-    except Exception as fallback_error:
-        print(f"Fallback voice engine failed: {fallback_error}")
-        engine = None
-
-# Initialize speech recognition with Mac's default microphone
-listener = sr.Recognizer()
-listener.energy_threshold = 4000           # increase if too sensitive 
-listener.dynamic_energy_threshold = True   # auto-adjust for ambient noise
-listener.pause_threshold = 0.8             # seconds of non-speaking before phrase is complete
-
-# connect with Arduino over serial communication
-try:
-    # Try common macOS serial ports
-    import glob
-    ports = glob.glob('/dev/tty.usbserial*') + glob.glob('/dev/tty.usbmodem*') + glob.glob('/dev/cu.usbserial*') + glob.glob('/dev/cu.usbmodem*')
-    
-    if ports:
-        port = serial.Serial(ports[0], 9600, timeout=1)
-        print(f"Physical body connected on {ports[0]}")
-    else:
-        # Fallback - try manual port specification
-        port = serial.Serial("/dev/tty.usbmodem14101", 9600, timeout=1)  # Update this path as needed
-        print("Physical body connected on fallback port")
-except Exception as e:
-    print(f"Unable to connect to my physical body: {e}")
-    print("Available ports:", [p for p in glob.glob('/dev/tty.*') + glob.glob('/dev/cu.*') if 'usb' in p.lower()])
-    port = None
-
-# Utility functions for daily tasks
-# Default location for weather - will be updated when get_location_info is called
-default_location = "San Francisco"
-
-def get_weather_info(city=""):
-    """Get simple weather information using a public API"""
-    try:
-        from urllib.parse import quote
-        
-        # Use a free weather API that doesn't require a key
-        if not city:
-            # Use global default_location, which might have been updated by get_location_info
-            global default_location
-            city = default_location
-        
-        base_url = f"https://wttr.in/{quote(city)}?format=3"
-        response = requests.get(base_url)
-        
-        if response.status_code == 200:
-            weather_info = response.text
-            # Add the city name if not already in the response
-            if city.lower() not in weather_info.lower():
-                weather_info = f"Weather in {city}: {weather_info}"
-            return weather_info
+# random words list (shared with the intent table)
+from intent_router import hi_words, bye_words
+
+# Intent table compiled once at startup
+router = intent_router.IntentRouter(wake_word=robot_name)
+
+# The last few turns, so "and tomorrow?" or "yes" can build on the command before
+session = session_store.SessionStore(wake_word=robot_name)
+
+# Slow lookups start as soon as the transcript matches their intent (or reuse an earlier turn's answer)
+prefetcher = prefetch.Prefetcher(router, cache=session)
+
+# Handlers for every intent, imported from skills/ the first time they are needed;
+# web lookups run on a worker pool and say so when they pass their deadline
+registry = skills.SkillRegistry(sys.modules[__name__],
+                                on_overdue=lambda intent: talk("Still working on it", fixed=True))
+
+# Structured command log, written in batches on a background thread
+commands = command_log.CommandLog()
+
+# Watches the microphone, recognizer, voice, Arduino link and web lookups (see supervise())
+health = supervisor.Supervisor()
+
+# One TTS engine for the whole process; the voice is resolved from
+# jarvis_voice_config.json once and cached on disk
+tts = None
+
+def get_tts():
+    """Return the TTS engine manager (pyttsx3 is imported on first use)"""
+    global tts
+    if tts is None:
+        import tts_engine
+        tts = tts_engine.EngineManager()
+    return tts
+
+# Recordings of the constant phrases, played back instead of synthesizing them again
+phrases = phrase_cache.PhraseCache()
+
+# Speech recognizer for Mac's default microphone, created on first use
+listener = None
+
+def get_listener():
+    """Return the shared speech recognizer"""
+    global listener
+    if listener is None:
+        import speech_recognition as sr
+        listener = sr.Recognizer()
+        listener.energy_threshold = 4000           # increase if too sensitive 
+        listener.dynamic_energy_threshold = True   # auto-adjust for ambient noise
+        listener.pause_threshold = 0.8             # seconds of non-speaking before phrase is complete
+    return listener
+
+# Recognizer settings learned while running, carried over when it is restarted
+RECOGNIZER_CALIBRATION = ('energy_threshold', 'dynamic_energy_threshold', 'dynamic_energy_adjustment_damping',
+                          'dynamic_energy_ratio', 'pause_threshold')
+
+def restart_recognizer():
+    """Recreate the recognizer and its backend, keeping the learned calibration"""
+    global listener, recognition
+    old, listener = listener, None
+    fresh = get_listener()
+    if old is not None:
+        for name in RECOGNIZER_CALIBRATION:
+            setattr(fresh, name, getattr(old, name))
+    recognition = None  # rebuilt on the next recognition
+
+# Microphone is opened once and kept running, see get_microphone()
+# (JARVIS_INPUT=wav:<path> or text:<file> replays recordings or transcripts instead)
+microphone = None
+
+def get_microphone():
+    """Return the shared input source, starting the microphone's capture thread on first use"""
+    global microphone
+    if microphone is None:
+        if os.environ.get("JARVIS_INPUT"):
+            import input_sources
+            microphone = input_sources.from_setting(os.environ["JARVIS_INPUT"])
         else:
-            return f"I couldn't get the weather information for {city} right now."
-    except Exception as e:
-        print(f"Weather error: {e}")
-        return "I'm having trouble getting weather data."
-
-def get_time_info():
-    """Get current time with formatted output"""
-    now = datetime.now()
-    hour = now.hour
-    
-    # Determine time of day greeting
-    if 5 <= hour < 12:
-        greeting = "Good morning"
-    elif 12 <= hour < 18:
-        greeting = "Good afternoon"
-    else:
-        greeting = "Good evening"
-    
-    time_str = now.strftime("%I:%M %p")
-    return f"{greeting}. It's {time_str}."
-
-def get_date_info():
-    """Get current date with formatted output"""
-    now = datetime.now()
-    return now.strftime("%A, %B %d, %Y")
-
-def get_fact():
-    """Return a random interesting fact"""
-    facts = [
-        "The Eiffel Tower can be 15 cm taller during the summer due to thermal expansion.",
-        "20% of Earth's oxygen is produced by the Amazon rainforest.",
-        "Honey never spoils. Archaeologists found pots of honey in ancient Egyptian tombs that are over 3,000 years old and still perfectly edible.",
-        "A day on Venus is longer than a year on Venus. It takes 243 Earth days to rotate once on its axis.",
-        "The shortest war in history was between Britain and Zanzibar on August 27, 1896. Zanzibar surrendered after 38 minutes.",
-        "The average person walks the equivalent of three times around the world in a lifetime.",
-        "The Hawaiian alphabet has only 13 letters.",
-        "A group of flamingos is called a 'flamboyance'.",
-        "Octopuses have three hearts."
-    ]
-    return random.choice(facts)
-
-def get_joke():
-    """Return a random joke"""
-    jokes = [
-        "Why don't scientists trust atoms? Because they make up everything!",
-        "I told my wife she was drawing her eyebrows too high. She looked surprised.",
-        "Parallel lines have so much in common. It's a shame they'll never meet.",
-        "I'm reading a book about anti-gravity. It's impossible to put down!",
-        "I used to play piano by ear, but now I use my hands.",
-        "Why did the scarecrow win an award? Because he was outstanding in his field!",
-        "What's the best thing about Switzerland? I don't know, but the flag is a big plus.",
-        "Did you hear about the mathematician who's afraid of negative numbers? He'll stop at nothing to avoid them."
-    ]
-    return random.choice(jokes)
-
-def get_system_info():
-    """Get basic system information"""
-    system_info = f"System: {platform.system()} {platform.version()}\n"
-    system_info += f"Machine: {platform.machine()}\n"
-    system_info += f"Processor: {platform.processor()}\n"
-    return system_info
-
-def get_battery_status():
-    """Get battery status information"""
-    try:
-        # Use system command on macOS to get battery info
-        result = subprocess.run(['pmset', '-g', 'batt'], capture_output=True, text=True)
-        output = result.stdout
-        
-        if "No" in output and "batteries" in output:
-            return "No battery found. Your Mac might be a desktop or the battery information is unavailable."
-        
-        # Parse the battery information
-        battery_info = {}
-        if "InternalBattery" in output:
-            # Extract percentage
-            percent_match = re.search(r'(\d+)%', output)
-            if percent_match:
-                battery_info['percent'] = percent_match.group(1)
-            
-            # Extract charging status
-            if 'charging' in output.lower():
-                battery_info['status'] = 'Charging'
-            elif 'discharging' in output.lower():
-                battery_info['status'] = 'Discharging'
-            else:
-                battery_info['status'] = 'Connected to power'
-            
-            # Extract time remaining if available
-            time_match = re.search(r'(\d+:\d+) remaining', output)
-            if time_match:
-                battery_info['time_remaining'] = time_match.group(1)
-            
-            response = f"Battery at {battery_info.get('percent', 'unknown')}%. "
-            response += f"Status: {battery_info.get('status', 'Unknown')}. "
-            
-            if 'time_remaining' in battery_info:
-                response += f"Time remaining: {battery_info['time_remaining']}."
-                
-            return response
+            import audio_stream
+            microphone = audio_stream.BufferedMicrophone()
+        microphone.start()
+    return microphone
+
+def restart_microphone():
+    """Close the microphone and open it again"""
+    global microphone
+    old, microphone = microphone, None
+    if old is not None:
+        old.stop()
+    get_microphone()
+
+def microphone_problem():
+    """Why the microphone looks dead, or None"""
+    if microphone is None:
+        return None
+    if not microphone.alive:
+        return "capture thread stopped"
+    if microphone.last_frame_at and time.time() - microphone.last_frame_at > 5:
+        return f"no audio for {time.time() - microphone.last_frame_at:.0f} s"
+    return None
+
+# Speech recognition backend chosen at startup (JARVIS_RECOGNIZER=google|offline|stub)
+recognition = None
+
+def get_recognition():
+    """Return the speech recognition service"""
+    global recognition
+    if recognition is None:
+        import recognizers
+        backend = get_microphone().backend
+        if backend is not None:
+            # Replayed transcripts are looked up instead of recognized
+            recognition = recognizers.RecognitionService(backend)
         else:
-            return "Battery information is not available."
-    except Exception as e:
-        print(f"Error getting battery status: {e}")
-        return "I couldn't retrieve the battery information at the moment."
-
-def get_network_info():
-    """Get network connectivity information"""
-    try:
-        # Check if we can connect to the internet
-        socket.create_connection(("www.google.com", 80))
-        
-        # Get hostname and IP address
-        hostname = socket.gethostname()
-        ip_address = socket.gethostbyname(hostname)
-        
-        # Get Wi-Fi information on macOS
-        result = subprocess.run(['/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport', '-I'], 
-                                capture_output=True, text=True)
-        airport_output = result.stdout
-        
-        network_info = f"Internet: Connected\n"
-        network_info += f"Hostname: {hostname}\n"
-        network_info += f"IP address: {ip_address}\n"
-        
-        # Extract Wi-Fi network name if available
-        ssid_match = re.search(r' SSID: (.+)', airport_output)
-        if ssid_match:
-            network_info += f"Wi-Fi network: {ssid_match.group(1)}\n"
-        
-        return network_info
-    except Exception as e:
-        print(f"Error getting network info: {e}")
-        return "Internet: Not connected or unable to retrieve network information."
-
-def get_location_info():
-    """Get approximate location based on IP address"""
-    try:
-        # Use IP-based geolocation (no GPS access needed)
-        response = requests.get('https://ipinfo.io/json')
-        data = response.json()
-        
-        city = data.get('city', 'Unknown')
-        region = data.get('region', 'Unknown')
-        country = data.get('country', 'Unknown')
-        loc = data.get('loc', '').split(',')
-        timezone = data.get('timezone', 'Unknown')
-        
-        location_info = f"You appear to be in {city}, {region}, {country}.\n"
-        
-        # Set timezone based on location info
-        os.environ['TZ'] = timezone
-        
-        # Also update our default weather city
-        global default_location
-        default_location = city
-        
-        if len(loc) == 2:
-            location_info += f"Coordinates: {loc[0]}, {loc[1]}\n"
-        
-        location_info += f"Timezone: {timezone}"
-        
-        return location_info
-    except Exception as e:
-        print(f"Error getting location: {e}")
-        return "I couldn't determine your location."
-
-def get_disk_space():
-    """Get disk space information"""
-    try:
-        # Get disk usage for the main disk
-        total, used, free = shutil.disk_usage("/")
-        
-        # Convert to GB for readability
-        total_gb = total / (1024**3)
-        used_gb = used / (1024**3)
-        free_gb = free / (1024**3)
-        
-        disk_info = f"Total disk space: {total_gb:.1f} GB\n"
-        disk_info += f"Used space: {used_gb:.1f} GB\n"
-        disk_info += f"Free space: {free_gb:.1f} GB\n"
-        disk_info += f"Disk usage: {(used/total)*100:.1f}%"
-        
-        return disk_info
-    except Exception as e:
-        print(f"Error getting disk space: {e}")
-        return "I couldn't retrieve disk space information."
-
-def get_help():
-    """Return help information about available commands"""
-    help_text = "Here are some things you can ask me:\n"
-    help_text += "- What's the time?\n"
-    help_text += "- What's the date today?\n"
-    help_text += "- What's the weather?\n"
-    help_text += "- Where am I? / What's my location?\n"
-    help_text += "- What's my battery status?\n"
-    help_text += "- What's my IP address? / Network info?\n"
-    help_text += "- How much disk space do I have?\n"
-    help_text += "- Tell me a joke or fact\n"
-    help_text += "- Play [song name] on YouTube\n"
-    help_text += "- Search for [your query]\n"
-    help_text += "- Open [website.com]\n"
-    help_text += "- What should I do today?\n"
-    
-    return help_text
+            recognition = recognizers.create_service(online=lambda: internet.online)
+    return recognition
+
+# Local wake word detector, only used once templates have been enrolled
+wake_detector = None
+
+def get_wake_detector(source):
+    """Return the wake word detector for the microphone's audio format"""
+    global wake_detector
+    if wake_detector is None:
+        import wake_word
+        wake_detector = wake_word.WakeWordDetector(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        if not wake_detector.ready:
+            print("No wake word templates found, every phrase will be sent to speech recognition")
+            print("To enable offline wake word detection, run: python wake_word.py --enroll")
+    return wake_detector
+
+# Arduino link, owned by a background thread that reconnects on its own (see get_body())
+body = None
+
+def get_body():
+    """Return the serial link to the Arduino, starting it the first time it is needed"""
+    global body
+    if body is None:
+        import serial_link
+        body = serial_link.SerialLink()
+        body.observer = lambda seconds: tracing.observe('serial_write', seconds)
+        body.start()
+    return body
 
-def listen():
-	""" listen to what user says using Mac's default microphone with minimal output"""
-	# This flag helps us control when to print the listening message
+# Utility functions for daily tasks
+# Default location for weather, used when the IP location is unknown
+default_location = "San Francisco"
+locations = location_service.LocationService()
+
+# Battery, network, disk, memory and CPU readings, kept warm by a background sampler
+sensors = telemetry.Telemetry()
+
+# Whether the internet is reachable, probed in the background (JARVIS_PROBE=host:port to change the target)
+internet = connectivity.ConnectivityMonitor()
+
+# Answers to "get info ..." lookups, kept on disk (served while offline too)
+knowledge = knowledge_cache.KnowledgeCache()
+
+# The reports test_system_info.py imports from here; the code is in the skills
+get_system_info = registry.bound('system', 'get_system_info')
+get_battery_status = registry.bound('battery', 'get_battery_status')
+get_network_info = registry.bound('network', 'get_network_info')
+get_disk_space = registry.bound('disk', 'get_disk_space')
+get_location_info = registry.bound('location', 'get_location_info')
+get_weather_info = registry.bound('weather', 'get_weather_info')
+
+def capture_utterance():
+	""" wait until the user says something; returns (audio, heard_wake_word) or None """
+	import speech_recognition as sr   # voice recognition library (loaded on first use)
+	import wake_word                  # offline wake word spotting
+	listener = get_listener()
 	
 	try:
-		# Create a fresh microphone source each time to prevent resource issues
-		with sr.Microphone() as source:
+		source = get_microphone()
+		if not source.live:
+			# Replayed input has no wake word to spot and no silence to wait for
+			return source.next_utterance()
+		
+		# Reuse the persistent microphone so no audio is lost between turns
+		with source:
 			# Only print the message once if it hasn't been displayed yet
 			if not hasattr(listen, 'message_displayed') or not listen.message_displayed:
 				print("Listening for wake word '" + robot_name + "'...")
 				listen.message_displayed = True
 			
-			# Adjust for ambient noise but with shorter duration to be more responsive
-			listener.adjust_for_ambient_noise(source, duration=0.3)
+			# Re-calibrate from audio already in the buffer instead of recording 300 ms of silence
+			with tracing.span('calibrate'):
+				source.calibrate(listener)
 			
 			# Status indicator
-			if port:
-				port.write(b'l')  # Start with LEDs off
+			express(b'l')  # Start with LEDs off
+			
+			detector = get_wake_detector(source)
+			if detector.ready:
+				# Spot the wake word locally so ambient speech never reaches the cloud
+				with tracing.span('wake_word'):
+					heard = wake_word.wait_for_wake_word(source, detector, listener, timeout=10)
+				if not heard:
+					return None
+				
+				# Barge-in: stop talking as soon as the user calls us
+				speech.interrupt()
+				
+				# Only the audio after the wake word is recognized; a short timeout
+				# means the user said just "jarvis" and is waiting for us
+				try:
+					with tracing.span('capture'):
+						voice = listener.listen(source, timeout=1, phrase_time_limit=5)
+				except sr.WaitTimeoutError:
+					voice = None
+				return voice, True
+			
+			# Without the wake word spotter we can't tell our own answer from the
+			# user, so don't transcribe what was captured while speaking
+			if speech.speaking:
+				speech.wait_idle(timeout=30)
+				source.discard_pending()
 			
 			# Listen for command with a timeout to prevent hanging
 			try:
-				voice = listener.listen(source, timeout=10, phrase_time_limit=5)
+				with tracing.span('capture'):
+					voice = listener.listen(source, timeout=10, phrase_time_limit=5)
 			except sr.WaitTimeoutError:
 				# Just return silently and try again
-				return
-			
-			try:
-				# Use Google's speech recognition with US English specifically
-				command = listener.recognize_google(voice, language="en-US").lower()
-				
-				# Look for wake word anywhere in the command
-				if robot_name in command:
-					# Print what was heard only when wake word is detected
-					print(f"\nHeard: {command}")
-					print(f"[Wake word '{robot_name}' detected!]")
-					
-					# Reset message flag to show listening again after processing
-					listen.message_displayed = False
-					
-					if port:
-						port.write(b'p')  # Show happy expression when activated
-					
-					# If wake word is not at the beginning, rearrange command
-					if command.split(' ')[0] != robot_name:
-						words = command.split()
-						idx = words.index(robot_name)
-						command = robot_name + " " + " ".join(words[:idx] + words[idx+1:])
-					
-					process(command)
-					time.sleep(0.5)  # Brief pause after processing
-				else:
-					# No output if wake word not found
-					if port:
-						port.write(b'l')
-			except sr.UnknownValueError:
-				# No output for unrecognized audio
-				if port:
-					port.write(b'l')
-			except sr.RequestError as e:
-				# Only show critical errors
-				print(f"\nNetwork Error: Could not request results; {e}")
-				listen.message_displayed = False
-				talk("I'm having trouble connecting to the speech recognition service")
-				if port:
-					port.write(b'l')
+				return None
+			return voice, False
 	except Exception as e:
 		# Only show actual errors, not routine timeouts
 		if not ("timed out" in str(e).lower() or "listening for" in str(e).lower()):
 			print(f"\nError in listen function: {e}")
 			listen.message_displayed = False
 		
-		if port:
-			port.write(b'l')
+		express(b'l')
 		
 		time.sleep(0.1)  # Brief pause to prevent CPU hogging
+		return None
 
-def process(words):
-	""" process what user says and take actions """
-	print(f"\n▶️  Processing command: {words}")
-	print("-" * 40)
+def recognize_utterance(utterance):
+	""" turn captured audio into text; returns (command, recognizer_seconds) or None """
+	import speech_recognition as sr   # voice recognition library (loaded on first use)
+	voice, heard_wake_word = utterance
 	
-	# Log the command for debugging
 	try:
-		with open("command_log.txt", "a") as log:
-			log.write(f"{datetime.now()}: {words}\n")
-	except:
-		pass
-	
-	# break words into list, ignoring wake word
-	word_list = words.split(' ')[1:]
-	
-	# If just the wake word was said
-	if len(word_list) == 0 or (len(word_list)==1 and word_list[0] == robot_name):
-		talk("How can I help you today?")
-		if port:
-			port.write(b'h')  # Thinking expression
-		return
-		
-	# Common daily questions processing
-	full_text = ' '.join(word_list).lower()
-	
-	# Check for time-related queries
-	if any(phrase in full_text for phrase in ["what time", "what's the time", "current time", "time now"]):
-		talk(get_time_info())
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Check for date-related queries
-	elif any(phrase in full_text for phrase in ["what date", "what day", "today's date", "what is today", "when is today"]):
-		talk(f"Today is {get_date_info()}")
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-	
-	# Check for location-related queries
-	elif any(phrase in full_text for phrase in ["where am i", "what's my location", "my current location"]):
-		talk("Getting your location information")
-		if port:
-			port.write(b'h')  # Thinking expression
-		
-		location_info = get_location_info()
-		talk(location_info)
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Check for battery status queries
-	elif any(phrase in full_text for phrase in ["battery status", "how's my battery", "battery level", "power status"]):
-		talk("Checking your battery status")
-		if port:
-			port.write(b'h')  # Thinking expression
-		
-		battery_info = get_battery_status()
-		talk(battery_info)
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Check for network information queries
-	elif any(phrase in full_text for phrase in ["network info", "what's my ip", "wifi status", "internet connection"]):
-		talk("Checking your network information")
-		if port:
-			port.write(b'h')  # Thinking expression
-		
-		network_info = get_network_info()
-		talk(network_info)
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Check for system information queries
-	elif any(phrase in full_text for phrase in ["system info", "about my computer", "computer details", "system details"]):
-		talk("Here's your system information")
-		if port:
-			port.write(b'h')  # Thinking expression
-		
-		system_info = get_system_info()
-		talk(system_info)
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Check for disk space queries
-	elif any(phrase in full_text for phrase in ["disk space", "storage info", "free space", "disk usage"]):
-		talk("Checking your disk space")
-		if port:
-			port.write(b'h')  # Thinking expression
-		
-		disk_info = get_disk_space()
-		talk(disk_info)
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Check for weather-related queries
-	elif any(phrase in full_text for phrase in ["what's the weather", "weather today", "weather forecast", "how's the weather"]):
-		talk("Checking the weather for you")
-		if port:
-			port.write(b'h')  # Thinking expression
-		
-		# Try to extract city name
-		city_match = re.search(r"in ([a-zA-Z\s]+)$", full_text)
-		if city_match:
-			city = city_match.group(1).strip()
-			weather_info = get_weather_info(city)
-		else:
-			# Use location from get_location_info if available
+		# Recognize with the selected backend, falling back to the offline engine
+		command = ""
+		recognizer_seconds = None
+		if voice is not None:
 			try:
-				location_info = get_location_info()
-				if 'default_location' in globals() and default_location != "San Francisco":
-					weather_info = get_weather_info(default_location)
-				else:
-					weather_info = get_weather_info()
-			except:
-				weather_info = get_weather_info()
-		
-		talk(weather_info)
-		if port:
-			port.write(b'p')  # Happy expression
-		return
+				recognizing = time.time()
+				with health.track('recognizer'):
+					command = get_recognition().recognize(get_listener(), voice).lower()
+				recognizer_seconds = time.time() - recognizing
+				tracing.observe('recognize', recognizer_seconds, backend=get_recognition().last_backend)
+			except sr.UnknownValueError:
+				if not heard_wake_word:
+					raise
 		
-	# Check for joke requests
-	elif any(phrase in full_text for phrase in ["tell joke", "tell me a joke", "know any jokes", "say something funny"]):
-		if port:
-			port.write(b'p')  # Happy expression
-		talk(get_joke())
-		return
+		if heard_wake_word:
+			command = (robot_name + " " + command).strip()
 		
-	# Check for fact requests
-	elif any(phrase in full_text for phrase in ["tell fact", "tell me a fact", "interesting fact", "random fact"]):
-		if port:
-			port.write(b'h')  # Thinking expression
-		talk(get_fact())
-		return
-		
-	# Check for help requests
-	elif any(phrase in full_text for phrase in ["help me", "what can you do", "your commands", "how to use"]):
-		if port:
-			port.write(b'h')  # Thinking expression
-		talk(get_help())
-		return
+		# Start slow lookups now instead of when the handler gets to them
+		speculation = None
+		if command.split(' ')[0] == robot_name:
+			speculation = prefetcher.speculate(command)
+		return command, recognizer_seconds, speculation
+	except sr.UnknownValueError:
+		# No output for unrecognized audio
+		express(b'l')
+	except sr.RequestError as e:
+		# Only show critical errors
+		print(f"\nNetwork Error: Could not request results; {e}")
+		internet.check_now()  # confirm the outage so the next command goes offline at once
+		listen.message_displayed = False
+		talk("I'm having trouble connecting to the speech recognition service", fixed=True)
+		express(b'l')
+	return None
+
+def handle_command(recognized):
+	""" act on a transcribed command if it was meant for us """
+	command, recognizer_seconds, speculation = recognized
 	
-	# Check for general well-being questions
-	elif any(phrase in full_text for phrase in ["how are you", "how you doing", "how do you feel"]):
-		responses = ["I'm doing well, thank you for asking!", 
-		             "I'm functioning optimally today!", 
-		             "All systems operational and ready to assist you!"]
-		talk(random.choice(responses))
-		if port:
-			port.write(b'p')  # Happy expression
+	# Look for wake word anywhere in the command
+	if robot_name not in command:
+		# No output if wake word not found
+		express(b'l')
 		return
 	
-	# "What to do today" type questions
-	elif any(phrase in full_text for phrase in ["what to do", "what should i do", "i'm bored", "suggest activity"]):
-		activities = [
-			"How about reading a book?",
-			"You could go for a walk and enjoy the fresh air.",
-			"Maybe catch up on a TV series you've been meaning to watch.",
-			"How about learning something new today?",
-			"You could call a friend or family member you haven't spoken to in a while.",
-			"Perhaps some exercise would be good for you today."
-		]
-		talk(random.choice(activities))
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-		
-	# Identity questions
-	elif any(phrase in full_text for phrase in ["who are you", "what are you", "tell me about yourself"]):
-		talk("I am Jarvis, your personal AI assistant. I can help you with daily tasks, answer questions, and control connected devices.")
-		if port:
-			port.write(b'p')  # Happy expression
-		return
-
-	if word_list[0] == 'play':
-		"""if command for playing things, play from youtube"""
-		talk("Okay boss, playing")
-		extension = ' '.join(word_list[1:])                    # search without the command word
-		if port:
-			port.write(b'u')
-		pywhatkit.playonyt(extension)   
-		if port:
-			port.write(b'l')          
-		return
-
-	elif word_list[0] == 'search' or word_list[0] == 'look' or word_list[0] == 'find':
-		"""if command for google search"""
-		if port:
-			port.write(b'u')
-		talk("Okay boss, searching")
-		if port:
-			port.write(b'h')  # Thinking expression
-		extension = ' '.join(word_list[1:])
-		pywhatkit.search(extension)
-		if port:
-			port.write(b'l')
-		return
-
-	if (word_list[0] == 'get') and (word_list[1] == 'info'):
-		"""if command for getting info"""
-		if port:
-			port.write(b'u')
-		talk("Okay, I am right on it")
-		if port:
-			port.write(b'u')
-		extension = ' '.join(word_list[2:])                    # search without the command words
-		inf = pywhatkit.info(extension)
-		talk(inf)                                              # read from result             
-		return
-
-	elif word_list[0] == 'open':
-		"""if command for opening URLs"""
-		if port:
-			port.write(b'l')
-		talk("Opening, sir")
-		url = f"http://{''.join(word_list[1:])}"   # make the URL
-		webbrowser.open(url)
-		return
-	elif word_list[0] == 'angry' or word_list[0] == 'uppercut':
-		if port:
-			port.write(b'U')
-
-	elif word_list[0] == 'sad' or word_list[0] == 'smash':
-		if port:
-			port.write(b's')
-
-	elif word_list[0] == 'happy' or word_list[0] == 'punch':
-		if port:
-			port.write(b'p')
-			
-	elif word_list[0] == 'surprise' or word_list[0] == 'surprised':
-		if port:
-			port.write(b'a')
-
-	# Handle generic questions - check if it's likely a question
-	question_starters = ["what", "who", "when", "where", "why", "how", "is", "can", "could", "would", "will", "should"]
-	
-	if len(word_list) >= 2 and word_list[0].lower() in question_starters:
-		if port:
-			port.write(b'h')  # Thinking expression
-		talk("Let me look that up for you")
-		query = ' '.join(word_list)
-		pywhatkit.search(query)
-		return
+	# Print what was heard only when wake word is detected
+	print(f"\nHeard: {command}")
+	print(f"[Wake word '{robot_name}' detected!]")
 	
-	# now check for matches in specific words
-	for word in word_list:
-		if word in hi_words:
-			""" if user says hi/hello greet him accordingly"""
-			if port:
-				port.write(b'h')               # send command for thinking expression
-			talk(random.choice(hi_words))
-			return
-
-		elif word in bye_words:
-			""" if user says bye etc"""
-			if port:
-				port.write(b's')               # send command for sad expression
-			talk(random.choice(bye_words))
-			return
-			
-		elif word in r_u_there:
-			""" if user asks if assistant is there """
-			if port:
-				port.write(b'p')               # send command for happy expression
-			talk("Yes, I'm here and ready to help!")
-			return
+	# Reset message flag to show listening again after processing
+	listen.message_displayed = False
 	
-	# Fallback for unrecognized commands
-	talk("I'm not sure how to help with that. Would you like me to search the web for you?")
-	if port:
-		port.write(b'h')  # Thinking expression
+	# Barge-in: a new command cancels whatever we were still saying
+	speech.interrupt()
+	
+	express(b'p')  # Show happy expression when activated
+	
+	# If wake word is not at the beginning, rearrange command
+	if command.split(' ')[0] != robot_name:
+		words = command.split()
+		idx = words.index(robot_name)
+		command = robot_name + " " + " ".join(words[:idx] + words[idx+1:])
+	
+	process(command, recognizer_seconds, speculation)
 
+def listen():
+	""" listen to what user says and act on it, one turn at a time """
+	try:
+		utterance = capture_utterance()
+		recognized = utterance and recognize_utterance(utterance)
+		if recognized:
+			handle_command(recognized)
+	except Exception as e:
+		print(f"\nError in listen function: {e}")
+		listen.message_displayed = False
+		express(b'l')
 
-def talk(sentence):
-	""" talk / respond to the user through Mac's speakers with a female Siri-like voice """
+def process(words, recognizer_seconds=None, speculation=None):
+	""" process what user says and take actions """
+	print(f"\n▶️  Processing command: {words}")
+	print("-" * 40)
+	started = time.time()
+	
+	# Match the command against the compiled intent table in one pass
+	with tracing.span('intent_match'):
+		route = router.route(words)
+		# Follow-ups ("and tomorrow?", "in London?", "yes") take their meaning from earlier turns
+		route = session.resolve(words, route)
+	session.record(words, route)
+	
+	# Keep a lookup started from the transcript only if it was for this intent
+	prefetcher.settle(speculation, route.intent, route.slots)
+	
+	# Expression words (angry, sad, ...) light up before the command is answered
+	for expression in route.expressions:
+		express(expression)
+	
+	record = {'ts': datetime.fromtimestamp(started).isoformat(timespec='milliseconds'),
+	          'transcript': words, 'intent': route.intent}
+	if recognizer_seconds is not None:
+		record['recognizer_ms'] = round(recognizer_seconds * 1000, 1)
+	
+	# The handler runs inline, or on the skill pool if it may block on the web
+	def finished(error, seconds):
+		if isinstance(error, TimeoutError):
+			record['error'] = str(error)
+			talk("Sorry, that is taking too long. Please try again later.", end_expression=b's', fixed=True)  # Sad expression
+		elif error is not None:
+			record['error'] = str(error)
+			express(b'l')
+		tracing.observe('handler', seconds, intent=route.intent)
+		handled = time.time()
+		record['handler_ms'] = round((handled - started) * 1000, 1)
+		
+		# Log the command once its answer has been spoken (or interrupted)
+		def spoken(interrupted=False):
+			record['tts_ms'] = round((time.time() - handled) * 1000, 1)
+			if interrupted:
+				record['interrupted'] = True
+			commands.write(record)
+		speech.say("", on_end=spoken, on_cancel=lambda: spoken(interrupted=True))
+	registry.dispatch(route.intent, route.slots, finished)
+
+# Lookups that may start before their handler runs (they must not have side effects)
+prefetcher.register('weather', registry.bound('weather', 'lookup_weather'), keep=registry.bound('weather', 'keep_weather'))
+prefetcher.register('location', registry.bound('location', 'lookup_location'), keep=lambda text: False)  # cached on disk already
+prefetcher.register('info', registry.bound('info', 'lookup_info'))
+
+
+def express(code):
+	""" show an expression on the robot's LEDs """
+	get_body().send(code)
+
+def express_after_speech(code):
+	""" show an expression once everything queued so far has been spoken """
+	speech.say("", on_end=lambda: express(code))
+
+def talk(sentence, start_expression=None, end_expression=None, priority=speech_queue.NORMAL, fixed=False):
+	""" talk / respond to the user through Mac's speakers with a female Siri-like voice
+	
+	Returns immediately with a handle; call handle.wait() when the next step
+	has to wait for the speech to finish. The expressions are shown when the
+	sentence starts and ends being spoken. fixed=True marks a constant phrase,
+	which is played from its recording once it has been rendered.
+	"""
+	# A handler that was given up on has nothing more to say
+	if skills.cancelled():
+		handle = speech_queue.SpeechHandle(sentence, priority)
+		handle.cancel()
+		handle.done.set()
+		return handle
+	
 	print(f"🤖 {sentence}")  # Print the response
 	
+	if fixed:
+		phrases.add(sentence)
+	
 	# After responding, reset the listening message flag
 	listen.message_displayed = False
 	
+	return speech.say(sentence, priority,
+	                  on_start=(lambda: express(start_expression)) if start_expression else None,
+	                  on_end=(lambda: express(end_expression)) if end_expression else None)
+
+def speak(sentence, handle):
+	""" speak one sentence on the speech thread, stopping early if the handle is cancelled """
 	# Try several voice output methods in order of reliability
 	voice_output_success = False
 	
-	# Method 1: Use the globally initialized engine if available
-	try:
-		global voice_engine
-		if voice_engine:
-			print("Using pre-initialized voice engine...")
-			
-			# Speak with proper error handling
-			voice_engine.say(sentence)
-			
-			# Run in try-except to catch any hanging issues
-			try:
-				voice_engine.runAndWait()
-				voice_output_success = True
-				print("Pre-initialized voice engine output completed")
-			except RuntimeError as re:
-				print(f"Error with pre-initialized engine: {re}")
-				# Don't set success flag so we try other methods
-	except Exception as e:
-		print(f"Pre-initialized voice engine failed: {e}")
-	
-	# Method 2: Create a new pyttsx3 engine instance if needed
-	if not voice_output_success:
+	# Method 0: Constant phrases are played from their recording, no synthesis needed
+	recording = phrases.lookup(sentence)
+	if recording:
 		try:
-			print("Attempting voice output with new pyttsx3 instance...")
-			# Initialize the engine outside of any loop to avoid resource issues
-			speech_engine = pyttsx3.init()
-			
-			# Get all available voices
-			voices = speech_engine.getProperty('voices')
-			karen_voice = None
-			
-			# Find Karen voice specifically
-			for voice in voices:
-				if 'karen' in voice.id.lower():
-					karen_voice = voice.id
-					print(f"Found Karen voice: {voice.id}")
-					break
-			
-			# If Karen voice not found, find any female voice
-			if not karen_voice:
-				for voice in voices:
-					voice_id = voice.id.lower()
-					if any(name in voice_id for name in ["samantha", "siri", "female", "moira"]):
-						karen_voice = voice.id
-						print(f"Using alternative female voice: {voice.id}")
-						break
-			
-			# Set the voice if found
-			if karen_voice:
-				speech_engine.setProperty('voice', karen_voice)
-			
-			# Set properties with good defaults for clear speech
-			speech_engine.setProperty('rate', 165)      # Speed (slightly slower)
-			speech_engine.setProperty('volume', 1.0)    # Volume
+			with health.track('voice'), tracing.span('tts', step='playback'):
+				phrase_cache.play_file(recording, cancelled=lambda: handle.cancelled)
+			print("-" * 40)
+			return True
+		except Exception as e:
+			print(f"Playing the recorded phrase failed: {e}")
+			phrases.forget(sentence)
+	
+	# Method 1: Use the shared engine (rebuilt after a fault, with backoff)
+	try:
+		engine = get_tts().get()
+		chunks = streaming_tts.split_chunks(sentence)
+		if engine and len(chunks) > 1:
+			# Long answers: the next chunk is rendered while this one plays, and the
+			# rest is skipped as soon as the utterance is interrupted
+			chunked_speech.speak(chunks, cancelled=lambda: handle.cancelled)
+			voice_output_success = True
+			get_tts().report_success()
+		elif engine:
+			# Stop mid-sentence if the utterance is interrupted (barge-in)
+			token = engine.connect('started-word', lambda name, location, length: engine.stop() if handle.cancelled else None)
 			
 			# Speak with proper error handling
-			speech_engine.say(sentence)
-			
-			# Run in try-except to catch any hanging issues
 			try:
-				speech_engine.runAndWait()
-			except RuntimeError:
-				print("Caught runtime error in runAndWait()")
-				# Continue to cleanup
-			
-			# Cleanup - important to prevent resource issues
-			try:
-				speech_engine.stop()
-			except:
-				pass
-			
-			# Remove reference to the engine
-			del speech_engine
+				with health.track('voice'), tracing.span('tts', step='speak'):
+					engine.say(sentence)
+					engine.runAndWait()
+			finally:
+				engine.disconnect(token)
 			
-			print("New pyttsx3 instance voice output completed")
 			voice_output_success = True
-		except Exception as e:
-			print(f"New pyttsx3 instance voice output failed: {e}")
+			get_tts().report_success()
+			
+			# Record it for next time once nothing else is waiting to be said
+			if sentence in phrases.phrases:
+				render_phrases_when_idle()
+	except Exception as e:
+		# Drop the engine; the next sentence gets a fresh one once the backoff has passed
+		get_tts().report_fault(e)
 	
-	# Method 3: If pyttsx3 failed, try subprocess for more direct control
+	# Method 2: If pyttsx3 failed, try subprocess for more direct control
 	if not voice_output_success:
 		try:
 			print("Trying subprocess with say command...")
-			import subprocess
 			
 			# Use a female voice explicitly and increase volume
 			safe_sentence = sentence.replace('"', '\\"').replace("'", "\\'")
-			subprocess.run(["say", "-v", "Karen", safe_sentence], check=True, timeout=10)
+			say_process = subprocess.Popen(["say", "-v", "Karen", safe_sentence])
+			
+			# Poll so the utterance can be interrupted, with the same 10 second limit
+			deadline = time.time() + 10
+			with tracing.span('tts', step='say'):
+				while say_process.poll() is None:
+					if handle.cancelled or time.time() > deadline:
+						say_process.terminate()
+						break
+					time.sleep(0.05)
+			if not handle.cancelled and say_process.returncode not in (0, None):
+				raise subprocess.CalledProcessError(say_process.returncode, "say")
 			
 			print("Subprocess say command successful")
 			voice_output_success = True
 		except Exception as e:
 			print(f"Subprocess say command failed: {e}")
 	
-	# Method 4: Last resort - direct OS command with specific voice and volume
+	# Method 3: Last resort - direct OS command with specific voice and volume
 	if not voice_output_success:
 		try:
 			print("Using direct OS system call...")
@@ -852,52 +527,52 @@ def talk(sentence):
 	
 	# Add a separator line after response for cleaner output
 	print("-" * 40)
+	return voice_output_success
+
+def render_chunk(text, path):
+	""" render one chunk of a long answer to a file (on the speech thread) """
+	engine = get_tts().get()
+	if engine is None:
+		raise RuntimeError("the voice engine is not available")
+	with health.track('voice'), tracing.span('tts', step='synthesis'):
+		engine.save_to_file(text, path)
+		engine.runAndWait()
+
+def play_chunk(path, cancelled):
+	""" play one rendered chunk (on the player thread) """
+	with tracing.span('tts', step='playback'):
+		return phrase_cache.play_file(path, cancelled)
+
+# Plays chunk N while chunk N+1 is rendered
+chunked_speech = streaming_tts.ChunkPipeline(render_chunk, play_chunk)
+
+def render_phrases_when_idle():
+	""" render the missing phrase recordings one at a time, whenever the speech queue is empty """
+	if getattr(render_phrases_when_idle, 'queued', False):
+		return
+	render_phrases_when_idle.queued = True
+	
+	def render_one():
+		# Runs on the speech thread, which owns the engine
+		render_phrases_when_idle.queued = False
+		engine = get_tts().get()
+		if engine and phrases.render_next(engine):
+			render_phrases_when_idle()
+	
+	speech.say("", priority=speech_queue.IDLE, on_end=render_one,
+	           on_cancel=lambda: setattr(render_phrases_when_idle, 'queued', False))
 
 # Initialize the text-to-speech engine
 def initialize_tts_engine():
-    """Initialize and configure the TTS engine for better performance"""
-    global voice_engine
-    try:
-        print("🔊 Initializing text-to-speech engine...")
-        voice_engine = pyttsx3.init()
-        
-        # Get all available voices
-        voices = voice_engine.getProperty('voices')
-        
-        # Find and select Karen voice or other female voice
-        karen_found = False
-        for voice in voices:
-            if 'karen' in voice.id.lower():
-                voice_engine.setProperty('voice', voice.id)
-                print(f"Using Karen voice: {voice.id}")
-                karen_found = True
-                break
-        
-        # If Karen voice not found, use another female voice
-        if not karen_found:
-            for voice in voices:
-                if any(name in voice.id.lower() for name in ["samantha", "siri", "female", "moira"]):
-                    voice_engine.setProperty('voice', voice.id)
-                    print(f"Using alternative female voice: {voice.id}")
-                    break
-        
-        # Set voice properties for clarity
-        voice_engine.setProperty('rate', 165)  # Speed (slightly slower)
-        voice_engine.setProperty('volume', 1.0)  # Full volume
-        
-        # Print all available voices for debugging
-        print("\nAvailable voices:")
-        for i, voice in enumerate(voices):
-            print(f"{i+1}. {voice.id}")
-        
-        return voice_engine
-    except Exception as e:
-        print(f"Error initializing TTS engine: {e}")
-        return None
+    """Initialize the shared TTS engine (runs on the speech thread)"""
+    engine = get_tts().get()
+    if engine:
+        phrases.configure_from(engine)
+    return engine
 
 # Function to test voice output
 def test_voice():
-    """Test if the voice output is working properly"""
+    """Test if the voice output is working properly (queued, doesn't block startup)"""
     print("\n🔊 Testing voice output...")
     test_phrases = [
         "Hello, I am Jarvis, your personal assistant.",
@@ -905,14 +580,55 @@ def test_voice():
         "Voice test complete. Starting normal operation."
     ]
     
-    for phrase in test_phrases:
-        talk(phrase)
-        time.sleep(0.5)
-    
-    return True
+    handles = [talk(phrase, fixed=True) for phrase in test_phrases]
+    return handles[-1]
+
+# Speech worker thread; the TTS engine is created on that thread when it starts
+speech = speech_queue.SpeechQueue(speak, setup=initialize_tts_engine)
+
+def restart_voice():
+    """Drop the voice engine and replace the speech thread if it is stuck"""
+    if tts is not None:
+        tts.report_fault()
+    speech.restart()
+
+def observe_http(endpoint, seconds):
+    """Every web request counts towards the http health check and the http span"""
+    health.observe('http', seconds)
+    tracing.observe('http', seconds, endpoint=endpoint)
+
+def supervise():
+    """Register the subsystems with the health supervisor
+
+    Each one is restarted on its own when it stops or gets too slow, so a
+    hung voice engine doesn't cost the recognizer its calibration.
+    """
+    health.register('microphone', restart_microphone, check=microphone_problem)
+    health.register('recognizer', restart_recognizer, hang_timeout=30, slo=6.0)
+    health.register('voice', restart_voice, hang_timeout=60,
+                    check=lambda: None if speech.alive else "speech thread stopped")
+    health.register('arduino', lambda: get_body().start(),
+                    check=lambda: "link thread stopped" if body is not None and not body.alive else None)
+    health.register('http', lambda: http_client.get_client().reset(), slo=8.0)
+    http_client.get_client().observer = observe_http
 
 # Startup announcement
 if __name__ == "__main__":
+	import argparse
+	parser = argparse.ArgumentParser(description="Jarvis AI Assistant")
+	parser.add_argument("--profile", action="store_true", help="time every step and print a report on exit")
+	parser.add_argument("--metrics-port", type=int, help="serve the step timings for Prometheus on 127.0.0.1:PORT/metrics")
+	args = parser.parse_args()
+	
+	# Step timings are only collected when someone is going to look at them
+	tracer = tracing.get_tracer()
+	tracer.enabled = args.profile or args.metrics_port is not None
+	tracer.collectors.append(registry.format_prometheus)
+	tracer.collectors.append(knowledge.format_prometheus)
+	if args.metrics_port is not None:
+		tracer.serve(args.metrics_port)
+		print(f"📈 Step timings at http://127.0.0.1:{args.metrics_port}/metrics")
+	
 	print("\n" + "=" * 60)
 	print(f"{' ' * 20}JARVIS AI Assistant")
 	print("=" * 60)
@@ -925,82 +641,84 @@ if __name__ == "__main__":
 	
 	print("\n🤖 Starting Jarvis AI Assistant...\n")
 	
-	# Initialize global voice engine
-	voice_engine = initialize_tts_engine()
+	# Start the speech thread, which initializes the shared voice engine
+	speech.start()
+	
+	# Resolve (or refresh) the location in the background before it's needed
+	locations.get(wait=False)
+	
+	# Keep battery, network and disk readings fresh so answers don't wait for them
+	sensors.start()
+	
+	# Watch the internet connection, so lookups use the cache or offline engine at once when it's down
+	internet.start()
+	http_client.get_client().online = lambda: internet.online
 	
 	# Announce system startup
-	if port:
-		port.write(b'a')  # Surprise expression on startup
-		time.sleep(1)
+	express(b'a')  # Surprise expression on startup (sent once the board is ready)
 	
 	# Test the voice first
 	test_voice()
 	
+	# Record the constant phrases that don't have a recording for this voice yet
+	phrases.add(*hi_words, *bye_words)
+	render_phrases_when_idle()
+	
 	print("\n🎤 Say commands starting with 'Jarvis'")
 	print("   For example: 'Jarvis, what time is it?'")
 	print("   Press Ctrl+C to exit\n")
 	
-	# Reset function to reinitialize key components periodically
-	def reset_components():
-		"""Reset speech recognition and other components to prevent hanging"""
-		global listener
-		print("\n[System: Performing periodic reset to maintain responsiveness]")
-		
-		# Reinitialize the speech recognizer
-		listener = sr.Recognizer()
-		listener.energy_threshold = 4000
-		listener.dynamic_energy_threshold = True
-		listener.pause_threshold = 0.8
-		
-		# Reset the message display flag
-		listen.message_displayed = False
-		
-		# Clear any resource-intensive processes
-		try:
-			import gc
-			gc.collect()
-		except:
-			pass
-		
-		return time.time()
+	# Capture, recognition and command handling run as a pipeline, so the next
+	# command is heard while the last one is still being answered
+	import runtime                    # asyncio main loop (loaded only when running)
+	jarvis = runtime.Runtime(capture_utterance, recognize_utterance, handle_command)
 	
-	# Track when we last reset components
-	last_reset_time = time.time()
+	# Restart only the subsystems that stopped answering or got too slow
+	supervise()
+	jarvis.every(5, health.check)
 	
 	# Main loop
 	try:
-		while True:
-			# Periodically reset components to prevent hanging (every 5 minutes)
-			if time.time() - last_reset_time > 300:  # 5 minutes in seconds
-				last_reset_time = reset_components()
-			
-			listen()  # Listen for commands without cluttering the console
-			
-			# Short sleep to prevent CPU hogging
-			time.sleep(0.1)
+		jarvis.run_forever()
 	except KeyboardInterrupt:
 		print("\n\n" + "=" * 60)
 		print("Shutting down Jarvis...")
 		print("=" * 60)
-		talk("Shutting down. Goodbye.")
+		
+		# Report how long intent matching and each pipeline stage took this session
+		print(router.format_histogram())
+		print(jarvis.format_stats())
+		print(prefetcher.format_report())
+		print(registry.format_report())
+		print(session.format_report())
+		print(knowledge.format_report())
+		print(health.format_status())
+		if args.profile:
+			print(tracer.format_report())
+		speech.interrupt()
+		talk("Shutting down. Goodbye.", fixed=True).wait(timeout=10)
+		speech.stop()
+		commands.close()
+		knowledge.close()
 		
 		# Cleanup voice engine resources
-		if 'voice_engine' in globals() and voice_engine:
+		if tts and tts.engine:
 			try:
 				print("Cleaning up voice engine...")
-				voice_engine.stop()
-				del voice_engine
+				tts.engine.stop()
 			except:
 				pass
 			
+		# Stop the microphone capture thread
+		if microphone:
+			microphone.stop()
+		
 		# Cleanup Arduino connection
-		if port:
-			port.write(b's')  # Sad expression when shutting down
-			time.sleep(1)
-			port.write(b'l')  # Turn off all lights
-			# Close the port properly
-			try:
-				port.close()
-				print("Arduino connection closed.")
-			except:
-				pass
\ No newline at end of file
+		if body:
+			was_connected = body.connected
+			body.send(b's')  # Sad expression when shutting down
+			body.send(b'l')  # Turn off all lights
+			# Let the link thread deliver them, then close the port
+			body.stop(timeout=3)
+			if was_connected:
+				print("Arduino connection closed.")
\ No newline at end of file
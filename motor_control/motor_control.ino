@@ -18,8 +18,23 @@ Servo r_hand;
 int trig = 4;
 int echo = 5;
 
-// received data
-byte val = "";
+// Serial speed; Python tries 115200 first and falls back to 9600
+const long BAUD_RATE = 115200;
+
+// Framed protocol (see arduino_led_expressions.ino and expression_protocol.py):
+// 0xA5 | seq | length | commands (letter + duration in ms) | crc8
+const byte FRAME_START = 0xA5;
+const byte MAX_PAYLOAD = 48;
+const byte STATUS_OK = 0;
+const byte STATUS_BAD_CHECKSUM = 1;
+const byte STATUS_UNKNOWN_COMMAND = 2;
+const byte STATUS_TOO_LONG = 3;
+const unsigned long FRAME_TIMEOUT = 100;
+
+byte frame[MAX_PAYLOAD + 2];        // seq, length, payload
+byte frameIndex = 0;
+bool inFrame = false;
+unsigned long frameStarted = 0;
 
 void setup() {
   // put your setup code here, to run once:
@@ -27,7 +42,8 @@ void setup() {
   l_hand.attach(3);
   r_hand.attach(4);
 
-  Serial.begin(9600); // for communicating via serial port with Python
+  Serial.begin(BAUD_RATE); // for communicating via serial port with Python
+  Serial.println("JAUNDICE Robot Ready! proto=2");
 }
 
 void standby(){
@@ -248,39 +264,127 @@ void eye_detect(){
   return;
 }
 
-void loop() {
-  // put your main code here, to run repeatedly:
-  standby();
-
-  while(Serial.available() > 0)  //look for serial data available or not
-  {
-    val = Serial.read();        //read the serial value
+// Hold time: the frame's duration if one was given, else the default
+unsigned long hold(unsigned int duration, unsigned long fallback) {
+  return duration ? duration : fallback;
+}
 
-    if(val == 'h'){
+// Run one motion; returns false for an unknown command
+bool runCommand(char command, unsigned int duration) {
+  switch(command) {
+    case 'h':
       // do hi
-       hi();
-    }
-    if(val == 'p'){
+      hi();
+      return true;
+    case 'p':
       // do hi
-       double_punch();
-    }
-    if(val == 'u'){
+      double_punch();
+      return true;
+    case 'u':
       hands_up();
-      delay(3000);
-    }
-    if(val == 'l'){
+      delay(hold(duration, 3000));
+      return true;
+    case 'l':
       standby();
       look_left();
-      delay(2000);
-    }
-    if(val == 'U'){
+      delay(hold(duration, 2000));
+      return true;
+    case 'U':
       // uppercut
       r_upper_cut();
-      delay(2000);
-    }
-    if(val == 's'){
+      delay(hold(duration, 2000));
+      return true;
+    case 's':
       smash();
-      delay(2000);
+      delay(hold(duration, 2000));
+      return true;
+    case 'V':
+      // protocol probe, nothing to do
+      return true;
+  }
+  return false;
+}
+
+// CRC-8, polynomial 0x07 (same as crc8() in expression_protocol.py)
+byte crc8(const byte *data, byte length) {
+  byte crc = 0;
+  for (byte i = 0; i < length; i++) {
+    crc ^= data[i];
+    for (byte bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : crc << 1;
     }
   }
-}
+  return crc;
+}
+
+void sendAck(byte seq, byte status) {
+  byte ack[3] = {seq, 1, status};
+  Serial.write(FRAME_START);
+  Serial.write(ack, 3);
+  Serial.write(crc8(ack, 3));
+}
+
+// Acknowledge a complete frame, then run its commands in order
+void handleFrame(byte checksum) {
+  byte seq = frame[0];
+  byte length = frame[1];
+  if (crc8(frame, length + 2) != checksum) {
+    sendAck(seq, STATUS_BAD_CHECKSUM);
+    return;
+  }
+  bool known = true;
+  for (byte i = 2; i + 3 <= length + 2; i += 3) {
+    if (frame[i] == 0 || strchr("VhpulUs", frame[i]) == NULL) {
+      known = false;
+    }
+  }
+  sendAck(seq, known ? STATUS_OK : STATUS_UNKNOWN_COMMAND);
+  for (byte i = 2; i + 3 <= length + 2; i += 3) {
+    unsigned int duration = ((unsigned int)frame[i + 1] << 8) | frame[i + 2];
+    runCommand(frame[i], duration);
+  }
+}
+
+// Feed one received byte to the frame parser
+void readFrameByte(byte value) {
+  if (frameIndex < 2) {
+    frame[frameIndex++] = value;
+    if (frameIndex == 2 && frame[1] > MAX_PAYLOAD) {
+      sendAck(frame[0], STATUS_TOO_LONG);
+      inFrame = false;
+    }
+    return;
+  }
+  if (frameIndex < frame[1] + 2) {
+    frame[frameIndex++] = value;
+    return;
+  }
+  inFrame = false;
+  handleFrame(value);
+}
+
+void loop() {
+  // put your main code here, to run repeatedly:
+  standby();
+
+  // Give up on a frame that stopped arriving
+  if (inFrame && millis() - frameStarted > FRAME_TIMEOUT) {
+    inFrame = false;
+  }
+
+  while(Serial.available() > 0)  //look for serial data available or not
+  {
+    byte val = Serial.read();        //read the serial value
+
+    if (inFrame) {
+      readFrameByte(val);
+    } else if (val == FRAME_START) {
+      inFrame = true;
+      frameIndex = 0;
+      frameStarted = millis();
+    } else {
+      // legacy single-letter command
+      runCommand(val, 0);
+    }
+  }
+}
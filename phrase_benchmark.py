@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Phrase cache benchmark for Jarvis
+Measures time-to-first-audio of constant phrases spoken through the TTS
+engine and played from their cached recordings. Needs a working voice
+engine and speakers, since both paths really play the phrases.
+
+Usage:
+    python phrase_benchmark.py [--runs 3] [--directory /tmp/jarvis_phrases]
+"""
+
+import argparse
+import tempfile
+import time
+
+import phrase_cache
+import tts_engine
+
+PHRASES = [
+    "How can I help you today?",
+    "Checking the weather for you",
+    "Okay boss, playing",
+    "Yes, I'm here and ready to help!",
+    "Hello, I am Jarvis, your personal assistant.",
+]
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def first_audio_from_engine(engine, text):
+    """Seconds from say() until the engine reports that the utterance started"""
+    started, first = time.perf_counter(), []
+    token = engine.connect('started-utterance', lambda name: first.append(time.perf_counter()))
+    try:
+        engine.say(text)
+        engine.runAndWait()
+    finally:
+        engine.disconnect(token)
+    return (first[0] if first else time.perf_counter()) - started
+
+
+def first_audio_from_cache(path):
+    """Seconds from play_file() until the first chunk goes to the sound card"""
+    started, first = time.perf_counter(), []
+    phrase_cache.play_file(path, on_start=lambda: first.append(time.perf_counter()))
+    return first[0] - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare time-to-first-audio of synthesized and cached phrases")
+    parser.add_argument("--runs", type=int, default=3, help="times each phrase is spoken per path")
+    parser.add_argument("--directory", default=None, help="where to render the recordings (default: a temp dir)")
+    args = parser.parse_args()
+
+    print_header("Jarvis Phrase Cache Benchmark")
+
+    try:
+        engine = tts_engine.EngineManager().get()
+    except Exception as e:
+        engine = None
+        print(f"Voice engine error: {e}")
+    if engine is None:
+        print("❌ No voice engine available, nothing to measure")
+        return 1
+
+    cache = phrase_cache.PhraseCache(args.directory or tempfile.mkdtemp(prefix="jarvis_phrases_"))
+    cache.add(*PHRASES)
+    render_times = []
+    for text in PHRASES:
+        started = time.perf_counter()
+        cache.render(engine, text)
+        render_times.append(time.perf_counter() - started)
+    print(f"Rendered {len(PHRASES)} phrases in {sum(render_times):.2f} s (one time, per voice setting)\n")
+
+    synthesized, cached = [], []
+    for _ in range(args.runs):
+        for text in PHRASES:
+            synthesized.append(first_audio_from_engine(engine, text))
+            cached.append(first_audio_from_cache(cache.lookup(text)))
+
+    print(f"{'path':<14}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, times in (("engine", synthesized), ("cache", cached)):
+        ms = [t * 1000 for t in times]
+        print(f"{name:<14}{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}{max(ms):>10.1f}")
+
+    passed = percentile(cached, 50) < percentile(synthesized, 50)
+    if passed:
+        print(f"\n✅ Cached phrases start {percentile(synthesized, 50) / max(percentile(cached, 50), 1e-6):.1f}x sooner")
+    else:
+        print("\n❌ Cached phrases didn't start sooner than synthesized ones")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""
+Phrase audio cache for Jarvis
+Constant phrases ("Checking the weather for you", the greetings, ...) are
+rendered to audio files once per voice, rate and volume and played back
+directly afterwards, skipping speech synthesis. Files are named by a hash
+of the text and the voice settings, so a new voice simply gets new files.
+"""
+
+import hashlib                    # for content addresses
+import json                       # for hashing the settings
+import os                         # for the cache directory
+import platform                   # for the file format and player
+import subprocess                 # for the fallback player
+import threading                  # for the registry lock
+import time                       # for polling the fallback player
+import wave                       # for reading rendered phrases
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PHRASE_DIR = os.path.join(BASE_DIR, ".jarvis_phrases")
+CHUNK_FRAMES = 1024
+MAX_FAILURES = 3                  # playback failures before the cache is bypassed
+
+# pyttsx3 writes AIFF on macOS and WAV elsewhere
+SUFFIX = ".aiff" if platform.system() == "Darwin" else ".wav"
+PLAYER = ["afplay"] if platform.system() == "Darwin" else ["aplay", "-q"]
+
+
+def play_file(path, cancelled=None, on_start=None):
+    """Play a rendered phrase, stopping early when cancelled() turns true
+
+    WAV files go straight to the sound card through PyAudio; anything
+    else (or no PyAudio) is handed to the system player.
+    """
+    cancelled = cancelled or (lambda: False)
+    try:
+        clip = wave.open(path, 'rb')
+    except (wave.Error, EOFError):
+        clip = None
+    if clip is not None:
+        try:
+            import pyaudio            # audio output (also used for the microphone)
+        except ImportError:
+            clip.close()
+            clip = None
+    if clip is None:
+        return _play_with_system_player(path, cancelled, on_start)
+
+    with clip:
+        audio = pyaudio.PyAudio()
+        try:
+            stream = audio.open(format=audio.get_format_from_width(clip.getsampwidth()),
+                                channels=clip.getnchannels(), rate=clip.getframerate(), output=True)
+            try:
+                data = clip.readframes(CHUNK_FRAMES)
+                if on_start:
+                    on_start()
+                while data and not cancelled():
+                    stream.write(data)
+                    data = clip.readframes(CHUNK_FRAMES)
+            finally:
+                stream.stop_stream()
+                stream.close()
+        finally:
+            audio.terminate()
+    return True
+
+
+def _play_with_system_player(path, cancelled, on_start):
+    player = subprocess.Popen(PLAYER + [path])
+    if on_start:
+        on_start()
+    while player.poll() is None:
+        if cancelled():
+            player.terminate()
+            return True
+        time.sleep(0.02)
+    if player.returncode != 0:
+        raise subprocess.CalledProcessError(player.returncode, PLAYER[0])
+    return True
+
+
+class PhraseCache(object):
+    """Rendered recordings of registered phrases for the current voice settings
+
+    Only phrases registered with add() are cached, so dynamic text still
+    goes through the engine. configure() must be called with the engine's
+    settings before lookup() finds anything.
+    """
+
+    def __init__(self, directory=PHRASE_DIR):
+        self.directory = directory
+        self.phrases = set()
+        self.settings = None
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def add(self, *texts):
+        """Register constant phrases"""
+        with self._lock:
+            self.phrases.update(text for text in texts if text)
+
+    def configure(self, voice_id, rate, volume):
+        """The voice settings the recordings must match"""
+        self.settings = {'voice': voice_id, 'rate': rate, 'volume': round(float(volume), 2)}
+
+    def configure_from(self, engine):
+        self.configure(engine.getProperty('voice'), engine.getProperty('rate'), engine.getProperty('volume'))
+
+    def path_for(self, text):
+        key = json.dumps([text, self.settings], sort_keys=True).encode()
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest() + SUFFIX)
+
+    def lookup(self, text):
+        """Path of the recording for a registered phrase, or None"""
+        if self.settings is None or text not in self.phrases or self.failures >= MAX_FAILURES:
+            return None
+        path = self.path_for(text)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def missing(self):
+        """Registered phrases that have no recording for the current settings yet"""
+        if self.settings is None or self.failures >= MAX_FAILURES:
+            return []
+        with self._lock:
+            phrases = sorted(self.phrases)
+        return [text for text in phrases if not os.path.exists(self.path_for(text))]
+
+    def render(self, engine, text):
+        """Synthesize one phrase to its file (on the engine's thread)"""
+        self.configure_from(engine)
+        path = self.path_for(text)
+        os.makedirs(self.directory, exist_ok=True)
+        partial = path + ".part"
+        engine.save_to_file(text, partial)
+        engine.runAndWait()
+        if not os.path.exists(partial) or os.path.getsize(partial) == 0:
+            raise IOError(f"the engine didn't write '{text}'")
+        # Readers only ever see complete files
+        os.replace(partial, path)
+        self.renders += 1
+        return path
+
+    def render_next(self, engine):
+        """Render one missing phrase; returns True if more are left"""
+        self.configure_from(engine)
+        missing = self.missing()
+        if not missing:
+            return False
+        try:
+            self.render(engine, missing[0])
+        except Exception as e:
+            print(f"Could not render '{missing[0]}': {e}")
+            with self._lock:
+                self.phrases.discard(missing[0])
+        return len(missing) > 1
+
+    def forget(self, text):
+        """Delete a recording that failed to play, so it is rendered again
+
+        After a few failures (e.g. no audio player) the cache is bypassed.
+        """
+        self.failures += 1
+        try:
+            os.remove(self.path_for(text))
+        except OSError:
+            pass
@@ -0,0 +1,172 @@
+"""
+Speculative prefetch for Jarvis
+Slow lookups (weather, location, web info) start as soon as the transcript
+matches their intent, before the command reaches its handler. The handler
+then collects the result; if the final intent differs, the speculative
+result is thrown away. The recognizers only deliver a final transcript, so
+this only hides time while the handler stage is still busy with an earlier
+command (prefetch_benchmark.py measures a few milliseconds otherwise).
+
+With a cache (the conversation's session store) a result that an earlier
+turn already fetched for the same intent and slots is reused instead.
+"""
+
+import concurrent.futures         # for the fetch workers
+import threading                  # for the stats and results lock
+import time                       # for hidden-latency accounting
+
+MAX_WORKERS = 2
+STALE_SECONDS = 30.0              # unclaimed results older than this are thrown away
+
+
+def speculation_key(intent, slots):
+    """What a speculation must match to be used: the intent and its slots"""
+    return intent, tuple(sorted(slots.items()))
+
+
+class Speculation(object):
+    """One fetch started ahead of its handler"""
+
+    def __init__(self, intent, slots):
+        self.intent = intent
+        self.slots = slots
+        self.key = speculation_key(intent, slots)
+        self.future = None
+        self.started = time.perf_counter()
+        self.finished = None          # set by the worker when the fetch returns
+
+
+class Prefetcher(object):
+    """Starts registered fetches from early intent matches and hands them to handlers
+
+    speculate() is called with the transcript as soon as it is known,
+    settle() once process() has the final route, and fetch() by the handler instead of calling the
+    lookup itself. Speculation never changes what a handler answers, only
+    when the data is ready.
+    """
+
+    def __init__(self, router, max_workers=MAX_WORKERS, cache=None):
+        self.router = router
+        self.cache = cache            # has(), get() and put() by intent and slots
+        self.fetchers = {}
+        self.keepers = {}
+        self.ready = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix="prefetch")
+
+    def register(self, intent, fetch, allowed=None, keep=None):
+        """fetch(slots) returns the data the intent's handler needs; allowed() can veto speculating
+
+        keep(result) says whether a result may be reused by later turns
+        (default: anything but None).
+        """
+        self.fetchers[intent] = (fetch, allowed)
+        self.keepers[intent] = keep
+
+    def speculate(self, words):
+        """Start the fetch for the intent words match; returns the Speculation or None"""
+        route = self.router.match(words)
+        if route.intent not in self.fetchers:
+            return None
+        fetch, allowed = self.fetchers[route.intent]
+        if allowed and not allowed():
+            return None
+        if self.cache is not None and self.cache.has(route.intent, route.slots):
+            return None  # an earlier turn already has the answer
+        speculation = Speculation(route.intent, route.slots)
+        speculation.future = self._executor.submit(self._run, speculation, fetch)
+        with self._lock:
+            self._stats(route.intent)['started'] += 1
+        return speculation
+
+    def settle(self, speculation, intent, slots):
+        """The final route is known: keep the speculation for its handler or discard it"""
+        # Handlers can still be running on the skill pool, so only results nobody claimed for a while are stale
+        now = time.perf_counter()
+        with self._lock:
+            stale = [key for key, ready in self.ready.items() if now - ready.started > STALE_SECONDS]
+            stale = [self.ready.pop(key) for key in stale]
+        for ready in stale:
+            self._discard(ready)
+        if speculation is None:
+            return
+        if speculation.key == speculation_key(intent, slots):
+            with self._lock:
+                replaced = self.ready.get(speculation.key)
+                self.ready[speculation.key] = speculation
+            if replaced is not None and replaced is not speculation:
+                self._discard(replaced)
+        else:
+            self._discard(speculation)
+
+    def fetch(self, intent, slots):
+        """The data for a handler: a result kept from an earlier turn, the speculative result, or fetched now"""
+        with self._lock:
+            speculation = self.ready.pop(speculation_key(intent, slots), None)
+        if self.cache is not None:
+            cached = self.cache.get(intent, slots)
+            if cached is not None:
+                if speculation is not None:
+                    self._discard(speculation)
+                with self._lock:
+                    self._stats(intent)['cached'] += 1
+                return cached
+        result = self._fetch(intent, slots, speculation)
+        keep = self.keepers.get(intent)
+        if self.cache is not None and result is not None and (keep is None or keep(result)):
+            self.cache.put(intent, slots, result)
+        return result
+
+    def _fetch(self, intent, slots, speculation):
+        fetch, allowed = self.fetchers[intent]
+        if speculation is None:
+            return fetch(slots)
+        claimed = time.perf_counter()
+        try:
+            result = speculation.future.result()
+        except Exception as e:
+            print(f"Speculative {intent} lookup failed ({e}), fetching again")
+            self._discard(speculation)
+            return fetch(slots)
+        # Only the part of the fetch that ran before the handler asked for it is hidden
+        hidden = min(claimed, speculation.finished) - speculation.started
+        with self._lock:
+            stats = self._stats(intent)
+            stats['used'] += 1
+            stats['hidden'].append(hidden)
+            stats['fetch'].append(speculation.finished - speculation.started)
+        return result
+
+    def _run(self, speculation, fetch):
+        try:
+            return fetch(speculation.slots)
+        finally:
+            speculation.finished = time.perf_counter()
+
+    def _discard(self, speculation):
+        speculation.future.cancel()  # only stops it if no worker picked it up yet
+        with self._lock:
+            self._stats(speculation.intent)['discarded'] += 1
+
+    def _stats(self, intent):
+        return self.stats.setdefault(intent, {'started': 0, 'used': 0, 'discarded': 0, 'cached': 0,
+                                             'hidden': [], 'fetch': []})
+
+    def format_report(self):
+        """Per-intent speculation counts and the fetch latency they hid"""
+        lines = ["Speculative prefetch (ms):"]
+        with self._lock:
+            for intent, stats in sorted(self.stats.items()):
+                hidden, fetch = sorted(stats['hidden']), sorted(stats['fetch'])
+                line = f"  {intent}: {stats['started']} started, {stats['used']} used, {stats['discarded']} discarded"
+                if stats['cached']:
+                    line += f", {stats['cached']} from earlier turns"
+                if hidden:
+                    line += (f", hid {hidden[len(hidden) // 2] * 1000:.0f} of {fetch[len(fetch) // 2] * 1000:.0f}"
+                             f" median, {sum(hidden) * 1000:.0f} total")
+                lines.append(line)
+        if len(lines) == 1:
+            lines.append("  nothing speculated yet")
+        return "\n".join(lines)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Speculative prefetch benchmark for Jarvis
+Replays the recorded commands from command_log.txt through the asyncio
+runtime with simulated latencies, once with lookups starting in the handler
+and once with them speculated from the final transcript, and reports per
+intent how long the answer took and how much of the lookup was hidden.
+With the recorded pauses between commands the handler is rarely busy, so
+expect the two to be within a few milliseconds of each other.
+
+Usage:
+    python prefetch_benchmark.py [--log command_log.txt] [--scale 0.25]
+"""
+
+import argparse
+import time
+
+import prefetch
+import runtime
+from intent_router import IntentRouter
+from runtime_benchmark import (HANDLER_SECONDS, RECOGNIZER_PER_WORD, RECOGNIZER_SECONDS, RecordedMicrophone,
+                               load_recording, percentile, print_header)
+
+SLOW_INTENTS = ['weather', 'location', 'info']
+
+
+class SimulatedJarvis(object):
+    """The recognize and handle stages with simulated lookups behind a Prefetcher"""
+
+    def __init__(self, scale, speculate=False):
+        self.scale = scale
+        self.speculate = speculate
+        self.router = IntentRouter()
+        self.prefetcher = prefetch.Prefetcher(self.router)
+        for intent in SLOW_INTENTS:
+            self.prefetcher.register(intent, self.lookup(intent))
+        self.answers = {}
+        self.answer_times = {}
+
+    def lookup(self, intent):
+        def fetch(slots):
+            time.sleep(HANDLER_SECONDS[intent] * self.scale)
+            return f"{intent} {sorted(slots.items())}"
+        return fetch
+
+    def recognize(self, utterance):
+        time.sleep((RECOGNIZER_SECONDS + RECOGNIZER_PER_WORD * len(utterance.text.split())) * self.scale)
+        speculation = self.prefetcher.speculate(utterance.text) if self.speculate else None
+        return utterance, speculation
+
+    def handle(self, recognized):
+        utterance, speculation = recognized
+        route = self.router.route(utterance.text)
+        self.prefetcher.settle(speculation, route.intent, route.slots)
+        if route.intent in self.prefetcher.fetchers:
+            self.answers[utterance.index] = self.prefetcher.fetch(route.intent, route.slots)
+        else:
+            time.sleep(HANDLER_SECONDS.get(route.intent, 0.01) * self.scale)
+        self.answer_times[utterance.index] = (route.intent, time.time() - utterance.arrival)
+
+
+def run(transcripts, gaps, scale, speculate=False):
+    microphone = RecordedMicrophone(transcripts, gaps, scale).start()
+    jarvis = SimulatedJarvis(scale, speculate)
+    pipeline = runtime.Runtime(microphone.capture, jarvis.recognize, jarvis.handle)
+
+    def finished(turn):
+        if len(jarvis.answer_times) + microphone.dropped >= len(transcripts):
+            pipeline.stop()
+
+    pipeline.on_turn = finished
+    pipeline.run_forever()
+    return jarvis
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the lookup latency hidden by speculative prefetch")
+    parser.add_argument("--log", default="command_log.txt", help="recorded commands, one 'timestamp: text' per line")
+    parser.add_argument("--scale", type=float, default=0.25, help="speed factor for all pauses and latencies")
+    args = parser.parse_args()
+
+    print_header("Jarvis Speculative Prefetch Benchmark")
+
+    transcripts, gaps = load_recording(args.log)
+    if not transcripts:
+        print(f"❌ No recorded commands in {args.log}")
+        return 1
+    print(f"Replaying {len(transcripts)} recorded commands at {args.scale:g}x time\n")
+
+    baseline = run(transcripts, gaps, args.scale)
+    speculative = run(transcripts, gaps, args.scale, speculate=True)
+
+    # Report in unscaled milliseconds so the numbers read like the real assistant
+    def answer_ms(jarvis, intent):
+        return [seconds / args.scale * 1000 for name, seconds in jarvis.answer_times.values() if name == intent]
+
+    print(f"{'intent':<10}{'count':>6}{'before p50':>12}{'after p50':>11}{'hidden p50':>12}{'discarded':>11}")
+    before_all, after_all = [], []
+    for intent in SLOW_INTENTS:
+        before, after = answer_ms(baseline, intent), answer_ms(speculative, intent)
+        if not before:
+            continue
+        before_all += before
+        after_all += after
+        stats = speculative.prefetcher.stats.get(intent, {'hidden': [], 'discarded': 0})
+        hidden = [seconds / args.scale * 1000 for seconds in stats['hidden']]
+        print(f"{intent:<10}{len(before):>6}{percentile(before, 50):>12.0f}"
+              f"{percentile(after, 50):>11.0f}{percentile(hidden, 50):>12.0f}{stats['discarded']:>11}")
+    if not before_all:
+        print("\n❌ The recording has no weather, location or info commands")
+        return 1
+    same_answers = baseline.answers == speculative.answers
+    # Speculation must never cost more than timing noise
+    passed = same_answers and percentile(after_all, 50) <= percentile(before_all, 50) * 1.05
+    print(f"\nSlow answers p50 {percentile(before_all, 50):.0f} ms -> {percentile(after_all, 50):.0f} ms, "
+          f"p95 {percentile(before_all, 95):.0f} ms -> {percentile(after_all, 95):.0f} ms"
+          f"{'' if same_answers else ', answers changed'}")
+
+    if passed:
+        print("\n✅ Speculation never changed an answer or delayed one")
+    else:
+        print("\n❌ Speculation changed an answer or made slow answers later")
+    return 0 if passed else 1
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,242 @@
+"""
+Speech recognition backends for Jarvis
+Wraps the online and offline recognizers behind one interface, with
+per-backend timeouts, automatic fallback to the offline engine and an LRU
+cache of transcripts keyed by audio fingerprint.
+
+Select the backend at startup with the JARVIS_RECOGNIZER environment
+variable: google (default), offline or stub.
+"""
+
+import abc                        # for the backend interface
+import collections                # for the LRU cache
+import concurrent.futures         # for per-backend timeouts
+import hashlib                    # for audio fingerprints
+import os                         # for environment configuration
+import threading                  # for the cache lock
+import time                       # for timing
+
+import speech_recognition as sr   # voice recognition library
+
+
+def audio_fingerprint(audio):
+    """Stable fingerprint of an AudioData clip"""
+    digest = hashlib.sha1()
+    digest.update(f"{audio.sample_rate}:{audio.sample_width}:".encode())
+    digest.update(audio.frame_data)
+    return digest.hexdigest()
+
+
+class RecognizerBackend(abc.ABC):
+    """Base class for speech recognition backends"""
+
+    name = "base"
+    timeout = None  # seconds before the backend counts as too slow
+    needs_network = False
+
+    def __init__(self, timeout=None, language="en-US"):
+        if timeout is not None:
+            self.timeout = timeout
+        self.language = language
+
+    @abc.abstractmethod
+    def recognize(self, recognizer, audio):
+        """Return the transcript of audio, or raise sr.UnknownValueError / sr.RequestError"""
+
+
+class GoogleBackend(RecognizerBackend):
+    """Google Web Speech API (needs internet)"""
+
+    name = "google"
+    timeout = 4.0
+    needs_network = True
+
+    def recognize(self, recognizer, audio):
+        return recognizer.recognize_google(audio, language=self.language)
+
+
+class OfflineBackend(RecognizerBackend):
+    """CMU Sphinx running locally (needs the pocketsphinx package)"""
+
+    name = "offline"
+    timeout = 8.0
+
+    def recognize(self, recognizer, audio):
+        return recognizer.recognize_sphinx(audio, language=self.language)
+
+
+class StubBackend(RecognizerBackend):
+    """Deterministic backend for tests: returns transcripts registered per clip
+
+    delay (seconds) makes every call that slow and error is raised instead
+    of answering, to stand in for a hung or failing service.
+    """
+
+    name = "stub"
+
+    def __init__(self, transcripts=None, default=None, timeout=None, language="en-US", delay=0.0, error=None):
+        super().__init__(timeout, language)
+        self.transcripts = dict(transcripts or {})
+        self.default = default
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def add(self, audio, transcript):
+        """Register the transcript to return for a clip (AudioData or fingerprint)"""
+        key = audio if isinstance(audio, str) else audio_fingerprint(audio)
+        self.transcripts[key] = transcript
+
+    def recognize(self, recognizer, audio):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        transcript = self.transcripts.get(audio_fingerprint(audio), self.default)
+        if transcript is None:
+            raise sr.UnknownValueError()
+        return transcript
+
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    OfflineBackend.name: OfflineBackend,
+    StubBackend.name: StubBackend,
+}
+
+
+def create_backend(name, **kwargs):
+    """Create a backend by name"""
+    try:
+        return BACKENDS[name.lower()](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown recognizer backend '{name}', choose from: {', '.join(BACKENDS)}")
+
+
+class TranscriptCache(object):
+    """Small thread-safe LRU cache of transcripts"""
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, transcript):
+        with self._lock:
+            self.entries[key] = transcript
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+
+# Timed-out calls a backend may leave running before it is skipped; a worker
+# thread can't be stopped, so each one keeps a worker busy until it returns
+MAX_HUNG = 1
+
+
+class RecognitionService(object):
+    """Runs the selected backend with a timeout, falls back, and caches results
+
+    A backend that still has MAX_HUNG abandoned calls running is skipped
+    (and the fallback used) until one returns, so hung calls can never take
+    every worker of the pool.
+    """
+
+    def __init__(self, primary, fallback=None, cache_size=64, online=None):
+        self.primary = primary
+        self.online = online  # online() -> False skips online backends that would only time out
+        self.fallback = fallback
+        self.cache = TranscriptCache(cache_size)
+        self.fallback_count = 0
+        self.last_backend = None
+        self.last_latency = 0.0
+        self.hung = collections.Counter()  # abandoned calls still running, per backend name
+        self._lock = threading.Lock()
+        # Primary and fallback each get one worker for the current clip plus room for their hung calls
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=2 * (MAX_HUNG + 1),
+                                                               thread_name_prefix="recognizer")
+
+    def _run(self, backend, recognizer, audio):
+        """Run one backend, raising TimeoutError if it is too slow (or still stuck on an earlier clip)"""
+        with self._lock:
+            if self.hung[backend.name] >= MAX_HUNG:
+                raise TimeoutError(f"{backend.name} recognizer is still stuck on an earlier clip")
+        future = self._executor.submit(backend.recognize, recognizer, audio)
+        try:
+            return future.result(timeout=backend.timeout)
+        except concurrent.futures.TimeoutError:
+            if not future.cancel():
+                # Running: abandon it, but count it until it returns
+                with self._lock:
+                    self.hung[backend.name] += 1
+                future.add_done_callback(lambda done: self._returned(backend.name))
+            raise TimeoutError(f"{backend.name} recognizer took longer than {backend.timeout}s")
+
+    def _returned(self, name):
+        """An abandoned call finished at last"""
+        with self._lock:
+            self.hung[name] -= 1
+
+    def _run_fallback(self, recognizer, audio, error):
+        """Recognize with the fallback backend after the primary failed with error"""
+        if not self.fallback:
+            raise sr.RequestError(str(error)) if isinstance(error, TimeoutError) else error
+        self.fallback_count += 1
+        try:
+            transcript = self._run(self.fallback, recognizer, audio)
+        except TimeoutError as fallback_error:
+            raise sr.RequestError(str(fallback_error))
+        self.last_backend = self.fallback.name
+        return transcript
+
+    def recognize(self, recognizer, audio):
+        """Return the transcript for audio using the cache, primary and fallback backends"""
+        key = audio_fingerprint(audio)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.last_backend, self.last_latency = "cache", 0.0
+            return cached
+
+        started = time.time()
+        try:
+            if self.primary.needs_network and self.online is not None and not self.online():
+                # Known to be offline: don't wait for the online backend to time out
+                transcript = self._run_fallback(recognizer, audio, sr.RequestError("there is no internet connection"))
+            else:
+                try:
+                    transcript = self._run(self.primary, recognizer, audio)
+                    self.last_backend = self.primary.name
+                except (sr.RequestError, TimeoutError) as e:
+                    if self.fallback:
+                        print(f"\n[{self.primary.name} recognizer unavailable ({e}), using {self.fallback.name}]")
+                    transcript = self._run_fallback(recognizer, audio, e)
+        finally:
+            self.last_latency = time.time() - started
+
+        self.cache.put(key, transcript)
+        return transcript
+
+
+def create_service(name=None, online=None):
+    """Build the recognition service selected by name or JARVIS_RECOGNIZER
+
+    online() is consulted before every recognition; while it returns False
+    the offline engine is used straight away.
+    """
+    name = (name or os.environ.get("JARVIS_RECOGNIZER", GoogleBackend.name)).lower()
+    primary = create_backend(name)
+    # Online backends fall back to the local engine; local ones have nothing to fall back to
+    fallback = OfflineBackend() if name == GoogleBackend.name else None
+    return RecognitionService(primary, fallback, online=online)
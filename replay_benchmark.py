@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+End-to-end replay benchmark for Jarvis
+Replays a corpus of commands (command_log.txt, command_log.jsonl, a plain
+text file or a directory of WAV recordings) through the real capture,
+recognition, intent routing and handler code of main.py, headless: web
+lookups get canned answers, pywhatkit and the browser do nothing, speech
+goes to a null sink and the Arduino link is a stand-in. Reports p50, p95
+and p99 per stage and per intent, and can save them as JSON and compare
+against an earlier run for regression tracking.
+
+Usage:
+    python replay_benchmark.py [--corpus command_log.txt] [--wav recordings/]
+                               [--http-ms 0] [--save results.json] [--baseline results.json]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+
+# Stages reported per turn, in pipeline order (milliseconds)
+STAGES = ["capture", "recognize", "route", "handle", "speech", "turn"]
+
+# Canned web answers by URL fragment (the first one that matches)
+CANNED_RESPONSES = {
+    "format=j1": json.dumps({"weather": [{"date": str(datetime.date.today() + datetime.timedelta(days=days)),
+                                          "mintempC": "12", "maxtempC": "18", "hourly": [
+        {"weatherDesc": [{"value": "Sunny"}]}] * 8} for days in range(3)]}),
+    "wttr.in": "San Francisco: ☀️ +18°C",
+    "ipinfo.io": json.dumps({"city": "San Francisco", "region": "California", "country": "US",
+                             "loc": "37.7749,-122.4194", "timezone": "America/Los_Angeles"}),
+}
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+class CannedSession(object):
+    """Stands in for the requests session: canned answers after a fixed latency"""
+
+    class Response(object):
+        def __init__(self, status_code, text):
+            self.status_code = status_code
+            self.text = text
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append(url)
+        time.sleep(self.latency)
+        for fragment, text in CANNED_RESPONSES.items():
+            if fragment in url:
+                return CannedSession.Response(200, text)
+        return CannedSession.Response(404, "")
+
+    def close(self):
+        pass
+
+
+class NullBody(object):
+    """Stands in for the Arduino link and remembers the expressions"""
+
+    alive = True
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, code):
+        self.sent.append(code)
+
+    def start(self):
+        return self
+
+    def close(self):
+        pass
+
+
+class RecordCollector(object):
+    """Stands in for the command log and keeps the records in memory"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def close(self, timeout=5):
+        pass
+
+
+def quiet_side_effects():
+    """pywhatkit and the browser do nothing; returns the calls they got"""
+    calls = []
+    pywhatkit = types.ModuleType("pywhatkit")
+    pywhatkit.playonyt = lambda query: calls.append(("playonyt", query))
+    pywhatkit.search = lambda query: calls.append(("search", query))
+    pywhatkit.info = lambda query, **kwargs: calls.append(("info", query)) or f"{query} is a topic."
+    sys.modules["pywhatkit"] = pywhatkit
+    import webbrowser
+    webbrowser.open = lambda url: calls.append(("open", url))
+    return calls
+
+
+def timed(fn, samples):
+    """Wrap fn so every call appends its duration (seconds) to samples"""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+    return wrapper
+
+
+def replay(source, http_latency=0.0, timeout_per_command=30.0):
+    """Run every utterance of source through main.py; returns a list of per-turn results"""
+    import main
+    import http_client
+    import knowledge_cache
+    import location_service
+    import runtime
+    import speech_queue
+
+    # Headless stand-ins for everything that leaves the process
+    calls = quiet_side_effects()
+    session = CannedSession(http_latency)
+    http_client.get_client()._session = session
+    http_client.get_client().clear()
+    directory = tempfile.mkdtemp(prefix="jarvis_replay_")
+    main.locations = location_service.LocationService(location_file=os.path.join(directory, "location.json"))
+    main.knowledge = knowledge_cache.KnowledgeCache(path=os.path.join(directory, "knowledge.sqlite3"))
+    main.body = NullBody()
+    main.commands = RecordCollector()
+    main.microphone = source
+    main.recognition = None
+    main.listen.message_displayed = True
+
+    spoken = []
+
+    def null_speak(sentence, handle):
+        spoken.append(sentence)
+        return True
+
+    main.speech = speech_queue.SpeechQueue(null_speak)
+    main.speech.start()
+
+    route_times, capture_times = [], []
+    main.router.route = timed(main.router.route, route_times)
+    turn_done = threading.Event()
+    turn_done.set()
+    results = []
+    marks = {}  # how many routes and records there were when the current turn started
+
+    def capture():
+        # One command at a time, like a user waiting for each answer
+        turn_done.wait()
+        if source.finished:
+            time.sleep(0.05)
+            return None
+        turn_done.clear()
+        marks.update(routes=len(route_times), records=len(main.commands.records))
+        started = time.perf_counter()
+        utterance = main.capture_utterance()
+        capture_times.append(time.perf_counter() - started)
+        if utterance is None:
+            turn_done.set()
+        return utterance
+
+    def recognize(utterance):
+        recognized = main.recognize_utterance(utterance)
+        if recognized is None:
+            results.append({'transcript': None, 'intent': 'unrecognized'})
+            turn_done.set()
+        return recognized
+
+    def finished(turn):
+        # The command is logged once its handler (maybe on the skill pool) is done and its answer spoken
+        main.registry.wait_idle(timeout=timeout_per_command)
+        main.speech.wait_idle(timeout=timeout_per_command)
+        times = turn.times
+        result = {'transcript': turn.result[0], 'intent': 'ignored',  # no wake word
+                  'capture': capture_times[-1] * 1000,
+                  'recognize': (times['recognized'] - times['recognizing']) * 1000,
+                  'handle': (times['handled'] - times['handling']) * 1000}
+        if len(route_times) > marks['routes'] and len(main.commands.records) > marks['records']:
+            record = main.commands.records[-1]
+            result['intent'] = record['intent']
+            result['route'] = route_times[-1] * 1000
+            result['speech'] = record.get('tts_ms', 0.0)
+            result['turn'] = (time.time() - times['captured']) * 1000
+        results.append(result)
+        if source.finished:
+            jarvis.stop()
+        turn_done.set()
+
+    jarvis = runtime.Runtime(capture, recognize, main.handle_command, on_turn=finished)
+    deadline = threading.Timer(timeout_per_command * max(1, source.total), jarvis.stop)
+    deadline.daemon = True
+    deadline.start()
+    try:
+        jarvis.run_forever()
+    finally:
+        deadline.cancel()
+        main.speech.stop()
+    return results, {'spoken': spoken, 'side_effects': calls, 'http_requests': session.requests}
+
+
+def summarize(results):
+    """{'stages': {stage: stats}, 'intents': {intent: {stage: stats}}} in milliseconds"""
+    def stats(values):
+        return {'count': len(values), 'p50': round(percentile(values, 50), 2),
+                'p95': round(percentile(values, 95), 2), 'p99': round(percentile(values, 99), 2)}
+
+    summary = {'commands': len(results), 'stages': {}, 'intents': {}}
+    for stage in STAGES:
+        values = [result[stage] for result in results if stage in result]
+        if values:
+            summary['stages'][stage] = stats(values)
+    for intent in sorted(set(result['intent'] for result in results)):
+        matching = [result for result in results if result['intent'] == intent]
+        summary['intents'][intent] = dict(
+            (stage, stats([result[stage] for result in matching if stage in result]))
+            for stage in STAGES if any(stage in result for result in matching))
+    return summary
+
+
+def compare(summary, baseline, tolerance, slack_ms):
+    """Stages whose p95 got worse than the baseline allows"""
+    regressions = []
+    for stage, stats in summary['stages'].items():
+        before = baseline.get('stages', {}).get(stage)
+        if before and stats['p95'] > before['p95'] * (1 + tolerance) + slack_ms:
+            regressions.append(f"{stage} p95 {before['p95']:.1f} ms -> {stats['p95']:.1f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded commands through Jarvis without hardware")
+    parser.add_argument("--corpus", default="command_log.txt",
+                        help="commands to replay (command_log.txt, command_log.jsonl or one per line)")
+    parser.add_argument("--wav", help="replay WAV recordings from this file or directory instead")
+    parser.add_argument("--http-ms", type=float, default=0.0, help="latency of the canned web answers")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown per stage (0.25 = 25%%)")
+    parser.add_argument("--slack-ms", type=float, default=2.0, help="allowed p95 slowdown per stage on top of that")
+    parser.add_argument("--verbose", action="store_true", help="show what Jarvis prints while replaying")
+    args = parser.parse_args()
+
+    print_header("Jarvis Replay Benchmark")
+
+    import input_sources
+    if args.wav:
+        source = input_sources.WavSource.from_path(args.wav)
+    else:
+        source = input_sources.TranscriptSource(input_sources.load_transcripts(args.corpus))
+    if not source.total:
+        print(f"❌ Nothing to replay in {args.wav or args.corpus}")
+        return 1
+    print(f"Replaying {source.total} commands from {args.wav or args.corpus}\n")
+
+    started = time.time()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else output):
+        results, effects = replay(source, http_latency=args.http_ms / 1000.0)
+    elapsed = time.time() - started
+    summary = summarize(results)
+
+    print(f"{'stage':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for stage, stats in summary['stages'].items():
+        print(f"{stage:<12}{stats['count']:>7}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}")
+    print(f"\n{'intent':<12}{'count':>7}{'turn p50':>10}{'turn p95':>10}{'turn p99':>10}{'handle p95':>12}")
+    for intent, stages in summary['intents'].items():
+        turn, handle = stages.get('turn'), stages.get('handle')
+        if turn:
+            print(f"{intent:<12}{turn['count']:>7}{turn['p50']:>10.1f}{turn['p95']:>10.1f}{turn['p99']:>10.1f}"
+                  f"{handle['p95']:>12.1f}")
+        else:
+            print(f"{intent:<12}{len([r for r in results if r['intent'] == intent]):>7}{'-':>10}{'-':>10}{'-':>10}")
+    print(f"\n{len(effects['spoken'])} sentences spoken, {len(effects['http_requests'])} web requests, "
+          f"{len(effects['side_effects'])} pywhatkit/browser calls, {elapsed:.1f} s")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    passed = len(results) == source.total
+    if not passed:
+        print(f"\n❌ Only {len(results)} of {source.total} commands came through")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(summary, json.load(f), args.tolerance, args.slack_ms)
+        for regression in regressions:
+            print(f"❌ Slower than the baseline: {regression}")
+        passed = passed and not regressions
+    if passed:
+        print("\n✅ All commands replayed" + (", no regressions against the baseline" if args.baseline else ""))
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
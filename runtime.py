@@ -0,0 +1,203 @@
+"""
+Event-driven runtime for Jarvis
+Runs audio capture, recognition and command handling as asyncio tasks
+connected by queues. The blocking work (microphone, recognizer, handlers)
+runs on threads, so Jarvis keeps listening for the next command while it
+is still recognizing or answering the last one. Every stage is timed.
+"""
+
+import asyncio                    # for the event loop, tasks and queues
+import collections                # for the latency history
+import math                       # for percentiles
+import threading                  # for blocking work
+import time                       # for stage timing
+
+# Stages timed for every turn, in pipeline order
+STAGES = [
+    "recognize_wait",   # captured audio waiting for the recognizer
+    "recognize",        # speech to text
+    "dispatch_wait",    # transcript waiting for the previous command to finish
+    "handle",           # routing and running the handler
+    "turn",             # end of capture to handler done
+]
+
+
+class Turn(object):
+    """One utterance on its way through the pipeline"""
+
+    def __init__(self, utterance):
+        self.utterance = utterance
+        self.result = None
+        self.times = {'captured': time.time()}
+
+
+def run_blocking(fn, *args, name=None):
+    """Run fn(*args) on a daemon thread and return a future for its result
+
+    Daemon threads (unlike an executor's) never hold up shutdown while
+    they are stuck waiting on the microphone.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def work():
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            callback = (resolve, future.set_exception, e)
+        else:
+            callback = (resolve, future.set_result, result)
+        try:
+            loop.call_soon_threadsafe(*callback)
+        except RuntimeError:
+            pass  # the loop has already shut down
+
+    threading.Thread(target=work, name=name, daemon=True).start()
+    return future
+
+
+class StageTimer(object):
+    """Keeps recent latencies per stage"""
+
+    def __init__(self, history=500):
+        self.samples = dict((stage, collections.deque(maxlen=history)) for stage in STAGES)
+
+    def record(self, stage, seconds):
+        self.samples.setdefault(stage, collections.deque(maxlen=500)).append(seconds)
+
+    def percentile(self, stage, p):
+        ordered = sorted(self.samples.get(stage, ()))
+        if not ordered:
+            return None
+        return ordered[max(1, int(math.ceil(p / 100.0 * len(ordered)))) - 1]
+
+    def format(self):
+        """Per-stage latency table in milliseconds"""
+        lines = ["Stage latency (ms):", f"  {'stage':<16}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for stage, samples in self.samples.items():
+            if not samples:
+                continue
+            p50, p95 = self.percentile(stage, 50), self.percentile(stage, 95)
+            lines.append(f"  {stage:<16}{len(samples):>7}{p50 * 1000:>9.0f}{p95 * 1000:>9.0f}{max(samples) * 1000:>9.0f}")
+        return "\n".join(lines)
+
+
+class Runtime(object):
+    """Connects the capture, recognize and handle stages with queues
+
+    capture() blocks until the user said something and returns an
+    utterance (or None to try again). recognize(utterance) returns a
+    result (or None to drop it) and handle(result) acts on it. Commands
+    are handled one at a time, in the order they were heard.
+    """
+
+    def __init__(self, capture, recognize, handle, queue_size=4, on_turn=None):
+        self.capture = capture
+        self.recognize = recognize
+        self.handle = handle
+        self.queue_size = queue_size
+        self.on_turn = on_turn
+        self.timer = StageTimer()
+        self.turns = 0
+        self.errors = 0
+        self._periodic = []
+        self._loop = None
+        self._stopping = None
+
+    def every(self, seconds, fn):
+        """Run fn() on a thread every `seconds` while the runtime is up"""
+        self._periodic.append((seconds, fn))
+
+    def run_forever(self):
+        """Run until stop() is called or Ctrl+C"""
+        asyncio.run(self.run())
+
+    def stop(self):
+        """Ask the runtime to finish (safe to call from any thread)"""
+        if self._loop and self._stopping:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        heard = asyncio.Queue(self.queue_size)
+        recognized = asyncio.Queue(self.queue_size)
+        tasks = [
+            asyncio.create_task(self._capture_stage(heard)),
+            asyncio.create_task(self._recognize_stage(heard, recognized)),
+            asyncio.create_task(self._handle_stage(recognized)),
+        ]
+        tasks += [asyncio.create_task(self._every(seconds, fn)) for seconds, fn in self._periodic]
+        try:
+            await self._stopping.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _capture_stage(self, heard):
+        while True:
+            try:
+                utterance = await run_blocking(self.capture, name="capture")
+            except Exception as e:
+                self._report("capture", e)
+                await asyncio.sleep(0.1)  # don't spin if the microphone keeps failing
+                continue
+            if utterance is None:
+                continue
+            # Waits here (with the audio kept in the mic buffer) if recognition falls behind
+            await heard.put(Turn(utterance))
+
+    async def _recognize_stage(self, heard, recognized):
+        while True:
+            turn = await heard.get()
+            turn.times['recognizing'] = time.time()
+            try:
+                turn.result = await run_blocking(self.recognize, turn.utterance, name="recognize")
+            except Exception as e:
+                self._report("recognize", e)
+                continue
+            turn.times['recognized'] = time.time()
+            if turn.result is not None:
+                await recognized.put(turn)
+
+    async def _handle_stage(self, recognized):
+        while True:
+            turn = await recognized.get()
+            turn.times['handling'] = time.time()
+            try:
+                await run_blocking(self.handle, turn.result, name="handle")
+            except Exception as e:
+                self._report("handle", e)
+            turn.times['handled'] = time.time()
+            self._finish(turn)
+
+    async def _every(self, seconds, fn):
+        while True:
+            await asyncio.sleep(seconds)
+            try:
+                await run_blocking(fn, name="periodic")
+            except Exception as e:
+                self._report(getattr(fn, '__name__', 'periodic'), e)
+
+    def _finish(self, turn):
+        times = turn.times
+        self.turns += 1
+        self.timer.record("recognize_wait", times['recognizing'] - times['captured'])
+        self.timer.record("recognize", times['recognized'] - times['recognizing'])
+        self.timer.record("dispatch_wait", times['handling'] - times['recognized'])
+        self.timer.record("handle", times['handled'] - times['handling'])
+        self.timer.record("turn", times['handled'] - times['captured'])
+        if self.on_turn:
+            self.on_turn(turn)
+
+    def _report(self, stage, error):
+        self.errors += 1
+        print(f"\nError in {stage} stage: {error}")
+
+    def format_stats(self):
+        return self.timer.format()
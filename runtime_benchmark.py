@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Turn time benchmark for the Jarvis main loop
+Replays the recorded commands from command_log.txt through the old
+sequential loop (listen, process, pause, repeat) and through the asyncio
+runtime, with simulated recognizer and handler latencies, and reports the
+time from the end of each command to the end of its handler, and how long
+the microphone stayed closed after each answer (the old loop's 0.5 s and
+0.1 s sleeps).
+
+Usage:
+    python runtime_benchmark.py [--log command_log.txt] [--scale 0.25]
+"""
+
+import argparse
+import collections
+import threading
+import time
+from datetime import datetime
+
+import runtime
+from intent_router import IntentRouter
+
+# Simulated handler latency per intent (seconds), roughly what they take on a laptop
+HANDLER_SECONDS = {
+    'weather': 0.8,     # location and forecast over HTTP
+    'location': 0.4,
+    'info': 1.0,        # Wikipedia
+    'search': 0.5,      # opens the browser
+    'play': 0.7,        # YouTube lookup
+    'open': 0.3,
+    'network': 0.3,     # subprocess
+    'battery': 0.2,
+    'disk': 0.1,
+}
+RECOGNIZER_SECONDS = 0.3        # fixed cost of a recognizer call
+RECOGNIZER_PER_WORD = 0.03
+POST_PROCESS_PAUSE = 0.5        # time.sleep(0.5) after process() in the old listen()
+LOOP_PAUSE = 0.1                # time.sleep(0.1) in the old while True loop
+
+Utterance = collections.namedtuple('Utterance', ['index', 'text', 'arrival'])
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def load_recording(path, min_gap=0.3, max_gap=1.5):
+    """Transcripts and the pauses between them from a command_log.txt style file
+
+    Real pauses are minutes long, so they are clamped to a few seconds.
+    """
+    transcripts, gaps, previous = [], [], None
+    with open(path) as f:
+        for line in f:
+            stamp, sep, text = line.strip().partition(": ")
+            if not sep or not text:
+                continue
+            when = datetime.fromisoformat(stamp)
+            gap = (when - previous).total_seconds() if previous else 0.0
+            gaps.append(min(max(gap, min_gap), max_gap) if previous else 0.0)
+            transcripts.append(text)
+            previous = when
+    return transcripts, gaps
+
+
+class RecordedMicrophone(object):
+    """Plays back the recorded commands at their (scaled) times
+
+    capture() blocks like the real microphone until the next command has
+    been said. discard_pending() drops commands said in the meantime, like
+    the old listen() did after answering.
+    """
+
+    def __init__(self, transcripts, gaps, scale):
+        self.transcripts = transcripts
+        self.gaps = [gap * scale for gap in gaps]
+        self.arrivals = []
+        self.listening = []       # (started, returned) of every capture() call
+        self.next = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        at = time.time()
+        self.arrivals = []
+        for gap in self.gaps:
+            at += gap
+            self.arrivals.append(at)
+        return self
+
+    @property
+    def finished(self):
+        return self.next >= len(self.transcripts)
+
+    def capture(self):
+        started = time.time()
+        try:
+            return self._capture()
+        finally:
+            self.listening.append((started, time.time()))
+
+    def _capture(self):
+        with self._lock:
+            if self.finished:
+                time.sleep(0.05)  # like a listen() that timed out
+                return None
+            index = self.next
+            self.next += 1
+        wait = self.arrivals[index] - time.time()
+        if wait > 0:
+            time.sleep(wait)
+        return Utterance(index, self.transcripts[index], self.arrivals[index])
+
+    def closed_after(self, moment):
+        """How long after moment the microphone started listening again (0 if it already was)"""
+        later = [started for started, returned in self.listening if returned > moment]
+        if not later:
+            return None
+        return max(0.0, min(later) - moment)
+
+    def discard_pending(self):
+        with self._lock:
+            now = time.time()
+            while not self.finished and self.arrivals[self.next] <= now:
+                self.next += 1
+                self.dropped += 1
+
+
+class SimulatedJarvis(object):
+    """The recognize and handle stages with simulated latencies and the real router"""
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.router = IntentRouter()
+        self.turn_times = {}
+        self.handled_at = []
+
+    def recognize(self, utterance):
+        time.sleep((RECOGNIZER_SECONDS + RECOGNIZER_PER_WORD * len(utterance.text.split())) * self.scale)
+        return utterance
+
+    def handle(self, utterance):
+        route = self.router.route(utterance.text)
+        time.sleep(HANDLER_SECONDS.get(route.intent, 0.01) * self.scale)
+        self.turn_times[utterance.index] = time.time() - utterance.arrival
+        self.handled_at.append(time.time())
+
+
+def run_legacy(transcripts, gaps, scale):
+    """The old loop: one turn at a time with fixed pauses"""
+    microphone = RecordedMicrophone(transcripts, gaps, scale).start()
+    jarvis = SimulatedJarvis(scale)
+    while not microphone.finished:
+        utterance = microphone.capture()
+        jarvis.handle(jarvis.recognize(utterance))
+        time.sleep(POST_PROCESS_PAUSE * scale)
+        microphone.discard_pending()
+        time.sleep(LOOP_PAUSE * scale)
+    return jarvis, microphone, None
+
+
+def run_pipelined(transcripts, gaps, scale):
+    """The asyncio runtime: capture, recognition and handling overlap"""
+    microphone = RecordedMicrophone(transcripts, gaps, scale).start()
+    jarvis = SimulatedJarvis(scale)
+    pipeline = runtime.Runtime(microphone.capture, jarvis.recognize, jarvis.handle)
+
+    def finished(turn):
+        if len(jarvis.turn_times) + microphone.dropped >= len(transcripts):
+            pipeline.stop()
+
+    pipeline.on_turn = finished
+    pipeline.run_forever()
+    return jarvis, microphone, pipeline
+
+
+def closed_times(jarvis, microphone):
+    """How long the microphone stayed closed after each answer, up to the next capture"""
+    times = [microphone.closed_after(moment) for moment in jarvis.handled_at]
+    return [t for t in times if t is not None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare turn times of the old loop and the asyncio runtime")
+    parser.add_argument("--log", default="command_log.txt", help="recorded commands, one 'timestamp: text' per line")
+    parser.add_argument("--scale", type=float, default=0.25, help="speed factor for all pauses and latencies")
+    args = parser.parse_args()
+
+    print_header("Jarvis Main Loop Benchmark")
+
+    transcripts, gaps = load_recording(args.log)
+    if not transcripts:
+        print(f"❌ No recorded commands in {args.log}")
+        return 1
+    print(f"Replaying {len(transcripts)} recorded commands at {args.scale:g}x time\n")
+
+    results = []
+    for name, run in (("loop", run_legacy), ("asyncio", run_pipelined)):
+        started = time.time()
+        jarvis, microphone, pipeline = run(transcripts, gaps, args.scale)
+        results.append((name, jarvis.turn_times, microphone.dropped, closed_times(jarvis, microphone),
+                        time.time() - started, pipeline))
+
+    # Report in unscaled seconds so the numbers read like the real assistant
+    print(f"{'loop':<10}{'handled':>9}{'dropped':>9}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}"
+          f"{'closed ms':>11}{'wall s':>9}")
+    for name, turn_times, dropped, closed, elapsed, _ in results:
+        times = [t / args.scale * 1000 for t in turn_times.values()]
+        closed_ms = percentile(closed, 50) / args.scale * 1000
+        print(f"{name:<10}{len(times):>9}{dropped:>9}{percentile(times, 50):>9.0f}"
+              f"{percentile(times, 95):>9.0f}{max(times or [0]):>9.0f}{closed_ms:>11.0f}{elapsed / args.scale:>9.1f}")
+    print("\nclosed ms: median time from the end of an answer until the microphone listened again")
+
+    pipeline = results[1][5]
+    print("\nasyncio runtime, " + pipeline.format_stats().replace("(ms)", f"(ms at {args.scale:g}x time)"))
+
+    legacy_p50 = percentile(list(results[0][1].values()), 50)
+    pipelined_p50 = percentile(list(results[1][1].values()), 50)
+    legacy_closed = percentile(results[0][3], 50)
+    pipelined_closed = percentile(results[1][3], 50)
+    # Both loops spend the same time per turn, so the median turn time doesn't improve. What the
+    # runtime removes are the pauses after each answer, in which the old loop dropped commands.
+    passed = (results[1][2] == 0 and len(results[1][1]) == len(transcripts) and pipelined_p50 <= legacy_p50 * 1.05
+              and pipelined_closed < (POST_PROCESS_PAUSE + LOOP_PAUSE) * args.scale / 10)
+    if passed:
+        print(f"\n✅ Microphone closed after an answer {legacy_closed / args.scale * 1000:.0f} ms -> "
+              f"{pipelined_closed / args.scale * 1000:.0f} ms, no commands dropped "
+              f"(median turn time {legacy_p50 / args.scale * 1000:.0f} ms -> {pipelined_p50 / args.scale * 1000:.0f} ms)")
+    else:
+        print("\n❌ The asyncio runtime dropped commands, kept pausing or was slower than the old loop")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Serial throughput benchmark for Jarvis
+Pushes a burst of expression commands through SerialLink to a fake
+Arduino on a loopback pseudo-terminal, once with legacy single bytes and
+once with the framed protocol, and reports commands per second, bytes on
+the wire and round-trip times. Also times the frame encoder and decoder.
+
+Usage:
+    python serial_benchmark.py [--commands 2000] [--legacy-baud 9600] [--framed-baud 115200]
+"""
+
+import argparse
+import time
+
+import expression_protocol
+from fake_arduino import FakeArduino
+from serial_link import FRAMED, LEGACY, SerialLink
+
+# Alternating animations, so nothing is coalesced
+CODES = [b'p', b'h', b'a', b's', b'U']
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def run_link(mode, commands, baud):
+    """Send commands through a fresh link and board; returns the measurements"""
+    board = FakeArduino(framed=(mode == FRAMED))
+    board.plug_in()
+    link = SerialLink(find_ports=lambda: [board.path], baudrates=[baud], protocol=mode, ready_timeout=0.05,
+                      max_pending=commands, max_age=3600, ack_timeout=30)
+    link.start()
+    while not link.ready:
+        time.sleep(0.01)
+
+    started = time.time()
+    for i in range(commands):
+        link.send(CODES[i % len(CODES)])
+    link.wait_idle(timeout=120)
+    while len(board.received) < commands and time.time() - started < 120:
+        time.sleep(0.01)
+    elapsed = time.time() - started
+
+    rtts = [rtt for times in link.rtt.values() for rtt in times]
+    result = {
+        'delivered': len(board.received),
+        'elapsed': elapsed,
+        'frames': link.frames_sent,
+        'bytes_sent': link.bytes_sent,
+        'bytes_received': link.bytes_received,
+        'rtt_p50': percentile(rtts, 50) * 1000,
+        'rtt_p95': percentile(rtts, 95) * 1000,
+    }
+    link.stop()
+    board.unplug()
+    return result
+
+
+def codec_speed(frames=20000):
+    """Frames per second through encode_commands() and Decoder.feed()"""
+    batch = [(code, 300) for code in CODES]
+    started = time.time()
+    data = b"".join(expression_protocol.encode_commands(i % 255 + 1, batch) for i in range(frames))
+    encoded = time.time()
+    decoded = expression_protocol.Decoder(legacy='bytes').feed(data)
+    finished = time.time()
+    assert len(decoded) == frames
+    return frames / (encoded - started), frames / (finished - encoded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare legacy and framed serial throughput over a pty")
+    parser.add_argument("--commands", type=int, default=2000, help="commands to send in each mode")
+    parser.add_argument("--legacy-baud", type=int, default=9600, help="baud rate of the legacy sketches")
+    parser.add_argument("--framed-baud", type=int, default=115200, help="baud rate of the framed sketches")
+    args = parser.parse_args()
+
+    print_header("Jarvis Serial Throughput Benchmark")
+
+    results = [(mode, baud, run_link(mode, args.commands, baud))
+               for mode, baud in ((LEGACY, args.legacy_baud), (FRAMED, args.framed_baud))]
+
+    passed = True
+    print(f"\n{'mode':<8}{'cmd/s':>10}{'frames':>8}{'B/cmd out':>11}{'B/cmd in':>10}"
+          f"{'wire ms/cmd':>13}{'rtt p50':>9}{'rtt p95':>9}")
+    for mode, baud, result in results:
+        per_command_out = result['bytes_sent'] / float(args.commands)
+        per_command_in = result['bytes_received'] / float(args.commands)
+        # 10 bits per byte on the wire (start + 8 data + stop); full duplex, so the busier direction sets the pace
+        wire_ms = max(per_command_out, per_command_in) * 10 * 1000.0 / baud
+        print(f"{mode:<8}{args.commands / result['elapsed']:>10.0f}{result['frames']:>8}"
+              f"{per_command_out:>11.2f}{per_command_in:>10.2f}{wire_ms:>13.3f}"
+              f"{result['rtt_p50']:>9.2f}{result['rtt_p95']:>9.2f}")
+        if result['delivered'] != args.commands:
+            passed = False
+            print(f"❌ {mode}: only {result['delivered']} of {args.commands} commands arrived")
+
+    encode_rate, decode_rate = codec_speed()
+    print(f"\nCodec: {encode_rate:,.0f} frames/s encoded, {decode_rate:,.0f} frames/s decoded "
+          f"({len(CODES)} commands per frame)")
+    print("wire ms/cmd is the time the bytes need at the given baud rate on a real board")
+
+    if passed:
+        print("\n✅ Every command arrived in both modes")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
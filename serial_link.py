@@ -0,0 +1,401 @@
+"""
+Serial link manager for Jarvis
+One background thread owns the Arduino: it writes queued expression
+commands, drops redundant ones, reads what the sketch sends back to
+measure round-trip times, and reconnects with backoff when the board is
+unplugged. Callers never block on the serial port.
+
+Sketches that speak the framed protocol (see expression_protocol.py) get
+batched frames with acks; older sketches get the legacy single bytes.
+"""
+
+import collections                # for the write queue and RTT history
+import glob                       # for finding the Arduino
+import os                         # for the JARVIS_BAUD setting
+import threading                  # for the link thread
+import time                       # for backoff and round-trip timing
+
+import expression_protocol        # framed protocol encoder/decoder
+
+# Baud rates to try, fastest first; the sketches use the first one, older
+# sketches the last. Set JARVIS_BAUD to use just one.
+BAUD_RATES = (115200, 9600)
+if os.environ.get('JARVIS_BAUD'):
+    BAUD_RATES = (int(os.environ['JARVIS_BAUD']),)
+
+FALLBACK_PORT = "/dev/tty.usbmodem14101"  # update this path as needed
+
+# Commands that set a state (rather than play an animation); sending the
+# same one twice in a row has no visible effect
+STATE_COMMANDS = (b'u', b'l')
+
+READY_PREFIX = "JAUNDICE Robot Ready"
+FRAMED_BANNER = "proto=2"
+ERROR_PREFIX = "Unknown command"
+
+LEGACY = 'legacy'
+FRAMED = 'framed'
+
+Reply = collections.namedtuple('Reply', ['command', 'text', 'rtt'])
+
+
+def find_ports():
+    """Candidate Arduino serial ports on macOS, best first"""
+    ports = glob.glob('/dev/tty.usbserial*') + glob.glob('/dev/tty.usbmodem*') + \
+        glob.glob('/dev/cu.usbserial*') + glob.glob('/dev/cu.usbmodem*')
+    return ports or [FALLBACK_PORT]
+
+
+def open_serial(path, baudrate):
+    """Open a serial port with short timeouts so the link thread stays responsive"""
+    import serial                     # for serial communication
+    return serial.Serial(path, baudrate, timeout=0.05, write_timeout=1)
+
+
+class SerialLink(object):
+    """Owns the Arduino connection on a background thread
+
+    protocol is 'auto' (probe the sketch), 'legacy' or 'framed'.
+    """
+
+    def __init__(self, find_ports=find_ports, baudrates=BAUD_RATES, open_port=open_serial,
+                 protocol='auto', max_pending=32, max_age=3.0, ack_timeout=5.0,
+                 ready_timeout=2.5, probe_timeout=0.5, backoff_base=0.5, backoff_max=30.0):
+        self.find_ports = find_ports
+        self.baudrates = tuple(baudrates)
+        self.open_port = open_port
+        self.protocol = protocol
+        self.max_pending = max_pending
+        self.max_age = max_age            # expressions older than this are stale and skipped
+        self.ack_timeout = ack_timeout
+        self.ready_timeout = ready_timeout
+        self.probe_timeout = probe_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.connection = None
+        self.port_name = None
+        self.baudrate = None
+        self.mode = None                  # LEGACY or FRAMED once the sketch is known
+        self.sent = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.acked = 0
+        self.unacked = 0
+        self.resent = 0
+        self.errors = 0
+        self.reconnects = 0
+        self.observer = None              # observer(seconds) after every write to the port
+        self.replies = collections.deque(maxlen=100)
+        self.rtt = collections.defaultdict(lambda: collections.deque(maxlen=100))
+
+        self._pending = collections.deque()
+        self._in_flight = collections.deque()
+        self._last_sent = None
+        self._writing = False
+        self._seq = expression_protocol.PROBE_SEQ
+        self._baud_index = 0
+        self._failures = 0
+        self._ever_connected = False
+        self._retry_at = 0.0
+        self._phase = None
+        self._phase_deadline = 0.0
+        self._probe_answered = False
+        self._decoder = None
+        self._thread = None
+        self._running = False
+        self._cond = threading.Condition()
+
+    @property
+    def connected(self):
+        return self.connection is not None
+
+    @property
+    def ready(self):
+        """True once the sketch's protocol is known and commands can be written"""
+        return self.connection is not None and self.mode is not None
+
+    @property
+    def alive(self):
+        """True while the link thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the link thread if it isn't running yet"""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="serial-link", daemon=True)
+                self._thread.start()
+        return self
+
+    def send(self, code, duration=0):
+        """Queue a command byte for the Arduino and return immediately
+
+        duration (ms) overrides the sketch's default pattern length; it is
+        ignored by sketches that only understand legacy bytes.
+        """
+        self.start()
+        with self._cond:
+            last = self._pending[-1][0] if self._pending else self._last_sent
+            if code == last and (code in STATE_COMMANDS or self._pending):
+                # Back-to-back duplicates (e.g. b'l' after b'l') change nothing
+                self.coalesced += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.expired += 1
+            self._pending.append((code, duration, time.time()))
+            self._cond.notify()
+        return True
+
+    def wait_idle(self, timeout=None):
+        """Block until everything queued has been written and answered"""
+        deadline = time.time() + timeout if timeout is not None else None
+        with self._cond:
+            while self._pending or self._writing or self._in_flight:
+                remaining = deadline - time.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining if remaining is not None else 0.1)
+        return True
+
+    def stop(self, timeout=2.0):
+        """Send what is still queued (if connected), then close the port"""
+        if self.connected:
+            self.wait_idle(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self._disconnect()
+
+    def _run(self):
+        while self._running:
+            if self.connection is None:
+                self._try_connect()
+                continue
+            try:
+                self._read_replies()
+                if self.mode is None:
+                    self._handshake()
+                else:
+                    self._write_pending()
+            except Exception as e:
+                print(f"Lost connection to my physical body: {e}")
+                self.errors += 1
+                self._disconnect()
+                self._schedule_retry()
+
+    def _try_connect(self):
+        with self._cond:
+            delay = self._retry_at - time.time()
+            if delay > 0:
+                self._cond.wait(delay)
+                return
+        baudrate = self.baudrates[self._baud_index]
+        for path in self.find_ports():
+            try:
+                self.connection = self.open_port(path, baudrate)
+            except Exception as e:
+                if self._failures == 0:
+                    print(f"Unable to connect to my physical body: {e}")
+                continue
+            self.port_name = path
+            self.baudrate = baudrate
+            self.mode = None
+            self._decoder = expression_protocol.Decoder()
+            # The board resets when the port opens; wait for its banner before probing
+            self._phase = 'boot'
+            self._phase_deadline = time.time() + self.ready_timeout
+            return
+        self._schedule_retry()
+
+    def _schedule_retry(self):
+        self._failures += 1
+        delay = min(self.backoff_base * (2 ** (self._failures - 1)), self.backoff_max)
+        self._retry_at = time.time() + delay
+
+    def _disconnect(self):
+        connection, self.connection = self.connection, None
+        self.mode = None
+        with self._cond:
+            self._in_flight.clear()
+            self._last_sent = None
+            self._writing = False
+            self._cond.notify_all()
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _set_mode(self, mode):
+        self.mode = mode
+        self._phase = None
+        self._failures = 0
+        if self._ever_connected:
+            self.reconnects += 1
+        self._ever_connected = True
+        print(f"Physical body connected on {self.port_name} ({mode} protocol, {self.baudrate} baud)")
+
+    def _handshake(self):
+        """Work out which protocol the sketch speaks (and at which baud rate)"""
+        now = time.time()
+        if self.protocol != 'auto':
+            if self._phase == 'ready' or now >= self._phase_deadline:
+                self._set_mode(self.protocol)
+            return
+        if self._phase in ('boot', 'ready'):
+            if self._phase == 'ready' or now >= self._phase_deadline:
+                self._write(expression_protocol.probe_frame())
+                self._phase = 'probe'
+                self._phase_deadline = now + self.probe_timeout
+                self._probe_answered = False
+            return
+        if self._phase == 'probe' and now >= self._phase_deadline:
+            if not self._probe_answered and self._baud_index + 1 < len(self.baudrates):
+                # Silence or garbage: the sketch may run at another baud rate
+                self._baud_index += 1
+                self._disconnect()
+                return
+            # Text but no ack: an older sketch that only knows single bytes
+            self._set_mode(LEGACY)
+
+    def _read_replies(self):
+        """Read whatever the board sent and match it to the commands written"""
+        waiting = self.connection.in_waiting
+        if waiting:
+            data = self.connection.read(waiting)
+        elif not self._pending or self.mode is None:
+            data = self.connection.read(1)  # nothing to write, so wait briefly for a reply
+        else:
+            data = b""
+        now = time.time()
+        if data:
+            self.bytes_received += len(data)
+            for kind, value in self._decoder.feed(data):
+                if kind == 'frame':
+                    self._handle_ack(value, now)
+                elif kind == 'line':
+                    self._handle_line(value, now)
+
+        with self._cond:
+            # Sketches that don't answer (e.g. an old motor_control.ino) must not stall the queue
+            while self._in_flight and now - self._in_flight[0][2] > self.ack_timeout:
+                self._in_flight.popleft()
+                self.unacked += 1
+            self._cond.notify_all()
+
+    def _handle_line(self, text, now):
+        if text.startswith(READY_PREFIX):
+            with self._cond:
+                self._in_flight.clear()
+            if self.mode is None:
+                if self.protocol == 'auto' and FRAMED_BANNER in text:
+                    self._set_mode(FRAMED)
+                else:
+                    self._phase = 'ready'
+            return
+        if self.mode is None:
+            if self._phase == 'probe' and text.isascii() and text.isprintable():
+                self._probe_answered = True  # readable, so the baud rate is right
+            return
+        if self.mode != LEGACY:
+            return
+        with self._cond:
+            if not self._in_flight:
+                return
+            _, codes, sent_at, _, _ = self._in_flight.popleft()
+        self._record(codes, text, now - sent_at)
+        if text.startswith(ERROR_PREFIX):
+            print(f"Arduino rejected {codes!r}: {text}")
+
+    def _handle_ack(self, frame, now):
+        if self.mode is None:
+            if frame.seq == expression_protocol.PROBE_SEQ:
+                self._set_mode(FRAMED)
+            return
+        status = frame.payload[0] if frame.payload else expression_protocol.STATUS_OK
+        with self._cond:
+            entry = next((e for e in self._in_flight if e[0] == frame.seq), None)
+            if entry is None:
+                return
+            self._in_flight.remove(entry)
+            seq, codes, sent_at, data, retries = entry
+            resend = status == expression_protocol.STATUS_BAD_CHECKSUM and not retries
+            if resend:
+                # Back in flight before the lock is released, so wait_idle() never sees a gap
+                self._in_flight.append((seq, codes, time.time(), data, retries + 1))
+        if resend:
+            # Corrupted on the wire: send the same frame once more
+            self.resent += 1
+            self._write(data)
+            return
+        name = expression_protocol.STATUS_NAMES.get(status, f"status {status}")
+        self._record(codes, name, now - sent_at)
+        if status != expression_protocol.STATUS_OK:
+            print(f"Arduino rejected {codes!r}: {name}")
+
+    def _record(self, codes, text, rtt):
+        self.acked += 1
+        for i in range(len(codes)):
+            self.rtt[codes[i:i + 1]].append(rtt)
+        self.replies.append(Reply(codes, text, rtt))
+
+    def _next_seq(self):
+        self._seq = self._seq % 255 + 1  # 1..255; 0 is the probe
+        return self._seq
+
+    def _write(self, data):
+        started = time.perf_counter()
+        self.connection.write(data)
+        self.bytes_sent += len(data)
+        if self.observer:
+            self.observer(time.perf_counter() - started)
+
+    def _write_pending(self):
+        now = time.time()
+        with self._cond:
+            if not self._pending:
+                return
+            if self.mode == FRAMED and self._in_flight:
+                return  # one frame at a time; the rest are batched into the next one
+            batch = []
+            limit = expression_protocol.MAX_COMMANDS if self.mode == FRAMED else 1
+            while self._pending and len(batch) < limit:
+                code, duration, queued_at = self._pending.popleft()
+                if now - queued_at > self.max_age:
+                    self.expired += 1
+                    continue
+                batch.append((code, duration))
+            if not batch:
+                return
+            self._writing = True
+
+        codes = b"".join(code for code, _ in batch)
+        if self.mode == FRAMED:
+            seq = self._next_seq()
+            data = expression_protocol.encode_commands(seq, batch)
+        else:
+            seq, data = None, codes
+        self._write(data)
+        with self._cond:
+            self._in_flight.append((seq, codes, time.time(), data, 0))
+            self._writing = False
+            self._last_sent = batch[-1][0]
+            self.sent += len(batch)
+            self.frames_sent += 1
+
+    def rtt_summary(self):
+        """Median round-trip time in milliseconds per command"""
+        summary = {}
+        for code, times in self.rtt.items():
+            ordered = sorted(times)
+            summary[code.decode(errors='replace')] = ordered[len(ordered) // 2] * 1000 if ordered else None
+        return summary
@@ -0,0 +1,166 @@
+"""
+Conversation context for Jarvis
+Remembers the last few turns of the conversation in memory, so a command
+can build on the one before it: "what's the weather in Paris" followed by
+"and tomorrow?" or "in London?" asks for the weather again with the slots
+changed, and "yes" after "Would you like me to search the web for you?"
+runs the search. Lookup results are kept by intent and slots, so going
+back to an earlier question doesn't fetch it again.
+
+Everything expires: turns and results after TTL seconds, an offer that
+waits for a yes or no after CONFIRM_TTL seconds or at the next command.
+"""
+
+import collections                # for the turn history
+import re                         # for follow-up phrases
+import threading                  # for the store lock
+import time                       # for expiry
+
+MAX_TURNS = 10
+TTL = 120.0                       # seconds a turn or a lookup result stays usable
+CONFIRM_TTL = 30.0                # seconds an offer waits for its yes or no
+
+# "and tomorrow?", "what about in London?", "how about for new york"
+FOLLOW_UP = re.compile(r"^(?:and |what about |how about |and what about )?"
+                       r"(?:(?:in|for) (?P<city>[a-z][a-z\s]*?)|(?P<day>today|tomorrow))$")
+YES = {"yes", "yeah", "yep", "sure", "ok", "okay", "please", "yes please", "go ahead", "do it"}
+NO = {"no", "nope", "no thanks", "no thank you", "don't", "never mind", "cancel"}
+
+# Route intents a follow-up can replace: they only mean nothing more specific matched
+CATCH_ALL = ('question', 'fallback')
+
+Turn = collections.namedtuple('Turn', ['text', 'intent', 'slots', 'at'])
+
+
+def follow_ups_from_manifest(manifest):
+    """{intent: slot names a follow-up may change} from the skill manifest"""
+    follow_ups = {}
+    for skill in manifest:
+        for entry in skill['intents']:
+            if entry.get('follow_ups'):
+                follow_ups[entry['intent']] = tuple(entry['follow_ups'])
+    return follow_ups
+
+
+def result_key(intent, slots):
+    """What a stored lookup result must match to be reused"""
+    return intent, tuple(sorted(slots.items()))
+
+
+class SessionStore(object):
+    """The recent turns, an open offer and recent lookup results
+
+    resolve() rewrites a route that only matched a catch-all intent when
+    the conversation gives it a meaning, record() adds the answered turn,
+    offer() opens a yes/no question, and get()/put() keep lookup results
+    for the prefetcher.
+    """
+
+    def __init__(self, wake_word='jarvis', follow_ups=None, max_turns=MAX_TURNS, ttl=TTL,
+                 confirm_ttl=CONFIRM_TTL, clock=time.time):
+        if follow_ups is None:
+            import skills                 # the manifest says which intents take follow-ups
+            follow_ups = follow_ups_from_manifest(skills.load_manifest())
+        self.wake_word = wake_word
+        self.follow_ups = follow_ups
+        self.ttl = ttl
+        self.confirm_ttl = confirm_ttl
+        self.clock = clock
+        self.turns = collections.deque(maxlen=max_turns)
+        self.pending = None               # (intent, slots, offered at)
+        self.results = {}
+        self.stats = {'follow_ups': 0, 'confirmed': 0, 'declined': 0, 'hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    def request(self, words):
+        """The command without the wake word, lowercase and without punctuation"""
+        text = re.sub(r"[^\w\s']", " ", words.lower()).split()
+        if text and text[0] == self.wake_word:
+            text = text[1:]
+        return " ".join(text)
+
+    def resolve(self, words, route):
+        """The route to answer words with, taking the conversation into account"""
+        text = self.request(words)
+        with self._lock:
+            now = self.clock()
+            self._evict(now)
+            pending, self.pending = self.pending, None  # an offer only stands for the next command
+            if route.intent not in CATCH_ALL:
+                return route
+            if pending is not None and text in YES:
+                self.stats['confirmed'] += 1
+                return route._replace(intent=pending[0], slots=dict(pending[1]))
+            if pending is not None and text in NO:
+                self.stats['declined'] += 1
+                return route._replace(intent='decline', slots={})
+            match = FOLLOW_UP.match(text)
+            if match:
+                changed = dict((name, value.strip()) for name, value in match.groupdict().items() if value)
+                for turn in reversed(self.turns):
+                    names = self.follow_ups.get(turn.intent, ())
+                    if all(name in names for name in changed):
+                        self.stats['follow_ups'] += 1
+                        slots = dict(turn.slots)
+                        slots.update(changed)
+                        if slots.get('day') == 'today':
+                            del slots['day']  # today is what the intent answers anyway
+                        return route._replace(intent=turn.intent, slots=slots)
+            if route.intent == 'fallback':
+                return route._replace(slots={'query': text})  # what to search for if the offer is taken
+            return route
+
+    def record(self, words, route):
+        """Remember an answered turn"""
+        with self._lock:
+            self.turns.append(Turn(self.request(words), route.intent, dict(route.slots), self.clock()))
+
+    def offer(self, intent, slots):
+        """Ask a yes/no question: a yes next turn runs intent with slots"""
+        with self._lock:
+            self.pending = (intent, dict(slots), self.clock())
+
+    def slot(self, name):
+        """The most recent value of a slot in the conversation, or None"""
+        with self._lock:
+            self._evict(self.clock())
+            for turn in reversed(self.turns):
+                if turn.slots.get(name):
+                    return turn.slots[name]
+        return None
+
+    def has(self, intent, slots):
+        """True if get() would answer, without counting it as a lookup"""
+        with self._lock:
+            entry = self.results.get(result_key(intent, slots))
+            return entry is not None and self.clock() - entry[1] <= self.ttl
+
+    def get(self, intent, slots):
+        """A lookup result stored for intent and slots, or None"""
+        with self._lock:
+            entry = self.results.get(result_key(intent, slots))
+            if entry is None or self.clock() - entry[1] > self.ttl:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return entry[0]
+
+    def put(self, intent, slots, result):
+        """Keep a lookup result for a later turn"""
+        with self._lock:
+            self.results[result_key(intent, slots)] = (result, self.clock())
+
+    def _evict(self, now):
+        while self.turns and now - self.turns[0].at > self.ttl:
+            self.turns.popleft()
+        if self.pending is not None and now - self.pending[2] > self.confirm_ttl:
+            self.pending = None
+        for key in [key for key, (result, at) in self.results.items() if now - at > self.ttl]:
+            del self.results[key]
+
+    def format_report(self):
+        """How often the conversation context answered a command"""
+        stats = self.stats
+        return (f"Conversation: {stats['follow_ups']} follow-ups, {stats['confirmed']} offers taken, "
+                f"{stats['declined']} declined, {stats['hits']} of {stats['hits'] + stats['misses']} "
+                f"lookups answered from earlier turns")
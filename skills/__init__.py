@@ -0,0 +1,303 @@
+"""
+Skills for Jarvis
+Every capability lives in a module of this package. manifest.json lists
+the skills with their trigger phrases, expression codes and whether they
+block, and is all that is read at startup: a skill's module is imported
+the first time one of its intents is dispatched. Blocking skills run on a
+small worker pool, so a slow web lookup doesn't hold up the next command.
+
+A skill module defines handle_<intent>(jarvis, slots) for each of its
+intents, where jarvis is the assistant (main.py) with talk(), express()
+and the shared services. The code behind a capability lives in its skill
+too; main.py reaches it through bound() without importing the module.
+
+Blocking skills have a deadline (seconds, per skill or per intent in the
+manifest). Past it the registry reports the handler as overdue, so Jarvis
+can say it is still working on it; past CANCEL_FACTOR times the deadline
+the command is given up on. A thread can't be stopped from outside, so a
+handler that is already running is only marked: cancelled() turns true for
+it and whatever it says afterwards should be dropped.
+"""
+
+import importlib                  # for loading skill modules on first use
+import json                       # for the manifest
+import os                         # for the manifest path
+import threading                  # for the loader lock and the in-flight count
+import time                       # for import and handler timing
+
+MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "manifest.json")
+MAX_WORKERS = 2                   # blocking skills running at the same time
+CANCEL_FACTOR = 3.0               # a handler is given up on at this many times its deadline
+
+_manifest = None
+_local = threading.local()        # the job the current worker thread is running
+
+
+def load_manifest(path=MANIFEST):
+    """The skill entries of the manifest (read once per process for the default path)"""
+    global _manifest
+    if path != MANIFEST:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["skills"]
+    if _manifest is None:
+        with open(path, encoding="utf-8") as f:
+            _manifest = json.load(f)["skills"]
+    return _manifest
+
+
+def cancelled():
+    """True inside a handler whose command has been given up on"""
+    job = getattr(_local, 'job', None)
+    return job is not None and job.cancelled
+
+
+class Skill(object):
+    """One manifest entry; the module is imported on first use"""
+
+    def __init__(self, name, module, blocking=False, intents=(), description="", deadline=None):
+        self.name = name
+        self.module_name = module
+        self.blocking = blocking
+        self.deadline = deadline
+        self.intents = list(intents)
+        self.description = description
+        self.module = None
+        self.import_seconds = None
+        self.calls = 0
+
+    def function(self, name):
+        if self.module is None:
+            started = time.perf_counter()
+            self.module = importlib.import_module(self.module_name)
+            self.import_seconds = time.perf_counter() - started
+        return getattr(self.module, name)
+
+
+class Job(object):
+    """One dispatch of a blocking skill"""
+
+    def __init__(self, intent, deadline, done):
+        self.intent = intent
+        self.deadline = deadline
+        self.done = done
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.future = None
+        self.timer = None
+        self.overdue = False
+        self.cancelled = False
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def finish(self):
+        """Claim the right to call done(); True only for the first caller"""
+        with self._lock:
+            if self.finished:
+                return False
+            self.finished = True
+            return True
+
+
+class SkillRegistry(object):
+    """Dispatches intents to their skills
+
+    dispatch() calls done(error, seconds) once the handler has finished,
+    right away for inline skills and from a worker for blocking ones. A
+    blocking handler that is given up on reports a TimeoutError instead, and
+    on_overdue(intent) is called when it passes its deadline.
+    """
+
+    def __init__(self, context, manifest=None, max_workers=MAX_WORKERS, on_overdue=None,
+                 cancel_factor=CANCEL_FACTOR):
+        self.context = context
+        self.max_workers = max_workers
+        self.on_overdue = on_overdue
+        self.cancel_factor = cancel_factor
+        self.skills = {}
+        self.by_intent = {}
+        self.deadlines = {}
+        for entry in manifest if manifest is not None else load_manifest():
+            if not entry.get("module"):
+                continue  # expression words only light up the LEDs, nothing to run
+            skill = Skill(entry["skill"], entry["module"], entry.get("blocking", False),
+                          [intent["intent"] for intent in entry["intents"]], entry.get("description", ""),
+                          entry.get("deadline"))
+            self.skills[skill.name] = skill
+            for intent in entry["intents"]:
+                self.by_intent[intent["intent"]] = skill
+                if skill.blocking and intent.get("deadline", skill.deadline):
+                    self.deadlines[intent["intent"]] = intent.get("deadline", skill.deadline)
+        self.in_flight = 0
+        self.queued = 0
+        self.counters = {}
+        self._executor = None
+        self._load_lock = threading.Lock()
+        self._idle = threading.Condition()
+
+    @property
+    def executor(self):
+        """The worker pool for blocking skills, created on first use"""
+        if self._executor is None:
+            import concurrent.futures     # for the worker pool
+            self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                                   thread_name_prefix="skill")
+        return self._executor
+
+    def handler(self, intent):
+        """The handler function for an intent, importing its skill if needed"""
+        return self.function(intent, f"handle_{intent}")
+
+    def function(self, intent, name):
+        """Any function of the intent's skill module, importing it if needed"""
+        skill = self.by_intent[intent]
+        with self._load_lock:  # a module must not be imported by two workers at once
+            return skill.function(name)
+
+    def bound(self, intent, name):
+        """name(*args) of the intent's skill, called as name(context, *args)
+
+        The module is only imported on the first call, so this can be used
+        at startup, e.g. to register a skill's lookups with the prefetcher.
+        """
+        def call(*args):
+            return self.function(intent, name)(self.context, *args)
+        call.__name__ = name
+        return call
+
+    def dispatch(self, intent, slots, done=None):
+        """Run the intent's handler inline or on the pool; returns the Job for blocking skills"""
+        skill = self.by_intent[intent]
+        handler = self.handler(intent)
+        with self._idle:
+            self.in_flight += 1
+            self._count(intent, 'dispatched')
+        if not skill.blocking:
+            self._run(skill, intent, handler, slots, done)
+            return None
+        job = Job(intent, self.deadlines.get(intent), done)
+        with self._idle:
+            self.queued += 1
+        if job.deadline:
+            job.timer = threading.Timer(job.deadline, self._overdue, (job,))
+            job.timer.daemon = True
+            job.timer.start()
+        job.future = self.executor.submit(self._work, skill, job, handler, slots)
+        return job
+
+    def _work(self, skill, job, handler, slots):
+        job.started = time.perf_counter()
+        with self._idle:
+            self.queued -= 1
+        _local.job = job
+        try:
+            self._run(skill, job.intent, handler, slots, job.done, job)
+        finally:
+            _local.job = None
+
+    def _run(self, skill, intent, handler, slots, done, job=None):
+        started = time.perf_counter()
+        error = None
+        try:
+            skill.calls += 1
+            handler(self.context, slots)
+        except Exception as e:
+            error = e
+            print(f"\nError in the {intent} handler: {e}")
+            with self._idle:
+                self._count(intent, 'errors')
+        finally:
+            try:
+                if job is not None:
+                    if job.timer:
+                        job.timer.cancel()
+                    if not job.finish():
+                        return  # given up on already, done() has been called
+                if done:
+                    done(error, time.perf_counter() - started)
+            finally:
+                with self._idle:
+                    self.in_flight -= 1
+                    self._idle.notify_all()
+
+    def _overdue(self, job):
+        """The deadline passed: tell the user, and give up if it takes much longer still"""
+        if job.finished:
+            return
+        job.overdue = True
+        with self._idle:
+            self._count(job.intent, 'overdue')
+        if self.on_overdue:
+            try:
+                self.on_overdue(job.intent)
+            except Exception as e:
+                print(f"\nError announcing the slow {job.intent} handler: {e}")
+        job.timer = threading.Timer(job.deadline * (self.cancel_factor - 1), self.cancel, (job,))
+        job.timer.daemon = True
+        job.timer.start()
+
+    def cancel(self, job):
+        """Give up on a job: it won't start if still queued, and done() gets a TimeoutError now"""
+        if not job.finish():
+            return False
+        job.cancelled = True
+        if job.timer:
+            job.timer.cancel()
+        with self._idle:
+            self._count(job.intent, 'cancelled')
+        if job.future is not None and job.future.cancel():
+            with self._idle:  # never started, so _work won't account for it
+                self.queued -= 1
+                self.in_flight -= 1
+                self._idle.notify_all()
+        if job.done:
+            job.done(TimeoutError(f"{job.intent} took longer than {job.deadline * self.cancel_factor:g}s"),
+                     time.perf_counter() - job.submitted)
+        return True
+
+    def _count(self, intent, counter):
+        counters = self.counters.setdefault(intent, {'dispatched': 0, 'overdue': 0, 'cancelled': 0, 'errors': 0})
+        counters[counter] += 1
+
+    def wait_idle(self, timeout=None):
+        """Block until no handler is running; False on timeout"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self.in_flight == 0, timeout=timeout)
+
+    def loaded(self):
+        """Names of the skills whose modules have been imported"""
+        return [skill.name for skill in self.skills.values() if skill.module is not None]
+
+    def format_prometheus(self):
+        """Queue depth and per-intent counters in the Prometheus text format"""
+        with self._idle:
+            counters = dict((intent, dict(values)) for intent, values in self.counters.items())
+            queued, running = self.queued, self.in_flight - self.queued
+        lines = ["# HELP jarvis_skill_queue_depth Blocking handlers waiting for a worker",
+                 "# TYPE jarvis_skill_queue_depth gauge",
+                 f"jarvis_skill_queue_depth {queued}",
+                 "# HELP jarvis_skill_running Handlers running now",
+                 "# TYPE jarvis_skill_running gauge",
+                 f"jarvis_skill_running {running}"]
+        for counter, text in (('dispatched', "Commands handed to a skill"),
+                              ('overdue', "Handlers that passed their deadline"),
+                              ('cancelled', "Handlers given up on"),
+                              ('errors', "Handlers that raised an error")):
+            lines.append(f"# HELP jarvis_skill_{counter}_total {text}")
+            lines.append(f"# TYPE jarvis_skill_{counter}_total counter")
+            for intent, values in sorted(counters.items()):
+                lines.append(f'jarvis_skill_{counter}_total{{intent="{intent}"}} {values[counter]}')
+        return "\n".join(lines) + "\n"
+
+    def format_report(self):
+        """Per-intent dispatch, deadline and error counts"""
+        lines = [f"Skills ({', '.join(self.loaded()) or 'none'} loaded, {self.queued} queued):"]
+        with self._idle:
+            for intent, values in sorted(self.counters.items()):
+                line = f"  {intent}: {values['dispatched']} handled"
+                for counter in ('overdue', 'cancelled', 'errors'):
+                    if values[counter]:
+                        line += f", {values[counter]} {counter}"
+                lines.append(line)
+        if len(lines) == 1:
+            lines.append("  nothing handled")
+        return "\n".join(lines)
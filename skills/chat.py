@@ -0,0 +1,116 @@
+"""
+Chat skill for Jarvis
+Greetings, small talk, jokes, facts and help, plus the answers to the bare
+wake word and to commands nothing else understood.
+"""
+
+import random                     # to choose random words from list
+
+WELLBEING = ["I'm doing well, thank you for asking!",
+             "I'm functioning optimally today!",
+             "All systems operational and ready to assist you!"]
+
+ACTIVITIES = [
+    "How about reading a book?",
+    "You could go for a walk and enjoy the fresh air.",
+    "Maybe catch up on a TV series you've been meaning to watch.",
+    "How about learning something new today?",
+    "You could call a friend or family member you haven't spoken to in a while.",
+    "Perhaps some exercise would be good for you today."
+]
+
+FACTS = [
+    "The Eiffel Tower can be 15 cm taller during the summer due to thermal expansion.",
+    "20% of Earth's oxygen is produced by the Amazon rainforest.",
+    "Honey never spoils. Archaeologists found pots of honey in ancient Egyptian tombs that are over 3,000 years old and still perfectly edible.",
+    "A day on Venus is longer than a year on Venus. It takes 243 Earth days to rotate once on its axis.",
+    "The shortest war in history was between Britain and Zanzibar on August 27, 1896. Zanzibar surrendered after 38 minutes.",
+    "The average person walks the equivalent of three times around the world in a lifetime.",
+    "The Hawaiian alphabet has only 13 letters.",
+    "A group of flamingos is called a 'flamboyance'.",
+    "Octopuses have three hearts."
+]
+
+JOKES = [
+    "Why don't scientists trust atoms? Because they make up everything!",
+    "I told my wife she was drawing her eyebrows too high. She looked surprised.",
+    "Parallel lines have so much in common. It's a shame they'll never meet.",
+    "I'm reading a book about anti-gravity. It's impossible to put down!",
+    "I used to play piano by ear, but now I use my hands.",
+    "Why did the scarecrow win an award? Because he was outstanding in his field!",
+    "What's the best thing about Switzerland? I don't know, but the flag is a big plus.",
+    "Did you hear about the mathematician who's afraid of negative numbers? He'll stop at nothing to avoid them."
+]
+
+HELP = ("Here are some things you can ask me:\n"
+        "- What's the time?\n"
+        "- What's the date today?\n"
+        "- What's the weather?\n"
+        "- Where am I? / What's my location?\n"
+        "- What's my battery status?\n"
+        "- What's my IP address? / Network info?\n"
+        "- How much disk space do I have?\n"
+        "- Tell me a joke or fact\n"
+        "- Play [song name] on YouTube\n"
+        "- Search for [your query]\n"
+        "- Open [website.com]\n"
+        "- What should I do today?\n")
+
+
+def handle_wake(jarvis, slots):
+    """ just the wake word was said """
+    jarvis.talk("How can I help you today?", end_expression=b'h', fixed=True)  # Thinking expression
+
+
+def handle_joke(jarvis, slots):
+    jarvis.talk(random.choice(JOKES), start_expression=b'p')  # Happy expression
+
+
+def handle_fact(jarvis, slots):
+    jarvis.talk(random.choice(FACTS), start_expression=b'h')  # Thinking expression
+
+
+def handle_help(jarvis, slots):
+    jarvis.talk(HELP, start_expression=b'h')  # Thinking expression
+
+
+def handle_wellbeing(jarvis, slots):
+    jarvis.talk(random.choice(WELLBEING), end_expression=b'p', fixed=True)  # Happy expression
+
+
+def handle_activity(jarvis, slots):
+    """ "What to do today" type questions """
+    jarvis.talk(random.choice(ACTIVITIES), end_expression=b'p', fixed=True)  # Happy expression
+
+
+def handle_identity(jarvis, slots):
+    jarvis.talk("I am Jarvis, your personal AI assistant. I can help you with daily tasks, answer questions, "
+                "and control connected devices.", end_expression=b'p', fixed=True)  # Happy expression
+
+
+def handle_greeting(jarvis, slots):
+    """ if user says hi/hello greet him accordingly"""
+    jarvis.talk(random.choice(jarvis.hi_words), start_expression=b'h', fixed=True)      # thinking expression
+
+
+def handle_presence(jarvis, slots):
+    """ if user asks if assistant is there """
+    jarvis.talk("Yes, I'm here and ready to help!", start_expression=b'p', fixed=True)  # happy expression
+
+
+def handle_farewell(jarvis, slots):
+    """ if user says bye etc"""
+    jarvis.talk(random.choice(jarvis.bye_words), start_expression=b's', fixed=True)     # sad expression
+
+
+def handle_decline(jarvis, slots):
+    """ "no" to the offer to search the web """
+    jarvis.talk("Okay, never mind.", end_expression=b'p', fixed=True)  # Happy expression
+
+
+def handle_fallback(jarvis, slots):
+    """ fallback for unrecognized commands """
+    if slots.get('query'):
+        jarvis.session.offer('search', {'query': slots['query']})  # a "yes" next turn searches for it
+    jarvis.talk("I'm not sure how to help with that. Would you like me to search the web for you?",
+                end_expression=b'h', fixed=True)  # Thinking expression
@@ -0,0 +1,37 @@
+"""
+Clock skill for Jarvis
+Tells the time and the date.
+"""
+
+from datetime import datetime
+
+
+def get_time_info():
+    """Get current time with formatted output"""
+    now = datetime.now()
+    hour = now.hour
+
+    # Determine time of day greeting
+    if 5 <= hour < 12:
+        greeting = "Good morning"
+    elif 12 <= hour < 18:
+        greeting = "Good afternoon"
+    else:
+        greeting = "Good evening"
+
+    time_str = now.strftime("%I:%M %p")
+    return f"{greeting}. It's {time_str}."
+
+
+def get_date_info():
+    """Get current date with formatted output"""
+    now = datetime.now()
+    return now.strftime("%A, %B %d, %Y")
+
+
+def handle_time(jarvis, slots):
+    jarvis.talk(get_time_info(), end_expression=b'p')  # Happy expression
+
+
+def handle_date(jarvis, slots):
+    jarvis.talk(f"Today is {get_date_info()}", end_expression=b'p')  # Happy expression
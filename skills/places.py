@@ -0,0 +1,129 @@
+"""
+Places skill for Jarvis
+Tells where you are and what the weather is like. Both are web lookups,
+usually started by the prefetcher while the command was being recognized.
+"""
+
+import time                       # for the lookup timings
+from datetime import datetime     # for the forecast's day
+from urllib.parse import quote    # for URL encoding
+
+import http_client                # pooled HTTP session with timeouts and caching
+
+# Lookup answers that mean it failed, which later turns shouldn't reuse
+LOOKUP_FAILURES = ("I couldn't", "I'm offline", "I'm having trouble")
+
+# Recent weather lookup times in seconds: (location, forecast)
+weather_timings = []
+
+
+def get_weather_info(jarvis, city=""):
+    """Get simple weather information using a public API"""
+    try:
+        # Use a free weather API that doesn't require a key
+        if not city:
+            city = jarvis.locations.city(default=jarvis.default_location)
+
+        base_url = f"https://wttr.in/{quote(city)}?format=3"
+        response = http_client.get(base_url, endpoint='weather')
+
+        if response.status_code == 200:
+            weather_info = response.text
+            # Add the city name if not already in the response
+            if city.lower() not in weather_info.lower():
+                weather_info = f"Weather in {city}: {weather_info}"
+            return weather_info
+        else:
+            return f"I couldn't get the weather information for {city} right now."
+    except http_client.OfflineError:
+        return "I'm offline right now, so I can't check the weather."
+    except Exception as e:
+        print(f"Weather error: {e}")
+        return "I'm having trouble getting weather data."
+
+
+def forecast_day_label(date, today=None):
+    """How to say a forecast's date ('2024-05-17'): Today, Tomorrow or the weekday"""
+    target = datetime.strptime(date, "%Y-%m-%d").date()
+    days = (target - (today or datetime.now().date())).days
+    if days == 0:
+        return "Today"
+    if days == 1:
+        return "Tomorrow"
+    return f"On {target:%A}"
+
+
+def get_forecast_info(city, days_ahead=1):
+    """Get the forecast for a later day from the same public API"""
+    try:
+        response = http_client.get(f"https://wttr.in/{quote(city)}?format=j1", endpoint='weather')
+        if response.status_code != 200:
+            return f"I couldn't get the forecast for {city} right now."
+        day = response.json()['weather'][days_ahead]
+        # The hourly entries are three hours apart; 4 is midday
+        description = day['hourly'][4]['weatherDesc'][0]['value'].strip()
+        return f"{forecast_day_label(day['date'])} in {city}: {description}, {day['mintempC']} to {day['maxtempC']}°C"
+    except http_client.OfflineError:
+        return "I'm offline right now, so I can't check the forecast."
+    except Exception as e:
+        print(f"Forecast error: {e}")
+        return "I'm having trouble getting forecast data."
+
+
+def get_location_info(jarvis):
+    """Get approximate location based on IP address"""
+    # Resolved once and kept on disk (no GPS access needed)
+    location = jarvis.locations.get()
+    if location is None:
+        return "I couldn't determine your location."
+
+    location_info = f"You appear to be in {location.city}, {location.region}, {location.country}.\n"
+
+    loc = location.loc.split(',')
+    if len(loc) == 2:
+        location_info += f"Coordinates: {loc[0]}, {loc[1]}\n"
+
+    location_info += f"Timezone: {location.timezone or 'Unknown'}"
+
+    return location_info
+
+
+def lookup_weather(jarvis, slots):
+    """Weather (or tomorrow's forecast) for the city in the command, otherwise the saved location"""
+    started = time.time()
+    city = slots.get('city') or jarvis.locations.city(default=jarvis.default_location)
+    located = time.time()
+    if slots.get('day') == 'tomorrow':
+        weather_info = get_forecast_info(city)
+    else:
+        weather_info = get_weather_info(jarvis, city)
+    finished = time.time()
+
+    weather_timings.append((located - started, finished - located))
+    del weather_timings[:-100]
+    print(f"⏱️ Weather lookup: location {(located - started) * 1000:.0f} ms, forecast {(finished - located) * 1000:.0f} ms")
+    return weather_info
+
+
+def keep_weather(jarvis, weather_info):
+    """Whether later turns may reuse a weather answer"""
+    return not weather_info.startswith(LOOKUP_FAILURES)
+
+
+def lookup_location(jarvis, slots):
+    return get_location_info(jarvis)
+
+
+def handle_location(jarvis, slots):
+    jarvis.talk("Getting your location information", end_expression=b'h', fixed=True)  # Thinking expression
+
+    location_info = jarvis.prefetcher.fetch('location', slots)
+    jarvis.talk(location_info, end_expression=b'p')  # Happy expression
+
+
+def handle_weather(jarvis, slots):
+    jarvis.talk("Checking the weather for you", end_expression=b'h', fixed=True)  # Thinking expression
+
+    # Usually already fetched while the command was on its way here
+    weather_info = jarvis.prefetcher.fetch('weather', slots)
+    jarvis.talk(weather_info, end_expression=b'p')  # Happy expression
@@ -0,0 +1,113 @@
+"""
+System skill for Jarvis
+Reports on the battery, network, computer and disk from the cached sensor
+readings.
+"""
+
+import platform                   # for system information
+
+
+def get_system_info(jarvis):
+    """Get basic system information"""
+    system_info = f"System: {platform.system()} {platform.version()}\n"
+    system_info += f"Machine: {platform.machine()}\n"
+    system_info += f"Processor: {platform.processor()}\n"
+    try:
+        memory = jarvis.sensors.get('memory')
+        system_info += f"Memory: {memory.percent:.0f}% of {memory.total / (1024**3):.1f} GB in use\n"
+        cpu = jarvis.sensors.get('cpu')
+        if cpu.percent is not None:
+            system_info += f"CPU: {cpu.percent:.0f}% busy across {cpu.count} cores\n"
+    except Exception as e:
+        print(f"Error getting memory and CPU usage: {e}")
+    return system_info
+
+
+def get_battery_status(jarvis):
+    """Get battery status information"""
+    try:
+        battery = jarvis.sensors.get('battery')
+        if battery is None:
+            return "No battery found. Your computer might be a desktop or the battery information is unavailable."
+
+        if not battery.plugged:
+            status = 'Discharging'
+        elif battery.percent < 100:
+            status = 'Charging'
+        else:
+            status = 'Connected to power'
+
+        response = f"Battery at {battery.percent}%. "
+        response += f"Status: {status}. "
+
+        if battery.seconds_left is not None and not battery.plugged:
+            hours, minutes = divmod(battery.seconds_left // 60, 60)
+            response += f"Time remaining: {hours}:{minutes:02d}."
+
+        return response
+    except Exception as e:
+        print(f"Error getting battery status: {e}")
+        return "I couldn't retrieve the battery information at the moment."
+
+
+def get_network_info(jarvis):
+    """Get network connectivity information"""
+    try:
+        network = jarvis.sensors.get('network')
+        if not network.online or not jarvis.internet.online:
+            return "Internet: Not connected or unable to retrieve network information."
+
+        network_info = "Internet: Connected\n"
+        network_info += f"Hostname: {network.hostname}\n"
+        network_info += f"IP address: {network.ip_address}\n"
+
+        if network.interface:
+            network_info += f"Interface: {network.interface}\n"
+
+        return network_info
+    except Exception as e:
+        print(f"Error getting network info: {e}")
+        return "Internet: Not connected or unable to retrieve network information."
+
+
+def get_disk_space(jarvis):
+    """Get disk space information"""
+    try:
+        # Disk usage of the main disk
+        disk = jarvis.sensors.get('disk')
+
+        # Convert to GB for readability
+        total_gb = disk.total / (1024**3)
+        used_gb = disk.used / (1024**3)
+        free_gb = disk.free / (1024**3)
+
+        disk_info = f"Total disk space: {total_gb:.1f} GB\n"
+        disk_info += f"Used space: {used_gb:.1f} GB\n"
+        disk_info += f"Free space: {free_gb:.1f} GB\n"
+        disk_info += f"Disk usage: {disk.percent:.1f}%"
+
+        return disk_info
+    except Exception as e:
+        print(f"Error getting disk space: {e}")
+        return "I couldn't retrieve disk space information."
+
+
+def _report(jarvis, announcement, reading):
+    jarvis.talk(announcement, end_expression=b'h', fixed=True)  # Thinking expression
+    jarvis.talk(reading(jarvis), end_expression=b'p')  # Happy expression
+
+
+def handle_battery(jarvis, slots):
+    _report(jarvis, "Checking your battery status", get_battery_status)
+
+
+def handle_network(jarvis, slots):
+    _report(jarvis, "Checking your network information", get_network_info)
+
+
+def handle_system(jarvis, slots):
+    _report(jarvis, "Here's your system information", get_system_info)
+
+
+def handle_disk(jarvis, slots):
+    _report(jarvis, "Checking your disk space", get_disk_space)
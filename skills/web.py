@@ -0,0 +1,72 @@
+"""
+Web skill for Jarvis
+Plays YouTube videos, searches Google, reads Wikipedia summaries and opens
+websites. pywhatkit and the browser are only imported with this skill.
+"""
+
+import webbrowser                 # to open and perform web tasks
+
+import skills                     # to stop once the command was given up on
+
+
+def lookup_info(jarvis, slots):
+    """Summary of a topic from Wikipedia, or the answer we got last time"""
+    answer = jarvis.knowledge.get(slots['query'], offline=not jarvis.internet.online)
+    if answer or not jarvis.internet.online:
+        return answer
+    import pywhatkit                  # for more web automation (slow to import)
+    answer = pywhatkit.info(slots['query'], lines=3, return_value=True)
+    jarvis.knowledge.put(slots['query'], answer)
+    return answer
+
+
+def handle_play(jarvis, slots):
+    """if command for playing things, play from youtube"""
+    if not jarvis.internet.online:
+        jarvis.talk("I'm offline right now, so I can't play that", end_expression=b's', fixed=True)  # Sad expression
+        return
+    import pywhatkit                  # for more web automation (slow to import)
+    if skills.cancelled():
+        return
+    jarvis.talk("Okay boss, playing", start_expression=b'u', end_expression=b'l', fixed=True)
+    pywhatkit.playonyt(slots['query'])
+
+
+def handle_search(jarvis, slots):
+    """if command for google search"""
+    import pywhatkit                  # for more web automation (slow to import)
+    if skills.cancelled():
+        return
+    jarvis.talk("Okay boss, searching", start_expression=b'u', end_expression=b'h', fixed=True)  # Thinking expression
+    pywhatkit.search(slots['query'])
+    jarvis.express_after_speech(b'l')
+
+
+def handle_info(jarvis, slots):
+    """if command for getting info"""
+    # Topics looked up before are answered from the knowledge cache, even offline
+    if not jarvis.internet.online and not jarvis.knowledge.has(slots['query']):
+        jarvis.talk("I'm offline right now, so I can't look that up", end_expression=b's', fixed=True)  # Sad expression
+        return
+    jarvis.talk("Okay, I am right on it", start_expression=b'u', end_expression=b'u', fixed=True)
+    inf = jarvis.prefetcher.fetch('info', slots)
+    jarvis.talk(inf or "I couldn't find anything about that.")  # read from result
+
+
+def handle_open(jarvis, slots):
+    """if command for opening URLs"""
+    jarvis.talk("Opening, sir", start_expression=b'l', fixed=True)
+    url = f"http://{slots['site']}"   # make the URL
+    webbrowser.open(url)
+
+
+def handle_question(jarvis, slots):
+    """ generic questions - search the web for them """
+    if not jarvis.internet.online:
+        jarvis.talk("I'm offline right now, so I can't look that up", end_expression=b's', fixed=True)  # Sad expression
+        return
+    import pywhatkit                  # for more web automation (slow to import)
+    if skills.cancelled():
+        return
+    jarvis.talk("Let me look that up for you", start_expression=b'h', fixed=True)  # Thinking expression
+    pywhatkit.search(slots['query'])
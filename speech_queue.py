@@ -0,0 +1,200 @@
+"""
+Non-blocking speech output for Jarvis
+A dedicated worker thread speaks queued sentences in priority order, so the
+main loop can keep listening while Jarvis talks. Each queued sentence gets a
+handle the caller can wait on when ordering matters.
+"""
+
+import itertools                  # for FIFO order within a priority
+import queue                      # for the priority queue
+import threading                  # for the worker thread
+
+# Priorities (lower is spoken first)
+URGENT = 0
+NORMAL = 10
+IDLE = 100                        # only once nothing else is waiting
+
+
+class SpeechHandle(object):
+    """Tracks one queued utterance"""
+
+    def __init__(self, text, priority, on_start=None, on_end=None, on_cancel=None):
+        self.text = text
+        self.priority = priority
+        self.on_start = on_start
+        self.on_end = on_end
+        self.on_cancel = on_cancel
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.cancelled = False
+        self.success = False
+
+    def wait(self, timeout=None):
+        """Block until the utterance has finished or was cancelled"""
+        return self.done.wait(timeout)
+
+    def cancel(self):
+        """Skip this utterance, or stop it if it is being spoken"""
+        self.cancelled = True
+
+
+class SpeechQueue(object):
+    """Speaks queued sentences on a worker thread
+
+    speak(text, handle) does the actual synthesis and runs on the worker
+    thread; it should return True on success and check handle.cancelled
+    to stop early. setup() runs once on the worker thread before the
+    first sentence, which is where thread-bound engines must be created.
+    """
+
+    def __init__(self, speak, setup=None):
+        self.speak = speak
+        self.setup = setup
+        self.current = None
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._thread = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._pending = set()             # queued or speaking handles below IDLE priority
+        self._idle = threading.Condition()
+
+    def start(self):
+        """Start the worker thread if it isn't running yet"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, args=(self._generation,), name="speech", daemon=True)
+                self._thread.start()
+        return self
+
+    @property
+    def alive(self):
+        """True while the worker thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def restart(self):
+        """Abandon a stuck worker thread and start a fresh one
+
+        The old thread can't be killed; it exits as soon as its current
+        sentence returns, without touching the queue again.
+        """
+        current = self.current
+        if current:
+            current.cancel()
+            self._settle(current)  # abandoned with the old thread; nobody should wait for it
+        with self._lock:
+            self._generation += 1
+            self._thread = None
+            self.current = None
+        return self.start()
+
+    def say(self, text, priority=NORMAL, on_start=None, on_end=None, on_cancel=None):
+        """Queue text to be spoken and return its handle immediately
+
+        on_cancel runs instead of on_start/on_end if the utterance is
+        dropped before it starts.
+        """
+        handle = SpeechHandle(text, priority, on_start, on_end, on_cancel)
+        if priority < IDLE:
+            with self._idle:
+                self._pending.add(handle)
+        self.start()
+        self._queue.put((priority, next(self._order), handle))
+        return handle
+
+    def flush(self):
+        """Drop everything that hasn't started speaking yet"""
+        while True:
+            try:
+                _, _, handle = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if handle is None:
+                # Keep a pending stop() request in the queue
+                self._queue.put((float('inf'), next(self._order), None))
+                break
+            handle.cancel()
+            self._drop(handle)
+
+    def interrupt(self):
+        """Barge-in: stop the current utterance and drop the queue"""
+        self.flush()
+        current = self.current
+        if current:
+            current.cancel()
+
+    @property
+    def speaking(self):
+        """True while an utterance is being spoken or waiting in the queue
+
+        Background work queued at IDLE priority (rendering phrases) doesn't count.
+        """
+        with self._idle:
+            return bool(self._pending)
+
+    def wait_idle(self, timeout=None):
+        """Block until everything queued so far has been spoken (IDLE work isn't waited for)"""
+        with self._idle:
+            waiting = set(self._pending)
+            return self._idle.wait_for(lambda: not waiting & self._pending, timeout)
+
+    def stop(self):
+        """Finish the worker thread after the current utterance"""
+        self.flush()
+        self._queue.put((float('inf'), next(self._order), None))
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self, generation=0):
+        if self.setup:
+            try:
+                self.setup()
+            except Exception as e:
+                print(f"Speech setup failed: {e}")
+
+        while generation == self._generation:
+            _, _, handle = self._queue.get()
+            if handle is None:
+                break
+            if generation != self._generation:
+                # Replaced by restart() while waiting; give the entry to the new worker
+                self._queue.put((handle.priority, next(self._order), handle))
+                break
+            if handle.cancelled:
+                self._drop(handle)
+                continue
+
+            self.current = handle
+            try:
+                handle.started.set()
+                if handle.on_start:
+                    handle.on_start()
+                # Empty entries are markers that only run their callbacks in order
+                handle.success = bool(self.speak(handle.text, handle)) if handle.text else True
+            except Exception as e:
+                print(f"Speech output failed: {e}")
+            finally:
+                if generation == self._generation:
+                    self.current = None
+                try:
+                    if handle.on_end:
+                        handle.on_end()
+                finally:
+                    handle.done.set()
+                    self._settle(handle)
+
+    def _drop(self, handle):
+        try:
+            if handle.on_cancel:
+                handle.on_cancel()
+        except Exception as e:
+            print(f"Speech cancel callback failed: {e}")
+        finally:
+            handle.done.set()
+            self._settle(handle)
+
+    def _settle(self, handle):
+        with self._idle:
+            self._pending.discard(handle)
+            self._idle.notify_all()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Jarvis
+Cold-imports the command functions from main.py in a fresh interpreter with
+`python -X importtime` and fails if the import exceeds the time budget or
+loads any of the heavy libraries that should only be imported on first use.
+
+Usage:
+    python startup_benchmark.py [--budget-ms 150] [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# What a script like test_system_info.py imports
+IMPORT_STATEMENT = ("from main import get_system_info, get_battery_status, get_network_info, "
+                    "get_location_info, get_disk_space, get_weather_info")
+
+# Libraries (and the devices behind them) that must not load at import time
+HEAVY_MODULES = ["speech_recognition", "pyttsx3", "serial", "pywhatkit", "requests", "psutil", "numpy", "pyaudio"]
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_once():
+    """Import main in a fresh interpreter and return the parsed import times"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_STATEMENT],
+                            cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise RuntimeError("Importing main.py failed")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold import time of main.py")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="maximum median import time")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters to measure")
+    args = parser.parse_args()
+
+    print_header("Jarvis Startup Benchmark")
+
+    totals = []
+    modules = {}
+    for _ in range(args.runs):
+        modules = measure_once()
+        totals.append(modules.get("main", (0, 0))[1] / 1000.0)
+
+    median_ms = statistics.median(totals)
+    print(f"Cold import of main: median {median_ms:.1f} ms, min {min(totals):.1f} ms, max {max(totals):.1f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    print("\nSlowest imports (self time, last run):")
+    for name, (self_us, cumulative_us) in sorted(modules.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"  {self_us / 1000.0:7.2f} ms  {name}")
+
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    passed = True
+    if loaded:
+        passed = False
+        print(f"\n❌ Heavy libraries loaded at import time: {', '.join(loaded)}")
+    if median_ms > args.budget_ms:
+        passed = False
+        print(f"\n❌ Import took {median_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    if passed:
+        print("\n✅ Startup is within budget")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Chunked speech benchmark for Jarvis
+Measures time-to-first-audio of long multi-line answers spoken as one block
+(the whole answer is synthesized before anything plays) and chunk by chunk
+(the first sentence plays while the rest is synthesized). Needs a working
+voice engine; playback is skipped, so no speakers are required.
+
+Usage:
+    python streaming_benchmark.py [--runs 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import phrase_cache
+import streaming_tts
+import tts_engine
+
+ANSWERS = [
+    "Here are some things you can ask me:\n- What's the time?\n- What's the date today?\n"
+    "- What's the weather?\n- Where am I? / What's my location?\n- What's my battery status?\n"
+    "- What's my IP address? / Network info?\n- How much disk space do I have?\n"
+    "- Tell me a joke or fact\n- Play [song name] on YouTube\n- Search for [your query]\n"
+    "- Open [website.com]\n- What should I do today?",
+    "Total disk space: 252.0 GB\nUsed space: 17.7 GB\nFree space: 79.8 GB\nDisk usage: 7.0%",
+    "Computer name: jarvis\nOperating system: Linux 6.1\nProcessor: x86_64\n"
+    "Memory: 3.2 of 7.6 GB in use\nCPU load: 12%\nInternet: Connected\nIP address: 192.168.1.20",
+]
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def first_audio_as_block(engine, directory, text):
+    """Seconds until the whole answer is rendered, which is when a block starts playing"""
+    path = os.path.join(directory, "block" + phrase_cache.SUFFIX)
+    started = time.perf_counter()
+    engine.save_to_file(text, path)
+    engine.runAndWait()
+    return time.perf_counter() - started
+
+
+def first_audio_chunked(engine, text):
+    """Seconds until the first chunk starts playing through the chunk pipeline"""
+    def render(chunk, path):
+        engine.save_to_file(chunk, path)
+        engine.runAndWait()
+
+    pipeline = streaming_tts.ChunkPipeline(render, lambda path, cancelled: True)
+    pipeline.speak(streaming_tts.split_chunks(text))
+    return pipeline.first_audio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare time-to-first-audio of block and chunked answers")
+    parser.add_argument("--runs", type=int, default=3, help="times each answer is spoken per path")
+    args = parser.parse_args()
+
+    print_header("Jarvis Chunked Speech Benchmark")
+
+    try:
+        engine = tts_engine.EngineManager().get()
+    except Exception as e:
+        engine = None
+        print(f"Voice engine error: {e}")
+    if engine is None:
+        print("❌ No voice engine available, nothing to measure")
+        return 1
+
+    directory = tempfile.mkdtemp(prefix="jarvis_block_")
+    block, chunked = [], []
+    for _ in range(args.runs):
+        for text in ANSWERS:
+            block.append(first_audio_as_block(engine, directory, text))
+            chunked.append(first_audio_chunked(engine, text))
+
+    print(f"{'path':<14}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, times in (("block", block), ("chunked", chunked)):
+        ms = [t * 1000 for t in times]
+        print(f"{name:<14}{percentile(ms, 50):>10.1f}{percentile(ms, 95):>10.1f}{max(ms):>10.1f}")
+
+    passed = percentile(chunked, 50) < percentile(block, 50)
+    if passed:
+        print(f"\n✅ Chunked answers start {percentile(block, 50) / max(percentile(chunked, 50), 1e-6):.1f}x sooner")
+    else:
+        print("\n❌ Chunked answers didn't start sooner than whole blocks")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""
+Chunked speech for Jarvis
+Long answers (help text, disk and network reports, ...) are split into
+lines and sentences. The engine renders chunk N+1 to a file while chunk N
+plays, so the user hears the first sentence as soon as it is rendered
+instead of after the whole answer, and the rest can be cancelled.
+"""
+
+import os                         # for the chunk files
+import queue                      # for handing chunks to the player
+import re                         # for sentence boundaries
+import shutil                     # for removing the chunk directory
+import tempfile                   # for the chunk files
+import threading                  # for the player thread
+import time                       # for time-to-first-audio
+
+from phrase_cache import SUFFIX   # same format as the phrase recordings
+
+# A sentence ends at . ! or ? followed by whitespace; decimals like 7.0 GB stay together
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+MIN_CHUNK = 20                    # shorter sentences are merged with the next one
+LOOKAHEAD = 2                     # rendered chunks waiting for the player
+
+
+def split_chunks(text, min_chars=MIN_CHUNK):
+    """Split text into lines, then sentences, merging very short pieces"""
+    chunks = []
+    for line in text.splitlines():
+        for sentence in SENTENCE_END.split(line.strip()):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            if chunks and len(chunks[-1]) < min_chars:
+                chunks[-1] = chunks[-1] + " " + sentence
+            else:
+                chunks.append(sentence)
+    return chunks
+
+
+class ChunkPipeline(object):
+    """Renders chunks on the calling thread and plays them on a player thread
+
+    render(text, path) writes one chunk to path (it runs on the calling
+    thread, which must own the TTS engine) and play(path, cancelled)
+    plays it. speak() returns once everything was played or cancelled.
+    """
+
+    def __init__(self, render, play, lookahead=LOOKAHEAD):
+        self.render = render
+        self.play = play
+        self.lookahead = lookahead
+        self.first_audio = None       # seconds from speak() to the first chunk starting
+        self.chunks_played = 0
+
+    def speak(self, chunks, cancelled=None):
+        cancelled = cancelled or (lambda: False)
+        started = time.perf_counter()
+        self.first_audio = None
+        self.chunks_played = 0
+        ready = queue.Queue(self.lookahead)
+        errors = []
+        directory = tempfile.mkdtemp(prefix="jarvis_chunks_")
+
+        def player():
+            while True:
+                path = ready.get()
+                if path is None:
+                    break
+                if cancelled() or errors:
+                    continue  # drain, so the renderer never blocks on a full queue
+                if self.first_audio is None:
+                    self.first_audio = time.perf_counter() - started
+                try:
+                    self.play(path, cancelled)
+                    self.chunks_played += 1
+                except Exception as e:
+                    errors.append(e)
+
+        thread = threading.Thread(target=player, name="speech-player", daemon=True)
+        thread.start()
+        try:
+            for index, chunk in enumerate(chunks):
+                if cancelled() or errors:
+                    break
+                path = os.path.join(directory, f"{index}{SUFFIX}")
+                self.render(chunk, path)
+                ready.put(path)
+        finally:
+            ready.put(None)
+            thread.join()
+            shutil.rmtree(directory, ignore_errors=True)
+        if errors:
+            raise errors[0]
+        return not cancelled()
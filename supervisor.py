@@ -0,0 +1,166 @@
+"""
+Health supervisor for Jarvis
+Tracks liveness and latency of each subsystem and restarts only the one
+that missed its heartbeat, hung or got slower than its latency target,
+instead of resetting everything on a timer. Restarts are counted with
+their causes.
+"""
+
+import collections                # for latency windows and restart history
+import contextlib                 # for track()
+import math                       # for percentiles
+import threading                  # for the lock
+import time                       # for heartbeats
+
+
+class Component(object):
+    """Health state of one supervised subsystem"""
+
+    def __init__(self, name, restart, check=None, heartbeat_timeout=None, hang_timeout=None,
+                 slo=None, window=20, min_samples=5):
+        self.name = name
+        self.restart = restart                      # recreates the subsystem
+        self.check = check                          # returns a cause string when unhealthy
+        self.heartbeat_timeout = heartbeat_timeout  # seconds without a heartbeat
+        self.hang_timeout = hang_timeout            # seconds a single tracked call may take
+        self.slo = slo                              # p95 latency target in seconds
+        self.min_samples = min_samples
+        self.latencies = collections.deque(maxlen=window)
+        self.last_heartbeat = time.time()
+        self.busy = {}                              # tracked calls in progress: token -> start time
+        self.restarts = 0
+        self.causes = collections.Counter()
+        self.last_cause = None
+        self.last_restart = 0.0
+
+    def p95(self):
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[max(1, int(math.ceil(0.95 * len(ordered)))) - 1]
+
+    def diagnose(self, now):
+        """(kind, cause) of why this component needs a restart, or None if it is healthy"""
+        if self.check:
+            try:
+                cause = self.check()
+            except Exception as e:
+                cause = f"health check failed: {e}"
+            if cause:
+                return cause, cause
+        if self.heartbeat_timeout and now - self.last_heartbeat > self.heartbeat_timeout:
+            return "heartbeat", f"no heartbeat for {now - self.last_heartbeat:.0f} s"
+        if self.hang_timeout and self.busy:
+            running = now - min(self.busy.values())
+            if running > self.hang_timeout:
+                return "hang", f"call hung for {running:.0f} s"
+        if self.slo and len(self.latencies) >= self.min_samples:
+            p95 = self.p95()
+            if p95 > self.slo:
+                return "latency", f"p95 latency {p95 * 1000:.0f} ms over the {self.slo * 1000:.0f} ms target"
+        return None
+
+
+class Supervisor(object):
+    """Runs health checks and restarts unhealthy components
+
+    Components report in with heartbeat(), observe() or track(); call
+    check() periodically to diagnose and restart them. A component is
+    restarted at most once per cooldown, so a slow network can't cause a
+    restart loop.
+    """
+
+    def __init__(self, cooldown=30.0, history=50):
+        self.cooldown = cooldown
+        self.components = collections.OrderedDict()
+        self.events = collections.deque(maxlen=history)  # (time, name, cause)
+        self._lock = threading.Lock()
+
+    def register(self, name, restart, **kwargs):
+        """Supervise a subsystem; see Component for the health options"""
+        component = Component(name, restart, **kwargs)
+        self.components[name] = component
+        return component
+
+    def heartbeat(self, name):
+        component = self.components.get(name)
+        if component:
+            component.last_heartbeat = time.time()
+
+    def observe(self, name, seconds):
+        """Record how long a call took; also counts as a heartbeat"""
+        component = self.components.get(name)
+        if component:
+            with self._lock:
+                component.latencies.append(seconds)
+            component.last_heartbeat = time.time()
+
+    @contextlib.contextmanager
+    def track(self, name):
+        """Time a call and flag it as hung if it runs past hang_timeout"""
+        component = self.components.get(name)
+        token = object()
+        started = time.time()
+        if component:
+            component.busy[token] = started
+        try:
+            yield
+        finally:
+            # A call that outlived a restart belongs to the old instance, so it isn't counted
+            if component and component.busy.pop(token, None) is not None:
+                self.observe(name, time.time() - started)
+
+    def check(self):
+        """Diagnose every component and restart the unhealthy ones; returns [(name, cause)]"""
+        now = time.time()
+        restarted = []
+        for component in list(self.components.values()):
+            problem = component.diagnose(now)
+            if problem and now - component.last_restart >= self.cooldown:
+                kind, cause = problem
+                self.restart(component.name, cause, kind)
+                restarted.append((component.name, cause))
+        return restarted
+
+    def restart(self, name, cause, kind=None):
+        """Restart one component and record why; causes are counted by kind"""
+        component = self.components[name]
+        print(f"\n🩺 Restarting {name}: {cause}")
+        now = time.time()
+        with self._lock:
+            component.restarts += 1
+            component.causes[kind or cause] += 1
+            component.last_cause = cause
+            component.last_restart = now
+            component.latencies.clear()
+            # Calls stuck in the old instance are abandoned with it
+            component.busy.clear()
+            component.last_heartbeat = now
+            self.events.append((now, name, cause))
+        try:
+            component.restart()
+        except Exception as e:
+            print(f"Restarting {name} failed: {e}")
+
+    def status(self):
+        """Health, latency and restart counts per component"""
+        now = time.time()
+        report = collections.OrderedDict()
+        for name, component in self.components.items():
+            p95 = component.p95()
+            report[name] = {
+                'healthy': component.diagnose(now) is None,
+                'restarts': component.restarts,
+                'causes': dict(component.causes),
+                'last_cause': component.last_cause,
+                'heartbeat_age': now - component.last_heartbeat,
+                'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+            }
+        return report
+
+    def format_status(self):
+        lines = ["Component health:", f"  {'component':<12}{'restarts':>9}{'p95 ms':>9}  last cause"]
+        for name, state in self.status().items():
+            p95 = f"{state['p95_ms']:.0f}" if state['p95_ms'] is not None else "-"
+            lines.append(f"  {name:<12}{state['restarts']:>9}{p95:>9}  {state['last_cause'] or '-'}")
+        return "\n".join(lines)
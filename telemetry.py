@@ -0,0 +1,208 @@
+"""
+System telemetry for Jarvis
+Battery, network, disk, memory and CPU readings from psutil, with /proc
+and /sys fallbacks on Linux. Every metric is cached for its own TTL and a
+background sampler keeps the cache warm, so spoken answers come from a
+snapshot instead of a process spawn.
+"""
+
+import collections                # for the metric types
+import glob                       # for /sys/class/power_supply
+import os                         # for load average and /proc
+import shutil                     # for disk usage
+import socket                     # for hostname and local address
+import threading                  # for the sampler
+import time                       # for cache ages
+
+# How long each reading stays fresh (seconds)
+METRIC_TTL = {
+    'battery': 30,
+    'network': 10,
+    'disk': 60,
+    'memory': 5,
+    'cpu': 5,
+}
+
+Battery = collections.namedtuple('Battery', ['percent', 'plugged', 'seconds_left'])
+Network = collections.namedtuple('Network', ['online', 'hostname', 'ip_address', 'interface'])
+Disk = collections.namedtuple('Disk', ['total', 'used', 'free', 'percent'])
+Memory = collections.namedtuple('Memory', ['total', 'available', 'percent'])
+Cpu = collections.namedtuple('Cpu', ['percent', 'load_average', 'count'])
+
+POWER_SUPPLY = "/sys/class/power_supply"
+
+
+def _psutil():
+    """psutil if it is installed, else None (the /proc and /sys readers are used)"""
+    try:
+        import psutil                 # cross-platform system metrics
+        return psutil
+    except ImportError:
+        return None
+
+
+def _read_text(path):
+    with open(path) as f:
+        return f.read().strip()
+
+
+def read_battery():
+    """Battery charge, or None on machines without one"""
+    psutil = _psutil()
+    if psutil and hasattr(psutil, 'sensors_battery'):
+        battery = psutil.sensors_battery()
+        if battery is None:
+            return None
+        seconds = battery.secsleft if battery.secsleft not in (psutil.POWER_TIME_UNKNOWN, psutil.POWER_TIME_UNLIMITED) else None
+        return Battery(round(battery.percent), bool(battery.power_plugged), seconds)
+
+    for path in sorted(glob.glob(os.path.join(POWER_SUPPLY, "BAT*"))):
+        try:
+            percent = int(_read_text(os.path.join(path, "capacity")))
+            status = _read_text(os.path.join(path, "status"))
+        except (OSError, ValueError):
+            continue
+        seconds = None
+        try:
+            energy = float(_read_text(os.path.join(path, "energy_now")))
+            power = float(_read_text(os.path.join(path, "power_now")))
+            if power > 0 and status == "Discharging":
+                seconds = int(energy / power * 3600)
+        except (OSError, ValueError):
+            pass
+        return Battery(percent, status != "Discharging", seconds)
+    return None
+
+
+def local_address():
+    """The address of the interface that routes to the internet, or None when there is no route
+
+    Connecting a UDP socket only picks a route; no packet is sent.
+    """
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.connect(("8.8.8.8", 80))
+        return probe.getsockname()[0]
+    except OSError:
+        return None
+    finally:
+        probe.close()
+
+
+def read_network():
+    """Hostname, local address and whether any interface has a route out"""
+    address = local_address()
+    interface = None
+    psutil = _psutil()
+    if psutil and address:
+        for name, addresses in psutil.net_if_addrs().items():
+            if any(a.address == address for a in addresses):
+                interface = name
+                break
+    return Network(address is not None, socket.gethostname(), address, interface)
+
+
+def read_disk(path="/"):
+    total, used, free = shutil.disk_usage(path)
+    return Disk(total, used, free, used / float(total) * 100 if total else 0.0)
+
+
+def read_memory():
+    psutil = _psutil()
+    if psutil:
+        memory = psutil.virtual_memory()
+        return Memory(memory.total, memory.available, memory.percent)
+    values = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            values[key] = int(rest.split()[0]) * 1024
+    total, available = values['MemTotal'], values.get('MemAvailable', values.get('MemFree', 0))
+    return Memory(total, available, (total - available) / float(total) * 100)
+
+
+def read_cpu():
+    psutil = _psutil()
+    load = os.getloadavg() if hasattr(os, 'getloadavg') else None
+    # cpu_percent(None) compares with the previous call, which the sampler makes regularly
+    percent = psutil.cpu_percent(None) if psutil else None
+    return Cpu(percent, load, os.cpu_count())
+
+
+READERS = {
+    'battery': read_battery,
+    'network': read_network,
+    'disk': read_disk,
+    'memory': read_memory,
+    'cpu': read_cpu,
+}
+
+
+class Telemetry(object):
+    """Per-metric TTL cache over the readers, optionally kept warm by a sampler thread"""
+
+    def __init__(self, readers=None, ttl=None):
+        self.readers = dict(READERS)
+        self.readers.update(readers or {})
+        self.ttl = dict(METRIC_TTL)
+        self.ttl.update(ttl or {})
+        self.values = {}              # metric -> (value, read_at)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._failing = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def get(self, metric):
+        """The latest reading of a metric, read now if the cached one is too old"""
+        cached = self.values.get(metric)
+        if cached and time.time() - cached[1] < self.ttl.get(metric, 0):
+            self.hits += 1
+            return cached[0]
+        self.misses += 1
+        return self.read(metric)
+
+    def read(self, metric):
+        """Read a metric now and cache it"""
+        value = self.readers[metric]()
+        with self._lock:
+            self.values[metric] = (value, time.time())
+        return value
+
+    def snapshot(self):
+        """Every metric, from the cache where it is fresh"""
+        return dict((metric, self.get(metric)) for metric in self.readers)
+
+    def start(self, interval=2.0):
+        """Refresh metrics in the background before they expire"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._sample, args=(interval,), name="telemetry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _sample(self, interval):
+        while not self._stopping.is_set():
+            now = time.time()
+            for metric in self.readers:
+                cached = self.values.get(metric)
+                # Refresh a little early so get() never finds it expired
+                if cached and now - cached[1] < self.ttl.get(metric, 0) - interval * 2:
+                    continue
+                try:
+                    self.read(metric)
+                    self._failing.discard(metric)
+                except Exception as e:
+                    self.errors += 1
+                    if metric not in self._failing:
+                        self._failing.add(metric)
+                        print(f"Reading {metric} failed: {e}")
+            self._stopping.wait(interval)
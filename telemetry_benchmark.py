@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Telemetry microbenchmark for Jarvis
+Times the old battery and network lookups (pmset, airport and a TCP
+connection to www.google.com) against the telemetry module, both reading
+fresh and answering from the warm cache the sampler keeps.
+
+Usage:
+    python telemetry_benchmark.py [--runs 20]
+"""
+
+import argparse
+import re
+import socket
+import subprocess
+import time
+
+import telemetry
+
+AIRPORT = "/System/Library/PrivateFrameworks/Apple80211.framework/Versions/Current/Resources/airport"
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def old_battery():
+    """The battery lookup main.py used before: spawn pmset and parse it"""
+    output = subprocess.run(['pmset', '-g', 'batt'], capture_output=True, text=True).stdout
+    return re.search(r'(\d+)%', output)
+
+
+def old_network():
+    """The network lookup main.py used before (with a timeout added, it had none)"""
+    socket.create_connection(("www.google.com", 80), timeout=5).close()
+    ip_address = socket.gethostbyname(socket.gethostname())
+    output = subprocess.run([AIRPORT, '-I'], capture_output=True, text=True).stdout
+    return ip_address, re.search(r' SSID: (.+)', output)
+
+
+def spawn_only():
+    """The floor of any subprocess lookup: start a process that does nothing"""
+    subprocess.run(['true'], capture_output=True)
+
+
+def time_calls(fn, runs):
+    """Per-call times in seconds, and the first error if the call fails on this machine"""
+    times, error = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            error = error or e
+        times.append(time.perf_counter() - started)
+    return times, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the old subprocess lookups with the telemetry cache")
+    parser.add_argument("--runs", type=int, default=20, help="calls per measurement")
+    args = parser.parse_args()
+
+    print_header("Jarvis Telemetry Benchmark")
+
+    sensors = telemetry.Telemetry()
+    sensors.snapshot()  # the sampler would have done this long before the first question
+    cases = [
+        ("process spawn (floor)", spawn_only),
+        ("battery: pmset (old)", old_battery),
+        ("battery: read", lambda: sensors.read('battery')),
+        ("battery: cached", lambda: sensors.get('battery')),
+        ("network: airport+tcp (old)", old_network),
+        ("network: read", lambda: sensors.read('network')),
+        ("network: cached", lambda: sensors.get('network')),
+        ("disk: read", lambda: sensors.read('disk')),
+        ("memory: read", lambda: sensors.read('memory')),
+        ("cpu: read", lambda: sensors.read('cpu')),
+    ]
+
+    print(f"{'lookup':<28}{'p50 us':>12}{'p95 us':>12}  note")
+    medians = {}
+    for name, fn in cases:
+        times, error = time_calls(fn, args.runs)
+        medians[name] = percentile(times, 50)
+        note = f"fails here: {type(error).__name__}" if error else ""
+        print(f"{name:<28}{percentile(times, 50) * 1e6:>12.1f}{percentile(times, 95) * 1e6:>12.1f}  {note}")
+
+    passed = all(medians[f"{metric}: cached"] < 0.001 for metric in ("battery", "network"))
+    # Where pmset doesn't exist the old lookup fails before spawning, so compare with a real spawn
+    spawn = max(medians["battery: pmset (old)"], medians["process spawn (floor)"])
+    speedup = spawn / max(medians["battery: cached"], 1e-9)
+    print(f"\nCached battery answer is {speedup:,.0f}x faster than spawning a process")
+    if passed:
+        print("✅ Cached answers take well under a millisecond")
+    else:
+        print("❌ Cached answers took over a millisecond")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
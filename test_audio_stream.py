@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis microphone buffer
+Feeds synthetic frames through a fake microphone and checks the ring
+buffer (oldest frames dropped, unread and discard), and that calibration
+only learns from frames it hasn't seen before.
+"""
+
+import queue
+import struct
+import time
+
+import speech_recognition as sr
+
+from audio_stream import BufferedMicrophone
+
+SAMPLE_RATE = 16000
+CHUNK = 1600                      # 0.1 s per frame
+
+
+def frame(level):
+    """A frame of 16-bit samples whose RMS energy is level"""
+    return struct.pack('<h', level) * CHUNK
+
+
+class FakeStream(object):
+    """Hands out the frames the test feeds it"""
+
+    def __init__(self):
+        self.pending = queue.Queue()
+        self.open = True
+
+    def read(self, size):
+        while self.open:
+            try:
+                return self.pending.get(timeout=0.01)
+            except queue.Empty:
+                pass
+        time.sleep(0.01)
+        return b""
+
+
+class FakeMicrophone(object):
+    """Stands in for sr.Microphone, which needs PyAudio and a device"""
+
+    SAMPLE_RATE = SAMPLE_RATE
+    SAMPLE_WIDTH = 2
+    CHUNK = CHUNK
+
+    def __init__(self):
+        self.stream = None
+
+    def __enter__(self):
+        self.stream = FakeStream()
+        return self
+
+    def __exit__(self, *args):
+        self.stream = None
+
+
+def start_microphone(**kwargs):
+    return BufferedMicrophone(microphone=FakeMicrophone(), **kwargs).start()
+
+
+def feed(source, *frames):
+    """Feed frames and wait until the capture thread has buffered them"""
+    expected = source.captured_frames + len(frames)
+    for data in frames:
+        source.microphone.stream.pending.put(data)
+    for _ in range(200):
+        if source.captured_frames >= expected:
+            return
+        time.sleep(0.005)
+    raise AssertionError("the capture thread didn't read the frames")
+
+
+def stop_microphone(source):
+    source.microphone.stream.open = False
+    source.stop()
+
+
+def test_ring_buffer_keeps_the_newest_frames():
+    source = start_microphone(buffer_seconds=1)  # room for 10 frames
+    try:
+        feed(source, *[frame(level) for level in range(1, 16)])
+        assert len(source.frames) == 10 and source.dropped_frames == 5
+        assert source.read_frame() == frame(6), "the five oldest frames were dropped"
+        source.unread([frame(6)])
+        assert source.stream.read(CHUNK) == frame(6)
+        source.discard_pending()
+        assert source.read_frame(timeout=0.05) == b""
+    finally:
+        stop_microphone(source)
+    assert not source.alive
+    assert source.read_frame(timeout=0.05) == b""
+
+
+def test_calibration_only_uses_new_frames():
+    source = start_microphone(calibration_seconds=0.5)  # the last 5 frames
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold = 300
+    try:
+        assert source.calibrate(recognizer) == 300, "nothing captured yet"
+        feed(source, *[frame(100)] * 8)
+        quiet = source.calibrate(recognizer)
+        assert quiet < 300
+        assert source.calibrate(recognizer) == quiet, "the same frames were used again"
+
+        feed(source, *[frame(5000)] * 3)
+        assert source.calibrate(recognizer) == quiet, "speech doesn't move the threshold"
+
+        feed(source, frame(100))
+        lower = source.calibrate(recognizer)
+        assert 150 < lower < quiet, "one new quiet frame moves it a little closer"
+    finally:
+        stop_microphone(source)
+
+
+def main():
+    """Run all microphone buffer tests and print a summary"""
+    print("\n🧪 JARVIS AUDIO STREAM TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_ring_buffer_keeps_the_newest_frames,
+        test_calibration_only_uses_new_frames,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis command log
+Checks batched writing, rotation, pruning and the streaming latency
+reader against log files in a temporary directory.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from command_log import CommandLog, LatencyHistogram, iter_records, latency_report, rotated_files
+
+
+def make_log(**kwargs):
+    path = os.path.join(tempfile.mkdtemp(), "command_log.jsonl")
+    return CommandLog(path, flush_interval=0.05, **kwargs)
+
+
+def test_records_are_written_as_json_lines():
+    log = make_log()
+    log.write({'transcript': "jarvis what time is it", 'intent': 'time', 'handler_ms': 3.2})
+    log.close()
+    with open(log.path) as f:
+        record = json.loads(f.readline())
+    assert record['intent'] == 'time' and record['handler_ms'] == 3.2 and 'ts' in record
+
+
+def test_write_never_blocks_when_queue_is_full():
+    log = make_log(queue_size=5)
+    log._thread = object()  # pretend the writer is busy so nothing drains
+    log.start = lambda: log
+    started = time.time()
+    results = [log.write({'i': i}) for i in range(20)]
+    assert time.time() - started < 0.1
+    assert results.count(True) == 5 and log.dropped == 15
+
+
+def test_log_rotates_by_size_and_prunes_old_files():
+    log = make_log(max_bytes=200, backup_count=3)
+    for i in range(40):
+        log.write({'transcript': f"jarvis command number {i}", 'intent': 'time'})
+        if i % 5 == 4:
+            time.sleep(0.1)  # let each batch land in its own write
+    log.close()
+    assert log.rotations >= 3
+    assert len(rotated_files(log.path)) == 3
+    assert sum(1 for _ in iter_records(log.path)) < 40  # the oldest files were pruned
+
+
+def test_log_rotates_by_age():
+    log = make_log(rotate_seconds=0.2)
+    log.write({'intent': 'time'})
+    time.sleep(0.3)
+    log.write({'intent': 'date'})
+    log.close()
+    assert log.rotations == 1
+    assert [r['intent'] for r in iter_records(log.path)] == ['time', 'date']
+
+
+def test_percentiles_are_close_to_exact():
+    histogram = LatencyHistogram()
+    values = [float(v) for v in range(1, 1001)]
+    for value in values:
+        histogram.add(value)
+    for p, exact in ((50, 500), (95, 950), (99, 990)):
+        assert abs(histogram.percentile(p) - exact) / exact < 0.05, (p, histogram.percentile(p))
+    assert histogram.percentile(100) == 1000
+
+
+def test_report_streams_and_filters_records():
+    log = make_log()
+    for i in range(100):
+        log.write({'intent': 'weather' if i % 2 else 'time', 'handler_ms': float(i), 'tts_ms': 10.0})
+    log.close()
+    report = latency_report(iter_records(log.path), intent='weather')
+    assert report['handler_ms'].count == 50
+    assert report['tts_ms'].percentile(50) == 10.0
+    assert report['recognizer_ms'].count == 0
+
+
+def main():
+    """Run all command log tests and print a summary"""
+    print("\n🧪 JARVIS COMMAND LOG TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_records_are_written_as_json_lines,
+        test_write_never_blocks_when_queue_is_full,
+        test_log_rotates_by_size_and_prunes_old_files,
+        test_log_rotates_by_age,
+        test_percentiles_are_close_to_exact,
+        test_report_streams_and_filters_records,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
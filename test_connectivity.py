@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis connectivity monitor
+Probes a local stand-in server instead of the internet and checks the
+hysteresis, and that lookups go offline at once while it is down.
+"""
+
+import socket
+import time
+
+import connectivity
+import http_client
+import recognizers
+
+
+class StandIn(object):
+    """A local TCP server standing in for the probe target"""
+
+    def __init__(self):
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(16)
+        self.target = self.server.getsockname()
+
+    def close(self):
+        self.server.close()
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_probe_target_setting():
+    assert connectivity.probe_target("127.0.0.1:8080") == ("127.0.0.1", 8080)
+    assert connectivity.probe_target("example.com") == ("example.com", 80)
+
+
+def test_hysteresis_needs_a_streak():
+    monitor = connectivity.ConnectivityMonitor(target=("127.0.0.1", 1), up_after=2, down_after=3)
+    assert monitor.online and monitor.state == connectivity.UNKNOWN
+    assert monitor.record(True) == connectivity.ONLINE
+    assert monitor.record(False) == connectivity.ONLINE
+    assert monitor.record(False) == connectivity.ONLINE
+    monitor.record(True)  # a good probe resets the streak
+    for _ in range(2):
+        monitor.record(False)
+    assert monitor.online
+    monitor.record(False)
+    assert not monitor.online
+    monitor.record(True)
+    assert not monitor.online
+    monitor.record(True)
+    assert monitor.online and monitor.transitions == 3
+
+
+def test_monitor_follows_the_stand_in():
+    stand_in = StandIn()
+    monitor = connectivity.ConnectivityMonitor(target=stand_in.target, interval=0.02, offline_interval=0.02,
+                                               timeout=0.2, down_after=2)
+    changes = []
+    monitor.listeners.append(changes.append)
+    monitor.start()
+    try:
+        assert wait_for(lambda: monitor.state == connectivity.ONLINE)
+        stand_in.close()
+        assert wait_for(lambda: monitor.state == connectivity.OFFLINE)
+        assert changes == [True, False]
+        assert monitor.failures >= 2
+    finally:
+        monitor.stop()
+
+
+def test_http_answers_from_cache_while_offline():
+    client = http_client.HttpClient()
+    online = [True]
+    client.online = lambda: online[0]
+    cached = http_client.HttpResult(200, "sunny", time.time() - 3600 * 24, False)
+    client.cache[("http://weather.test/", ())] = cached
+    online[0] = False
+    started = time.time()
+    assert client.get("http://weather.test/", endpoint='weather').text == "sunny"
+    try:
+        client.get("http://other.test/")
+        raise AssertionError("expected OfflineError")
+    except http_client.OfflineError:
+        pass
+    assert time.time() - started < 0.1
+
+
+def test_recognizer_goes_offline_at_once():
+    import speech_recognition as sr
+
+    class OnlineStub(recognizers.StubBackend):
+        needs_network = True
+
+    online = OnlineStub(default="online answer")
+    offline = recognizers.StubBackend(default="offline answer")
+    service = recognizers.RecognitionService(online, offline, online=lambda: False)
+    audio = sr.AudioData(b"\0" * 3200, 16000, 2)
+    assert service.recognize(None, audio) == "offline answer"
+    assert online.calls == 0 and service.last_backend == "stub"
+
+
+def main():
+    """Run all connectivity tests and print a summary"""
+    print("\n🧪 JARVIS CONNECTIVITY TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_probe_target_setting,
+        test_hysteresis_needs_a_streak,
+        test_monitor_follows_the_stand_in,
+        test_http_answers_from_cache_while_offline,
+        test_recognizer_goes_offline_at_once,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
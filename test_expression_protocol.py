@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis expression protocol
+Checks the frame encoder and the stream decoder: round trips, split
+reads, corrupt frames, legacy traffic mixed with frames and the limits.
+"""
+
+import random
+
+import expression_protocol as protocol
+
+
+def test_crc8_matches_the_reference_value():
+    # CRC-8/SMBUS check value for "123456789"
+    assert protocol.crc8(b"123456789") == 0xF4
+
+
+def test_commands_round_trip():
+    commands = [(b'p', 500), (b'h', 0), (b'U', 65535)]
+    frame = protocol.encode_commands(7, commands)
+    assert frame[0] == protocol.START and frame[1] == 7 and frame[2] == 9
+    events = protocol.Decoder(legacy='bytes').feed(frame)
+    assert events == [('frame', protocol.Frame(7, frame[3:-1]))]
+    assert protocol.decode_commands(events[0][1].payload) == commands
+
+
+def test_frames_split_across_reads_are_reassembled():
+    data = b"".join(protocol.encode_commands(seq, [(b'a', seq)]) for seq in range(1, 20))
+    decoder = protocol.Decoder(legacy='bytes')
+    events = []
+    for i in range(len(data)):
+        events += decoder.feed(data[i:i + 1])
+    assert [frame.seq for kind, frame in events] == list(range(1, 20))
+
+
+def test_corrupt_frame_is_reported_and_skipped():
+    good = protocol.encode_commands(2, [(b's', 0)])
+    bad = bytearray(protocol.encode_commands(1, [(b'p', 0)]))
+    bad[4] ^= 0x10
+    events = protocol.Decoder(legacy='bytes').feed(bytes(bad) + good)
+    assert events[0] == ('error', (1, "bad checksum"))
+    assert events[1][0] == 'frame' and events[1][1].seq == 2
+
+
+def test_legacy_traffic_mixes_with_frames():
+    ack = protocol.encode_ack(3)
+    events = protocol.Decoder().feed(b"Happy!\r\n" + ack + b"Thinking!\r\nSad")
+    assert events == [('line', "Happy!"), ('frame', protocol.Frame(3, b"\x00")), ('line', "Thinking!")]
+    events = protocol.Decoder(legacy='bytes').feed(b"p" + protocol.encode_commands(4, [(b'h', 0)]) + b"l")
+    assert [kind for kind, _ in events] == ['byte', 'frame', 'byte']
+
+
+def test_random_noise_never_decodes_as_a_frame():
+    random.seed(1)
+    decoder = protocol.Decoder(legacy='bytes')
+    noise = bytes(random.randrange(256) for _ in range(20000))
+    frames = [value for kind, value in decoder.feed(noise) if kind == 'frame']
+    assert len(frames) < 5  # an 8-bit checksum lets about 1 in 256 false starts through
+
+
+def test_limits_are_enforced():
+    for commands in ([], [(b'p', 0)] * (protocol.MAX_COMMANDS + 1)):
+        try:
+            protocol.encode_commands(1, commands)
+            assert False, "expected a ValueError"
+        except ValueError:
+            pass
+    assert len(protocol.encode_commands(1, [(b'p', 0)] * protocol.MAX_COMMANDS)) <= 64
+
+
+def test_probe_is_harmless_to_legacy_sketches():
+    # Old sketches treat every byte as a command; none may trigger an expression
+    assert not any(bytes((byte,)) in b"ulUpsha" for byte in protocol.probe_frame())
+
+
+def main():
+    """Run all expression protocol tests and print a summary"""
+    print("\n🧪 JARVIS EXPRESSION PROTOCOL TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_crc8_matches_the_reference_value,
+        test_commands_round_trip,
+        test_frames_split_across_reads_are_reassembled,
+        test_corrupt_frame_is_reported_and_skipped,
+        test_legacy_traffic_mixes_with_frames,
+        test_random_noise_never_decodes_as_a_frame,
+        test_limits_are_enforced,
+        test_probe_is_harmless_to_legacy_sketches,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
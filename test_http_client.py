@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis HTTP client
+Runs HttpClient against a local stub HTTP server to check caching,
+stale-while-revalidate, timeouts, retries and connection reuse without
+touching wttr.in or ipinfo.io.
+"""
+
+import http.server
+import threading
+import time
+
+from http_client import HttpClient
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """Answers /weather, /slow, /flaky and /down like a tiny fake API"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        server.client_ports.add(self.client_address[1])
+
+        if self.path == "/slow":
+            time.sleep(2)
+        if self.path == "/flaky" and server.hits[self.path] <= 2:
+            return self.reply(503, "try again")
+        if self.path == "/down" or server.down:
+            return self.reply(500, "broken")
+        self.reply(200, f"{server.body} #{server.hits[self.path]}")
+
+    def reply(self, status, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server():
+    """Start the stub server on a free local port"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.hits = {}
+    server.client_ports = set()
+    server.body = "Sunny +21C"
+    server.down = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_client(ttl=60, stale_ttl=60, timeout=(1, 0.5)):
+    return HttpClient(endpoints={'weather': {'timeout': timeout, 'ttl': ttl, 'stale_ttl': stale_ttl}},
+                      retries=2, backoff_factor=0)
+
+
+def test_fresh_answers_come_from_cache():
+    server, url = start_stub_server()
+    client = make_client()
+    first = client.get(url + "/weather", endpoint='weather')
+    second = client.get(url + "/weather", endpoint='weather')
+    assert first.text == second.text == "Sunny +21C #1"
+    assert second.from_cache and server.hits["/weather"] == 1
+    server.shutdown()
+
+
+def test_stale_answer_is_served_while_refreshing():
+    server, url = start_stub_server()
+    client = make_client(ttl=0.2, stale_ttl=60)
+    client.get(url + "/weather", endpoint='weather')
+    time.sleep(0.3)
+    stale = client.get(url + "/weather", endpoint='weather')
+    assert stale.text == "Sunny +21C #1" and stale.from_cache
+    for _ in range(50):
+        if server.hits.get("/weather") == 2 and client.get(url + "/weather", endpoint='weather').text.endswith("#2"):
+            break
+        time.sleep(0.05)
+    assert client.get(url + "/weather", endpoint='weather').text == "Sunny +21C #2"
+    server.shutdown()
+
+
+def test_read_timeout_does_not_hang():
+    server, url = start_stub_server()
+    client = HttpClient(endpoints={'weather': {'timeout': (1, 0.3), 'ttl': 0, 'stale_ttl': 0}},
+                        retries=0, backoff_factor=0)
+    started = time.time()
+    try:
+        client.get(url + "/slow", endpoint='weather')
+        assert False, "expected a timeout"
+    except Exception as e:
+        assert "timed out" in str(e).lower() or "timeout" in type(e).__name__.lower(), e
+    assert time.time() - started < 1.5
+    server.shutdown()
+
+
+def test_server_errors_are_retried():
+    server, url = start_stub_server()
+    client = make_client(ttl=0, stale_ttl=0)
+    result = client.get(url + "/flaky")
+    assert result.status_code == 200 and server.hits["/flaky"] == 3
+    server.shutdown()
+
+
+def test_cached_answer_survives_an_outage():
+    server, url = start_stub_server()
+    client = make_client(ttl=0.1, stale_ttl=0)
+    client.get(url + "/weather", endpoint='weather')
+    server.down = True
+    time.sleep(0.2)
+    result = client.get(url + "/weather", endpoint='weather')
+    assert result.from_cache and result.text == "Sunny +21C #1"
+    server.shutdown()
+
+
+def test_connection_is_kept_alive():
+    server, url = start_stub_server()
+    client = make_client(ttl=0, stale_ttl=0)
+    for _ in range(5):
+        client.get(url + "/weather")
+    assert server.hits["/weather"] == 5
+    assert len(server.client_ports) == 1, server.client_ports
+    server.shutdown()
+
+
+def main():
+    """Run all HTTP client tests and print a summary"""
+    print("\n🧪 JARVIS HTTP CLIENT TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_fresh_answers_come_from_cache,
+        test_stale_answer_is_served_while_refreshing,
+        test_read_timeout_does_not_hang,
+        test_server_errors_are_retried,
+        test_cached_answer_survives_an_outage,
+        test_connection_is_kept_alive,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
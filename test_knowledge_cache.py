@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis knowledge cache
+Checks that answers are shared by differently worded requests but not by
+different questions, survive a restart, expire (except while offline), are
+evicted least recently used first, and that the hit rate is counted.
+"""
+
+import os
+import tempfile
+
+import knowledge_cache
+from knowledge_cache import KnowledgeCache, normalize
+
+
+class Clock(object):
+    """A clock the test moves by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(**kwargs):
+    path = os.path.join(tempfile.mkdtemp(), "knowledge.sqlite3")
+    clock = Clock()
+    return KnowledgeCache(path=path, clock=clock, **kwargs), clock
+
+
+def test_questions_share_a_normalized_key():
+    assert normalize("get info albert einstein") == "albert einstein"
+    assert normalize("tell me about Albert  Einstein") == "albert einstein"
+    assert normalize("Who's Albert Einstein?") == normalize("who is albert einstein") == "who is albert einstein"
+    assert normalize("please tell me") == "please tell me", "a question of only filler words keeps them"
+    cache, clock = make_cache()
+    cache.put("get info albert einstein", "Albert Einstein was a physicist.")
+    assert cache.get("tell me about albert einstein") == "Albert Einstein was a physicist."
+
+
+def test_question_words_and_tenses_are_part_of_the_key():
+    assert normalize("when was einstein born") != normalize("where was einstein born")
+    assert normalize("who is the president") != normalize("who was the president")
+    cache, clock = make_cache()
+    cache.put("when was einstein born", "Einstein was born on 14 March 1879.")
+    assert cache.get("where was einstein born") is None
+    assert cache.get("could you tell me when was einstein born") == "Einstein was born on 14 March 1879."
+
+
+def test_answers_survive_a_restart():
+    cache, clock = make_cache()
+    cache.put("python programming language", "Python is a programming language.")
+    cache.close()
+    reopened = KnowledgeCache(path=cache.path, clock=clock)
+    assert reopened.get("tell me about python programming language") == "Python is a programming language."
+    assert reopened.stats['disk_hits'] == 1
+    assert reopened.get("python programming language") is not None
+    assert reopened.stats['memory_hits'] == 1
+
+
+def test_expired_answers_are_only_served_offline():
+    cache, clock = make_cache(ttl=60)
+    cache.put("mount everest", "Mount Everest is the highest mountain.")
+    clock.now += 61
+    assert cache.get("mount everest") is None
+    assert cache.has("mount everest")
+    assert cache.get("mount everest", offline=True) == "Mount Everest is the highest mountain."
+    assert cache.stats['stale_hits'] == 1 and cache.stats['misses'] == 1
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache, clock = make_cache(max_entries=2, memory_entries=1)
+    cache.put("first", "one")
+    clock.now += 1
+    cache.put("second", "two")
+    clock.now += 1
+    cache.get("first")  # now used more recently than "second"
+    clock.now += 1
+    cache.put("third", "three")
+    assert len(cache) == 2 and cache.stats['evicted'] == 1
+    assert cache.get("second") is None
+    assert cache.get("first") == "one" and cache.get("third") == "three"
+
+
+def test_hit_rate_is_reported():
+    cache, clock = make_cache()
+    assert cache.hit_rate() is None
+    cache.get("unknown topic")
+    cache.put("known topic", "an answer")
+    cache.get("known topic")
+    cache.get("known topic")
+    assert abs(cache.hit_rate() - 2 / 3.0) < 1e-9
+    assert "67% hit rate" in cache.format_report()
+    assert 'jarvis_knowledge_lookups_total{result="miss"} 1' in cache.format_prometheus()
+    assert knowledge_cache.MAX_ENTRIES > 0 and knowledge_cache.TTL > 0
+
+
+def main():
+    """Run all knowledge cache tests and print a summary"""
+    print("\n🧪 JARVIS KNOWLEDGE CACHE TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_questions_share_a_normalized_key,
+        test_question_words_and_tenses_are_part_of_the_key,
+        test_answers_survive_a_restart,
+        test_expired_answers_are_only_served_offline,
+        test_least_recently_used_answers_are_evicted,
+        test_hit_rate_is_reported,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -32,7 +32,7 @@ def test_robot():
     
     try:
         print(f"🔌 Connecting to Arduino on {port_name}")
-        arduino = serial.Serial(port_name, 9600, timeout=2)
+        arduino = serial.Serial(port_name, 115200, timeout=2)  # BAUD_RATE in arduino_led_expressions.ino
         time.sleep(2)  # Wait for Arduino to initialize
         
         print("🤖 Testing JAUNDICE Robot LED Expressions...")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis location service
+Checks that the location is resolved once, saved with an expiry and
+refreshed in the background, and that an error reply doesn't replace it,
+using a fake lookup or a local stub server instead of ipinfo.io.
+"""
+
+import http.server
+import json
+import os
+import tempfile
+import threading
+import time
+
+import http_client
+import location_service
+from location_service import Location, LocationService
+
+
+class FakeLookup(object):
+    """Counts lookups and can be made to fail"""
+
+    def __init__(self, city="Colombo", delay=0.0):
+        self.city = city
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise IOError("network is down")
+        return Location(self.city, "Western", "LK", "6.93,79.85", "", time.time())
+
+
+class StubGeolocation(http.server.BaseHTTPRequestHandler):
+    """Answers like ipinfo.io with the server's current city"""
+
+    def do_GET(self):
+        self.server.hits += 1
+        if self.server.status != 200:
+            data = json.dumps({"error": {"title": "Rate limit exceeded"}}).encode()
+        else:
+            data = json.dumps({"city": self.server.city, "region": "Western", "country": "LK",
+                               "loc": "6.93,79.85", "timezone": ""}).encode()
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_service(lookup, **kwargs):
+    path = os.path.join(tempfile.mkdtemp(), "location.json")
+    return LocationService(fetch=lookup, location_file=path, **kwargs)
+
+
+def test_location_is_resolved_once():
+    lookup = FakeLookup()
+    service = make_service(lookup)
+    for _ in range(5):
+        assert service.city() == "Colombo"
+    assert lookup.calls == 1
+
+
+def test_saved_location_is_reused_after_restart():
+    lookup = FakeLookup()
+    service = make_service(lookup)
+    service.get()
+    restarted = LocationService(fetch=lookup, location_file=service.location_file)
+    assert restarted.city() == "Colombo"
+    assert lookup.calls == 1
+
+
+def test_expired_location_is_resolved_again():
+    lookup = FakeLookup()
+    service = make_service(lookup, max_age=0.1, refresh_after=0.1)
+    service.get()
+    time.sleep(0.2)
+    lookup.city = "Kandy"
+    assert service.city() == "Kandy"
+    assert lookup.calls == 2
+
+
+def test_old_location_is_refreshed_in_background():
+    lookup = FakeLookup(delay=0.3)
+    service = make_service(lookup, refresh_after=0.1, max_age=60)
+    service.get()
+    time.sleep(0.2)
+    lookup.city = "Galle"
+    started = time.time()
+    assert service.city() == "Colombo"  # answered from the saved location
+    assert time.time() - started < 0.1
+    for _ in range(50):
+        if service.location.city == "Galle":
+            break
+        time.sleep(0.05)
+    assert service.city() == "Galle"
+
+
+def test_failed_lookup_keeps_old_location():
+    lookup = FakeLookup()
+    service = make_service(lookup, max_age=0.1, refresh_after=0.1)
+    service.get()
+    time.sleep(0.2)
+    lookup.fail = True
+    assert service.city() == "Colombo"
+    assert make_service(lookup).city(default="San Francisco") == "San Francisco"
+
+
+def start_stub_server():
+    """A stub ipinfo.io that fetch_ip_location() talks to until stop_stub_server()"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubGeolocation)
+    server.hits = 0
+    server.city = "Colombo"
+    server.status = 200
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.saved = location_service.GEOLOCATION_URL, http_client._client
+    location_service.GEOLOCATION_URL = f"http://127.0.0.1:{server.server_address[1]}/json"
+    http_client._client = http_client.HttpClient()  # the real endpoint settings
+    return server
+
+
+def stop_stub_server(server):
+    location_service.GEOLOCATION_URL, http_client._client = server.saved
+    server.shutdown()
+
+
+def test_refresh_asks_the_server_again():
+    server = start_stub_server()
+    try:
+        service = make_service(None)
+        assert service.city() == "Colombo"
+        server.city = "Kandy"
+        assert service.refresh().city == "Kandy", "the refresh got an old cached answer"
+        assert server.hits == 2
+    finally:
+        stop_stub_server(server)
+
+
+def test_error_reply_keeps_old_location():
+    server = start_stub_server()
+    try:
+        service = make_service(None)
+        assert service.city() == "Colombo"
+        server.status = 429
+        assert service.refresh() is None, "the error reply was taken for a location"
+        assert service.city() == "Colombo" and service.fetches == 1
+        with open(service.location_file) as f:
+            assert json.load(f)["city"] == "Colombo"
+    finally:
+        stop_stub_server(server)
+
+
+def main():
+    """Run all location service tests and print a summary"""
+    print("\n🧪 JARVIS LOCATION SERVICE TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_location_is_resolved_once,
+        test_saved_location_is_reused_after_restart,
+        test_expired_location_is_resolved_again,
+        test_old_location_is_refreshed_in_background,
+        test_failed_lookup_keeps_old_location,
+        test_refresh_asks_the_server_again,
+        test_error_reply_keeps_old_location,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
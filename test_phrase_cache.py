@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis phrase cache
+Renders phrases with a fake engine that writes silent WAV files and checks
+the content addressing, that only registered phrases are cached, and that
+playback can be cancelled.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import wave
+
+import phrase_cache
+
+
+class FakeEngine(object):
+    """Implements the pyttsx3 calls the cache uses; writes 0.1 s of silence"""
+
+    def __init__(self, voice="karen", rate=180, volume=1.0):
+        self.properties = {'voice': voice, 'rate': rate, 'volume': volume}
+        self.queued = []
+        self.renders = 0
+
+    def getProperty(self, name):
+        return self.properties[name]
+
+    def save_to_file(self, text, path):
+        self.queued.append(path)
+
+    def runAndWait(self):
+        for path in self.queued:
+            with wave.open(path, 'wb') as clip:
+                clip.setnchannels(1)
+                clip.setsampwidth(2)
+                clip.setframerate(16000)
+                clip.writeframes(b"\0\0" * 1600)
+            self.renders += 1
+        self.queued = []
+
+
+def make_cache():
+    return phrase_cache.PhraseCache(tempfile.mkdtemp())
+
+
+def test_only_registered_phrases_are_cached():
+    cache = make_cache()
+    engine = FakeEngine()
+    cache.configure_from(engine)
+    cache.add("Okay boss, playing")
+    assert cache.lookup("Okay boss, playing") is None
+    assert cache.missing() == ["Okay boss, playing"]
+    assert cache.render_next(engine) is False
+    assert cache.lookup("Okay boss, playing").startswith(cache.directory)
+    assert cache.lookup("It is 10:42") is None
+    assert cache.missing() == []
+
+
+def test_recordings_are_per_voice_setting():
+    cache = make_cache()
+    cache.add("Hello")
+    slow, fast = FakeEngine(rate=150), FakeEngine(rate=200)
+    cache.render(slow, "Hello")
+    path = cache.lookup("Hello")
+    cache.configure_from(fast)
+    assert cache.lookup("Hello") is None, "a new rate needs a new recording"
+    cache.render(fast, "Hello")
+    assert cache.lookup("Hello") != path
+    assert len(os.listdir(cache.directory)) == 2
+
+
+def test_failed_render_leaves_no_file():
+    cache = make_cache()
+    engine = FakeEngine()
+    engine.runAndWait = lambda: None  # never writes anything
+    cache.add("Broken")
+    assert cache.render_next(engine) is False
+    assert os.listdir(cache.directory) == []
+    assert "Broken" not in cache.phrases
+
+
+def test_playback_can_be_cancelled():
+    path = os.path.join(tempfile.mkdtemp(), "phrase.aiff")
+    with open(path, "wb") as f:
+        f.write(b"FORM not a wav file")
+    player = phrase_cache.PLAYER
+    phrase_cache.PLAYER = ["sh", "-c", "sleep 5", "player"]
+    stop = threading.Event()
+    threading.Timer(0.1, stop.set).start()
+    started = time.time()
+    try:
+        assert phrase_cache.play_file(path, cancelled=stop.is_set)
+    finally:
+        phrase_cache.PLAYER = player
+    assert time.time() - started < 1
+
+
+def main():
+    """Run all phrase cache tests and print a summary"""
+    print("\n🧪 JARVIS PHRASE CACHE TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_only_registered_phrases_are_cached,
+        test_recordings_are_per_voice_setting,
+        test_failed_render_leaves_no_file,
+        test_playback_can_be_cancelled,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
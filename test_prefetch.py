@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis speculative prefetch
+Registers slow fake lookups and checks that a matching speculation hides
+their latency, that a different final intent discards it, and that
+handlers still get their data when speculation is vetoed or fails.
+"""
+
+import time
+
+import prefetch
+from intent_router import IntentRouter
+
+
+class SlowLookup(object):
+    """A lookup that takes a fixed time and counts its calls"""
+
+    def __init__(self, seconds=0.1, fail=False):
+        self.seconds = seconds
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, slots):
+        self.calls.append(slots)
+        time.sleep(self.seconds)
+        if self.fail:
+            raise IOError("lookup failed")
+        return f"weather in {slots.get('city') or 'San Francisco'}"
+
+
+def make_prefetcher(**lookups):
+    prefetcher = prefetch.Prefetcher(IntentRouter())
+    for intent, lookup in lookups.items():
+        prefetcher.register(intent, lookup)
+    return prefetcher
+
+
+def test_matching_speculation_hides_the_fetch():
+    weather = SlowLookup(0.1)
+    prefetcher = make_prefetcher(weather=weather)
+    route = IntentRouter().route("jarvis what's the weather in paris")
+    speculation = prefetcher.speculate("jarvis what's the weather in paris")
+    time.sleep(0.12)  # the handler is busy with something else
+    prefetcher.settle(speculation, route.intent, route.slots)
+    started = time.perf_counter()
+    assert prefetcher.fetch('weather', route.slots) == "weather in paris"
+    assert time.perf_counter() - started < 0.05
+    assert len(weather.calls) == 1
+    stats = prefetcher.stats['weather']
+    assert stats['used'] == 1 and stats['hidden'][0] >= 0.09
+    assert "hid" in prefetcher.format_report()
+
+
+def test_different_final_intent_discards_the_speculation():
+    weather = SlowLookup(0.05)
+    prefetcher = make_prefetcher(weather=weather)
+    speculation = prefetcher.speculate("jarvis how's the weather")
+    prefetcher.settle(speculation, 'time', {})
+    assert prefetcher.stats['weather']['discarded'] == 1
+    # A later weather command doesn't get the stale result
+    assert prefetcher.fetch('weather', {'city': None}) == "weather in San Francisco"
+    assert prefetcher.stats['weather']['used'] == 0
+
+
+def test_only_slow_intents_are_speculated():
+    weather = SlowLookup(0.01)
+    prefetcher = make_prefetcher(weather=weather)
+    assert prefetcher.speculate("jarvis tell me a joke") is None
+    speculation = prefetcher.speculate("jarvis what's the weather in paris")
+    assert (speculation.intent, speculation.slots) == ('weather', {'city': 'paris'})
+    assert prefetcher.stats['weather']['started'] == 1
+
+
+def test_vetoed_or_failed_speculation_still_answers():
+    info = SlowLookup(0.01)
+    prefetcher = prefetch.Prefetcher(IntentRouter())
+    prefetcher.register('info', info, allowed=lambda: False)
+    assert prefetcher.speculate("jarvis get info python") is None
+    assert prefetcher.fetch('info', {'query': 'python'}) == "weather in San Francisco"
+
+    weather = SlowLookup(0.01, fail=True)
+    prefetcher = make_prefetcher(weather=weather)
+    speculation = prefetcher.speculate("jarvis weather today")
+    prefetcher.settle(speculation, speculation.intent, speculation.slots)
+    assert isinstance(speculation.future.exception(), IOError)
+    weather.fail = False
+    assert prefetcher.fetch('weather', speculation.slots) == "weather in San Francisco"
+    assert len(weather.calls) == 2
+
+
+def main():
+    """Run all prefetch tests and print a summary"""
+    print("\n🧪 JARVIS PREFETCH TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_matching_speculation_hides_the_fetch,
+        test_different_final_intent_discards_the_speculation,
+        test_only_slow_intents_are_speculated,
+        test_vetoed_or_failed_speculation_still_answers,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
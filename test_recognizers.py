@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis recognition service
+Uses stub backends to check the fallback to the offline engine on errors
+and timeouts, the fingerprint cache, the offline short-circuit, and that
+hung online calls can't take every recognizer worker.
+"""
+
+import time
+
+import speech_recognition as sr
+
+import recognizers
+from recognizers import RecognitionService, StubBackend
+
+
+class OnlineStub(StubBackend):
+    """Stands in for Google: needs the network"""
+
+    name = "online-stub"
+    needs_network = True
+
+
+def clip(seed=0):
+    """A silent clip with a distinct fingerprint per seed"""
+    return sr.AudioData(bytes([seed % 256]) * 3200, 16000, 2)
+
+
+def test_request_error_falls_back_to_offline():
+    online = OnlineStub(default="online answer", error=sr.RequestError("quota exceeded"))
+    offline = StubBackend(default="offline answer")
+    service = RecognitionService(online, offline)
+    assert service.recognize(None, clip()) == "offline answer"
+    assert service.last_backend == "stub" and service.fallback_count == 1
+    assert online.calls == 1 and offline.calls == 1
+
+
+def test_timeout_falls_back_to_offline():
+    online = OnlineStub(default="online answer", delay=0.5, timeout=0.05)
+    offline = StubBackend(default="offline answer")
+    service = RecognitionService(online, offline)
+    started = time.time()
+    assert service.recognize(None, clip()) == "offline answer"
+    assert time.time() - started < 0.4, "waited for the hung backend"
+    assert service.fallback_count == 1
+
+
+def test_repeated_clips_come_from_the_cache():
+    backend = StubBackend(default="what time is it")
+    service = RecognitionService(backend, cache_size=2)
+    for _ in range(3):
+        assert service.recognize(None, clip(1)) == "what time is it"
+    assert backend.calls == 1 and service.cache.hits == 2 and service.last_backend == "cache"
+    service.recognize(None, clip(2))
+    service.recognize(None, clip(3))  # pushes clip 1 out of the two-entry cache
+    service.recognize(None, clip(1))
+    assert backend.calls == 4
+
+
+def test_offline_skips_the_online_backend():
+    online = OnlineStub(default="online answer")
+    offline = StubBackend(default="offline answer")
+    service = RecognitionService(online, offline, online=lambda: False)
+    assert service.recognize(None, clip()) == "offline answer"
+    assert online.calls == 0
+
+
+def test_hung_calls_do_not_block_later_recognitions():
+    online = OnlineStub(default="online answer", delay=1.0, timeout=0.05)
+    offline = StubBackend(default="offline answer")
+    service = RecognitionService(online, offline)
+    started = time.time()
+    for seed in range(5):
+        assert service.recognize(None, clip(seed)) == "offline answer"
+    assert time.time() - started < 0.5, "later clips waited for hung workers"
+    # Only one call is left hanging; the others skip the stuck backend
+    assert online.calls == recognizers.MAX_HUNG and service.hung[online.name] == recognizers.MAX_HUNG
+    time.sleep(1.1)
+    assert service.hung[online.name] == 0
+    online.delay = 0.0
+    assert service.recognize(None, clip(9)) == "online answer"
+
+
+def main():
+    """Run all recognition service tests and print a summary"""
+    print("\n🧪 JARVIS RECOGNIZERS TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_request_error_falls_back_to_offline,
+        test_timeout_falls_back_to_offline,
+        test_repeated_clips_come_from_the_cache,
+        test_offline_skips_the_online_backend,
+        test_hung_calls_do_not_block_later_recognitions,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis runtime
+Checks that capture, recognition and handling overlap, that commands are
+handled in order, and that a failing stage doesn't stop the pipeline.
+"""
+
+import threading
+import time
+
+from runtime import Runtime
+
+
+class Script(object):
+    """Feeds a list of utterances to the runtime and records what was handled"""
+
+    def __init__(self, utterances, recognize_delay=0.0, handle_delay=0.0):
+        self.utterances = list(utterances)
+        self.recognize_delay = recognize_delay
+        self.handle_delay = handle_delay
+        self.captured_at = {}
+        self.handled = []
+        self._lock = threading.Lock()
+
+    def capture(self):
+        with self._lock:
+            if not self.utterances:
+                time.sleep(0.01)
+                return None
+            utterance = self.utterances.pop(0)
+        self.captured_at[utterance] = time.time()
+        return utterance
+
+    def recognize(self, utterance):
+        time.sleep(self.recognize_delay)
+        if utterance == "noise":
+            return None
+        if utterance == "broken":
+            raise ValueError("recognizer crashed")
+        return utterance.upper()
+
+    def handle(self, command):
+        time.sleep(self.handle_delay)
+        self.handled.append(command)
+
+
+def run(script, expected, **kwargs):
+    runtime = Runtime(script.capture, script.recognize, script.handle, **kwargs)
+    runtime.on_turn = lambda turn: len(script.handled) >= expected and runtime.stop()
+    timer = threading.Timer(5, runtime.stop)
+    timer.start()
+    runtime.run_forever()
+    timer.cancel()
+    return runtime
+
+
+def test_commands_are_handled_in_order():
+    script = Script(["one", "two", "three"], recognize_delay=0.02)
+    runtime = run(script, 3)
+    assert script.handled == ["ONE", "TWO", "THREE"], script.handled
+    assert runtime.turns == 3
+
+
+def test_next_command_is_captured_while_handling():
+    script = Script(["one", "two"], handle_delay=0.2)
+    run(script, 2)
+    # The second utterance was captured long before the first handler finished
+    assert script.captured_at["two"] - script.captured_at["one"] < 0.1
+
+
+def test_failing_stage_does_not_stop_pipeline():
+    script = Script(["broken", "noise", "after"])
+    runtime = run(script, 1)
+    assert script.handled == ["AFTER"], script.handled
+    assert runtime.errors == 1
+
+
+def test_stage_latency_is_recorded():
+    script = Script(["one", "two"], recognize_delay=0.05)
+    runtime = run(script, 2)
+    assert len(runtime.timer.samples["recognize"]) == 2
+    assert runtime.timer.percentile("recognize", 50) >= 0.05
+    assert "recognize" in runtime.format_stats()
+
+
+def main():
+    """Run all runtime tests and print a summary"""
+    print("\n🧪 JARVIS RUNTIME TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_commands_are_handled_in_order,
+        test_next_command_is_captured_while_handling,
+        test_failing_stage_does_not_stop_pipeline,
+        test_stage_latency_is_recorded,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis serial link
+Runs SerialLink against a fake Arduino on a pseudo-terminal to check the
+write queue, coalescing, reply parsing, round-trip times and reconnects,
+with both the framed protocol and the legacy single bytes.
+"""
+
+import time
+
+from fake_arduino import REPLIES, FakeArduino
+from serial_link import FRAMED, LEGACY, SerialLink
+
+
+def make_link(board, **kwargs):
+    kwargs.setdefault('backoff_base', 0.05)
+    kwargs.setdefault('backoff_max', 0.2)
+    kwargs.setdefault('ready_timeout', 0.1)  # the banner is flushed when the port opens
+    return SerialLink(find_ports=lambda: [board.path] if board.path else [], **kwargs).start()
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def expressions(board):
+    """What the board played, without the probe bytes a legacy sketch rejects"""
+    return [code for code in board.received if code in REPLIES]
+
+
+def test_legacy_commands_are_sent_and_acknowledged():
+    board = FakeArduino(framed=False)
+    board.plug_in()
+    link = make_link(board)
+    assert wait_for(lambda: link.ready)
+    assert link.mode == LEGACY
+    for code in (b'u', b'h', b'p', b'l'):
+        link.send(code)
+        assert link.wait_idle(3)
+    assert expressions(board) == [b'u', b'h', b'p', b'l']
+    assert [reply.text for reply in link.replies][-4:] == ["Activated!", "Thinking!", "Happy!", "Deactivated!"]
+    assert all(rtt < 0.5 for rtt in link.rtt[b'h'])
+    link.stop()
+    board.unplug()
+
+
+def test_framed_commands_are_batched_and_acknowledged():
+    board = FakeArduino(delay=0.05)
+    board.plug_in()
+    link = make_link(board)
+    assert wait_for(lambda: link.ready)
+    assert link.mode == FRAMED
+    codes = [b'u', b'h', b'p', b'a', b's', b'U', b'l']
+    for code in codes:
+        link.send(code, duration=250)
+    assert link.wait_idle(3)
+    assert wait_for(lambda: len(board.received) == len(codes))  # acked on arrival, then played
+    assert board.received == codes and set(board.durations) == {250}
+    assert link.frames_sent < len(codes)  # queued commands shared frames
+    assert all(reply.text == "ok" for reply in link.replies)
+    link.stop()
+    board.unplug()
+
+
+def test_corrupted_frame_is_sent_again():
+    board = FakeArduino()
+    board.plug_in()
+    link = make_link(board)
+    assert wait_for(lambda: link.ready)
+    board.corrupt_next = True
+    link.send(b'p')
+    assert link.wait_idle(3)
+    assert board.received == [b'p'] and link.resent == 1
+    link.stop()
+    board.unplug()
+
+
+def test_send_does_not_block():
+    board = FakeArduino(delay=0.2)
+    board.plug_in()
+    link = make_link(board)
+    assert wait_for(lambda: link.ready)
+    started = time.time()
+    for code in (b'p', b'h', b's', b'a'):
+        link.send(code)
+    assert time.time() - started < 0.05
+    link.stop()
+    board.unplug()
+
+
+def test_redundant_writes_are_coalesced():
+    board = FakeArduino()
+    board.plug_in()
+    link = make_link(board)
+    link.send(b'l')
+    link.send(b'l')
+    assert link.wait_idle(3)
+    link.send(b'l')  # the LEDs are already off
+    link.send(b'p')
+    link.send(b'p')  # still waiting to be sent
+    assert link.wait_idle(3)
+    assert expressions(board) == [b'l', b'p'], board.received
+    assert link.coalesced == 3
+    link.stop()
+    board.unplug()
+
+
+def test_writes_wait_for_the_ready_banner():
+    board = FakeArduino(ready=False, framed=False)
+    board.plug_in()
+    link = make_link(board, ready_timeout=5)
+    link.send(b'u')
+    assert wait_for(lambda: link.connected)
+    time.sleep(0.3)
+    assert board.received == []
+    board.println("JAUNDICE Robot Ready!")
+    assert wait_for(lambda: expressions(board) == [b'u'])
+    link.stop()
+    board.unplug()
+
+
+def test_unknown_commands_are_reported():
+    for framed, text in ((False, "Unknown command: z"), (True, "unknown command")):
+        board = FakeArduino(framed=framed)
+        board.plug_in()
+        link = make_link(board)
+        assert wait_for(lambda: link.ready)
+        link.send(b'z')
+        assert link.wait_idle(3)
+        assert link.replies[-1].text == text
+        link.stop()
+        board.unplug()
+
+
+def test_reconnects_after_unplug():
+    board = FakeArduino()
+    board.plug_in()
+    link = make_link(board)
+    link.send(b'p')
+    assert link.wait_idle(3)
+    board.unplug()
+    assert wait_for(lambda: not link.connected)
+    time.sleep(0.3)  # a few failed reconnect attempts while unplugged
+    board.plug_in()
+    assert wait_for(lambda: link.connected)
+    link.send(b'h')
+    assert link.wait_idle(3)
+    assert board.received[-1] == b'h' and link.reconnects == 1
+    link.stop()
+    board.unplug()
+
+
+def main():
+    """Run all serial link tests and print a summary"""
+    print("\n🧪 JARVIS SERIAL LINK TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_legacy_commands_are_sent_and_acknowledged,
+        test_framed_commands_are_batched_and_acknowledged,
+        test_corrupted_frame_is_sent_again,
+        test_send_does_not_block,
+        test_redundant_writes_are_coalesced,
+        test_writes_wait_for_the_ready_banner,
+        test_unknown_commands_are_reported,
+        test_reconnects_after_unplug,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
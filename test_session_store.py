@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis conversation context
+Checks that follow-ups like "and tomorrow?" and "in London?" reuse the
+previous intent and slots, that "yes" and "no" answer the search offer,
+that everything expires, and that the prefetcher reuses results kept from
+earlier turns instead of fetching again.
+"""
+
+import prefetch
+import session_store
+from intent_router import IntentRouter
+
+
+class Clock(object):
+    """A clock the test moves by hand"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_session(**kwargs):
+    clock = Clock()
+    session = session_store.SessionStore(clock=clock, **kwargs)
+    return session, clock
+
+
+def ask(router, session, words):
+    """Route words like process() does and remember the turn"""
+    route = session.resolve(words, router.route(words))
+    session.record(words, route)
+    return route
+
+
+def test_follow_ups_change_the_slots_of_the_previous_intent():
+    router = IntentRouter()
+    session, clock = make_session()
+    assert ask(router, session, "jarvis what's the weather in paris").slots == {'city': 'paris'}
+    route = ask(router, session, "jarvis and tomorrow")
+    assert (route.intent, route.slots) == ('weather', {'city': 'paris', 'day': 'tomorrow'})
+    route = ask(router, session, "jarvis what about in london")
+    assert (route.intent, route.slots) == ('weather', {'city': 'london', 'day': 'tomorrow'})
+    route = ask(router, session, "jarvis and today")
+    assert (route.intent, route.slots) == ('weather', {'city': 'london'})
+    # A joke in between doesn't break the thread, but an old conversation is forgotten
+    ask(router, session, "jarvis tell me a joke")
+    assert ask(router, session, "jarvis in rome").slots == {'city': 'rome'}
+    clock.now += session.ttl + 1
+    assert ask(router, session, "jarvis in rome").intent == 'fallback'
+    assert session.stats['follow_ups'] == 4
+
+
+def test_follow_ups_only_replace_catch_all_routes():
+    router = IntentRouter()
+    session, clock = make_session()
+    ask(router, session, "jarvis what's the weather")
+    assert ask(router, session, "jarvis what time is it").intent == 'time'
+    assert ask(router, session, "jarvis what is the capital of france").intent == 'question'
+
+
+def test_yes_and_no_answer_the_search_offer():
+    router = IntentRouter()
+    session, clock = make_session()
+    route = ask(router, session, "jarvis quantum tunnelling")
+    assert (route.intent, route.slots) == ('fallback', {'query': 'quantum tunnelling'})
+    session.offer('search', route.slots)
+    route = ask(router, session, "jarvis yes please")
+    assert (route.intent, route.slots) == ('search', {'query': 'quantum tunnelling'})
+    assert ask(router, session, "jarvis yes").intent == 'fallback', "an offer is only taken once"
+
+    session.offer('search', {'query': 'quantum tunnelling'})
+    assert ask(router, session, "jarvis no thanks").intent == 'decline'
+
+    session.offer('search', {'query': 'quantum tunnelling'})
+    clock.now += session.confirm_ttl + 1
+    assert ask(router, session, "jarvis yes").intent == 'fallback', "offers expire"
+
+
+def test_prefetcher_reuses_results_from_earlier_turns():
+    router = IntentRouter()
+    session, clock = make_session()
+    calls = []
+
+    def weather(slots):
+        calls.append(dict(slots))
+        return "I couldn't get the weather" if slots.get('city') == 'atlantis' else f"sunny in {slots.get('city')}"
+
+    prefetcher = prefetch.Prefetcher(router, cache=session)
+    prefetcher.register('weather', weather, keep=lambda text: not text.startswith("I couldn't"))
+    assert prefetcher.fetch('weather', {'city': 'paris'}) == "sunny in paris"
+    assert prefetcher.speculate("jarvis what's the weather in paris") is None, "no need to fetch it again"
+    assert prefetcher.fetch('weather', {'city': 'paris'}) == "sunny in paris"
+    assert len(calls) == 1 and prefetcher.stats['weather']['cached'] == 1
+
+    prefetcher.fetch('weather', {'city': 'atlantis'})
+    prefetcher.fetch('weather', {'city': 'atlantis'})
+    assert len(calls) == 3, "failed lookups are not kept"
+
+    clock.now += session.ttl + 1
+    prefetcher.fetch('weather', {'city': 'paris'})
+    assert len(calls) == 4 and session.has('weather', {'city': 'paris'})
+
+
+def main():
+    """Run all conversation context tests and print a summary"""
+    print("\n🧪 JARVIS SESSION STORE TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_follow_ups_change_the_slots_of_the_previous_intent,
+        test_follow_ups_only_replace_catch_all_routes,
+        test_yes_and_no_answer_the_search_offer,
+        test_prefetcher_reuses_results_from_earlier_turns,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis skill registry
+Checks that every intent in the manifest has a handler, that skill modules
+are only imported when first dispatched or called through bound(), that
+blocking skills run on the pool without holding up dispatch, that handler
+errors are reported, and that slow handlers are announced at their
+deadline and later given up on.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import skills
+from intent_router import JARVIS_INTENTS
+
+SKILL_SOURCE = '''
+import time
+
+import skills
+
+def handle_greet(jarvis, slots):
+    jarvis.append(("greet", slots))
+
+def handle_slow(jarvis, slots):
+    time.sleep(slots["seconds"])
+    jarvis.append(("slow", slots, skills.cancelled()))
+
+def handle_broken(jarvis, slots):
+    raise ValueError("no answer")
+
+def lookup_greet(jarvis, slots):
+    return f"hello {slots['name']} from a context of {len(jarvis)}"
+'''
+
+
+def make_registry(name, blocking=False, deadline=None, **kwargs):
+    """A registry over a throwaway skill module; the context is a list of handled calls"""
+    directory = tempfile.mkdtemp(prefix="jarvis_skills_")
+    with open(os.path.join(directory, f"{name}.py"), "w") as f:
+        f.write(SKILL_SOURCE)
+    sys.path.insert(0, directory)
+    manifest = [{"skill": name, "module": name, "blocking": blocking, "deadline": deadline,
+                 "intents": [{"intent": "greet"}, {"intent": "slow"}, {"intent": "broken"}]}]
+    calls = []
+    return skills.SkillRegistry(calls, manifest, **kwargs), calls
+
+
+def test_every_intent_has_a_handler():
+    registry = skills.SkillRegistry(None)
+    intents = [intent.name for intent in JARVIS_INTENTS if intent.terminal]
+    intents += [entry['intent'] for skill in skills.load_manifest() if skill['module']
+                for entry in skill['intents'] if 'priority' not in entry]
+    assert {'wake', 'fallback', 'decline'} <= set(intents)
+    for intent in intents:
+        assert callable(registry.handler(intent)), intent
+
+
+def test_skills_are_imported_on_first_dispatch():
+    registry, calls = make_registry("lazy_skill")
+    assert "lazy_skill" not in sys.modules and registry.loaded() == []
+    registry.dispatch("greet", {"name": "boss"})
+    assert "lazy_skill" in sys.modules and registry.loaded() == ["lazy_skill"]
+    assert calls == [("greet", {"name": "boss"})]
+    assert registry.skills["lazy_skill"].import_seconds is not None
+
+
+def test_bound_functions_import_their_skill_on_first_call():
+    registry, calls = make_registry("bound_skill")
+    lookup = registry.bound("greet", "lookup_greet")
+    assert lookup.__name__ == "lookup_greet"
+    assert "bound_skill" not in sys.modules and registry.loaded() == []
+    calls.append("earlier call")
+    assert lookup({"name": "boss"}) == "hello boss from a context of 1"
+    assert registry.loaded() == ["bound_skill"]
+
+
+def test_blocking_skills_do_not_hold_up_dispatch():
+    registry, calls = make_registry("pool_skill", blocking=True)
+    registry.handler("slow")  # import first, so only the handler is timed
+    done = []
+    started = time.perf_counter()
+    future = registry.dispatch("slow", {"seconds": 0.2}, lambda error, seconds: done.append((error, seconds)))
+    assert time.perf_counter() - started < 0.1 and future is not None
+    assert registry.in_flight == 1
+    assert registry.wait_idle(timeout=2)
+    assert calls == [("slow", {"seconds": 0.2}, False)]
+    assert done[0][0] is None and done[0][1] >= 0.2
+
+
+def test_handler_errors_are_passed_to_done():
+    registry, calls = make_registry("broken_skill")
+    done = []
+    registry.dispatch("broken", {}, lambda error, seconds: done.append(error))
+    assert isinstance(done[0], ValueError)
+    assert registry.in_flight == 0
+
+
+def test_overdue_handlers_are_announced_then_given_up_on():
+    overdue = []
+    registry, calls = make_registry("deadline_skill", blocking=True, deadline=0.1,
+                                    on_overdue=overdue.append, cancel_factor=2)
+    registry.handler("slow")
+    done = []
+    job = registry.dispatch("slow", {"seconds": 0.5}, lambda error, seconds: done.append(error))
+    time.sleep(0.15)
+    assert overdue == ["slow"] and job.overdue and not done
+    time.sleep(0.1)
+    assert job.cancelled and isinstance(done[0], TimeoutError)
+    assert registry.wait_idle(timeout=2)
+    assert len(done) == 1, "done() must not be called again when the handler returns"
+    assert calls == [("slow", {"seconds": 0.5}, True)]
+    assert registry.counters["slow"] == {'dispatched': 1, 'overdue': 1, 'cancelled': 1, 'errors': 0}
+
+
+def test_queued_jobs_are_counted_and_cancelled_before_they_start():
+    registry, calls = make_registry("queue_skill", blocking=True, max_workers=1)
+    registry.handler("slow")
+    registry.dispatch("slow", {"seconds": 0.2})
+    waiting = registry.dispatch("slow", {"seconds": 0.2})
+    time.sleep(0.05)
+    assert registry.queued == 1
+    assert "jarvis_skill_queue_depth 1" in registry.format_prometheus()
+    assert registry.cancel(waiting)
+    assert registry.queued == 0
+    assert registry.wait_idle(timeout=2)
+    assert len(calls) == 1
+    assert 'jarvis_skill_cancelled_total{intent="slow"} 1' in registry.format_prometheus()
+
+
+def main():
+    """Run all skill registry tests and print a summary"""
+    print("\n🧪 JARVIS SKILLS TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_every_intent_has_a_handler,
+        test_skills_are_imported_on_first_dispatch,
+        test_bound_functions_import_their_skill_on_first_call,
+        test_blocking_skills_do_not_hold_up_dispatch,
+        test_handler_errors_are_passed_to_done,
+        test_overdue_handlers_are_announced_then_given_up_on,
+        test_queued_jobs_are_counted_and_cancelled_before_they_start,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis speech queue
+Speaks with a fake synthesizer that records what it said and checks the
+priority order, that flush() and interrupt() cancel what is queued, that
+handles can be waited on, and that background work at IDLE priority
+doesn't keep the queue busy.
+"""
+
+import threading
+import time
+
+import speech_queue
+from speech_queue import SpeechQueue
+
+
+class FakeVoice(object):
+    """Speaks by recording the text; a sentence can be held until released"""
+
+    def __init__(self):
+        self.spoken = []
+        self.stopped = []
+        self.hold = {}
+
+    def __call__(self, text, handle):
+        release = self.hold.get(text)
+        if release is not None:
+            while not release.wait(0.01):
+                if handle.cancelled:
+                    self.stopped.append(text)
+                    return False
+        self.spoken.append(text)
+        return True
+
+    def holding(self, text):
+        """Keep text speaking until the returned event is set"""
+        release = self.hold[text] = threading.Event()
+        return release
+
+
+def test_sentences_are_spoken_by_priority():
+    voice = FakeVoice()
+    speech = SpeechQueue(voice)
+    release = voice.holding("first")
+    first = speech.say("first")
+    assert first.started.wait(1)
+    speech.say("idle", priority=speech_queue.IDLE)
+    speech.say("normal one")
+    speech.say("urgent", priority=speech_queue.URGENT)
+    last = speech.say("normal two")
+    release.set()
+    assert last.wait(1)
+    speech.stop()
+    assert voice.spoken == ["first", "urgent", "normal one", "normal two", "idle"]
+
+
+def test_flush_and_interrupt_cancel_queued_sentences():
+    voice = FakeVoice()
+    speech = SpeechQueue(voice)
+    release = voice.holding("long answer")
+    cancelled = []
+    current = speech.say("long answer", on_cancel=lambda: cancelled.append("long answer"))
+    assert current.started.wait(1)
+    for text in ("one", "two"):
+        speech.say(text, on_cancel=lambda text=text: cancelled.append(text))
+    speech.flush()
+    assert cancelled == ["one", "two"] and not current.cancelled, "flush() leaves the current sentence"
+
+    queued = speech.say("three", on_cancel=lambda: cancelled.append("three"))
+    speech.interrupt()
+    assert queued.wait(1) and current.wait(1)
+    assert cancelled == ["one", "two", "three"], "on_cancel only runs for sentences that never started"
+    assert voice.stopped == ["long answer"] and voice.spoken == []
+    assert not current.success
+    release.set()
+    speech.stop()
+
+
+def test_handles_can_be_waited_on():
+    voice = FakeVoice()
+    speech = SpeechQueue(voice)
+    release = voice.holding("hello")
+    ended = []
+    handle = speech.say("hello", on_end=lambda: ended.append(True))
+    assert not handle.wait(0.05), "still speaking"
+    release.set()
+    assert handle.wait(1) and handle.success and ended == [True]
+    speech.stop()
+
+
+def test_idle_work_does_not_keep_the_queue_busy():
+    voice = FakeVoice()
+    speech = SpeechQueue(voice)
+    render = voice.holding("render a phrase")
+    speech.say("render a phrase", priority=speech_queue.IDLE)
+    assert not speech.speaking
+    started = time.time()
+    assert speech.wait_idle(timeout=1)
+    assert time.time() - started < 0.5, "waited for the background render"
+
+    release = voice.holding("answer")
+    answer = speech.say("answer")
+    assert speech.speaking
+    assert not speech.wait_idle(timeout=0.05)
+    release.set()
+    render.set()
+    assert speech.wait_idle(timeout=1) and answer.done.is_set()
+    assert not speech.speaking
+    speech.stop()
+
+
+def main():
+    """Run all speech queue tests and print a summary"""
+    print("\n🧪 JARVIS SPEECH QUEUE TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_sentences_are_spoken_by_priority,
+        test_flush_and_interrupt_cancel_queued_sentences,
+        test_handles_can_be_waited_on,
+        test_idle_work_does_not_keep_the_queue_busy,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
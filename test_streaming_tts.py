@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for Jarvis chunked speech
+Drives the chunk pipeline with fake render and play functions and checks
+the sentence splitting, that rendering overlaps playback, and that the
+rest of an answer is dropped when it is cancelled.
+"""
+
+import os
+import threading
+import time
+
+import streaming_tts
+
+
+class FakeVoice(object):
+    """Renders and plays chunks by sleeping, recording what happened when"""
+
+    def __init__(self, render_time=0.05, play_time=0.05):
+        self.render_time = render_time
+        self.play_time = play_time
+        self.events = []
+        self.played = []
+        self.paths = []
+
+    def render(self, text, path):
+        self.events.append(("render", text, time.perf_counter()))
+        self.paths.append(path)
+        time.sleep(self.render_time)
+        with open(path, "w") as f:
+            f.write(text)
+
+    def play(self, path, cancelled):
+        with open(path) as f:
+            text = f.read()
+        self.events.append(("play", text, time.perf_counter()))
+        deadline = time.perf_counter() + self.play_time
+        while time.perf_counter() < deadline and not cancelled():
+            time.sleep(0.005)
+        self.played.append(text)
+        return True
+
+
+def test_split_chunks():
+    text = "Total disk space: 252.0 GB\nUsed space: 17.7 GB\n\nOk. Disk usage is at 7.0% now! Anything else?"
+    assert streaming_tts.split_chunks(text) == [
+        "Total disk space: 252.0 GB",
+        "Used space: 17.7 GB Ok.",
+        "Disk usage is at 7.0% now!",
+        "Anything else?",
+    ]
+    assert streaming_tts.split_chunks("Hi.") == ["Hi."]
+    assert streaming_tts.split_chunks("  \n ") == []
+
+
+def test_chunks_play_in_order_and_files_are_removed():
+    voice = FakeVoice(render_time=0.0, play_time=0.0)
+    pipeline = streaming_tts.ChunkPipeline(voice.render, voice.play)
+    chunks = [f"Sentence number {n}." for n in range(6)]
+    assert pipeline.speak(chunks) is True
+    assert voice.played == chunks and pipeline.chunks_played == 6
+    assert not os.path.exists(os.path.dirname(voice.paths[0])), "chunk files should be removed"
+
+
+def test_rendering_overlaps_playback():
+    voice = FakeVoice(render_time=0.05, play_time=0.1)
+    pipeline = streaming_tts.ChunkPipeline(voice.render, voice.play)
+    started = time.perf_counter()
+    pipeline.speak(["first chunk of it", "second chunk of it", "third chunk of it"])
+    elapsed = time.perf_counter() - started
+    # Sequential would be 3 * (0.05 + 0.1) = 0.45 s; pipelined is about 0.05 + 3 * 0.1
+    assert elapsed < 0.42, f"took {elapsed:.2f} s"
+    assert pipeline.first_audio < 0.09, f"first audio after {pipeline.first_audio:.3f} s"
+    renders = [when for kind, _, when in voice.events if kind == "render"]
+    plays = [when for kind, _, when in voice.events if kind == "play"]
+    assert renders[1] < plays[0] + 0.1, "chunk 2 should render while chunk 1 plays"
+
+
+def test_cancel_drops_the_rest():
+    voice = FakeVoice(render_time=0.01, play_time=0.2)
+    pipeline = streaming_tts.ChunkPipeline(voice.render, voice.play)
+    stop = threading.Event()
+    threading.Timer(0.1, stop.set).start()
+    started = time.perf_counter()
+    assert pipeline.speak([f"chunk {n} of the answer" for n in range(10)], cancelled=stop.is_set) is False
+    assert time.perf_counter() - started < 0.5
+    assert len(voice.played) == 1, voice.played
+
+
+def test_render_errors_propagate():
+    voice = FakeVoice(render_time=0.0, play_time=0.0)
+
+    def broken(text, path):
+        if text == "second":
+            raise IOError("engine died")
+        voice.render(text, path)
+
+    pipeline = streaming_tts.ChunkPipeline(broken, voice.play)
+    try:
+        pipeline.speak(["first", "second", "third"])
+        raise AssertionError("expected IOError")
+    except IOError:
+        pass
+    assert "third" not in voice.played
+
+
+def main():
+    """Run all chunked speech tests and print a summary"""
+    print("\n🧪 JARVIS CHUNKED SPEECH TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_split_chunks,
+        test_chunks_play_in_order_and_files_are_removed,
+        test_rendering_overlaps_playback,
+        test_cancel_drops_the_rest,
+        test_render_errors_propagate,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
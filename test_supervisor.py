@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis health supervisor
+Checks that only unhealthy components are restarted, with their causes
+counted, and that restarting the recognizer keeps its calibration.
+"""
+
+import threading
+import time
+
+import speech_queue
+from supervisor import Supervisor
+
+
+class Restarts(object):
+    """Counts restart calls per component"""
+
+    def __init__(self):
+        self.calls = []
+
+    def of(self, name):
+        return lambda: self.calls.append(name)
+
+
+def test_healthy_components_are_left_alone():
+    restarts = Restarts()
+    health = Supervisor()
+    health.register('microphone', restarts.of('microphone'), check=lambda: None, heartbeat_timeout=10)
+    health.register('http', restarts.of('http'), slo=1.0)
+    for _ in range(10):
+        health.observe('http', 0.1)
+    assert health.check() == []
+    assert restarts.calls == []
+
+
+def test_only_the_slow_component_is_restarted():
+    restarts = Restarts()
+    health = Supervisor()
+    health.register('recognizer', restarts.of('recognizer'), slo=1.0)
+    health.register('http', restarts.of('http'), slo=1.0)
+    for _ in range(10):
+        health.observe('recognizer', 0.2)
+        health.observe('http', 3.0)
+    restarted = health.check()
+    assert restarts.calls == ['http'], restarts.calls
+    assert restarted[0][0] == 'http' and "p95 latency" in restarted[0][1]
+    status = health.status()
+    assert status['http']['restarts'] == 1 and status['http']['causes'] == {'latency': 1}
+    assert status['recognizer']['restarts'] == 0
+
+
+def test_missed_heartbeat_and_hang_are_detected():
+    restarts = Restarts()
+    health = Supervisor()
+    health.register('microphone', restarts.of('microphone'), heartbeat_timeout=0.05)
+    health.register('voice', restarts.of('voice'), hang_timeout=0.05)
+    release = threading.Event()
+
+    def stuck():
+        with health.track('voice'):
+            release.wait(2)
+
+    thread = threading.Thread(target=stuck)
+    thread.start()
+    time.sleep(0.1)
+    health.check()
+    release.set()
+    thread.join()
+    assert sorted(restarts.calls) == ['microphone', 'voice'], restarts.calls
+    assert health.status()['voice']['causes'] == {'hang': 1}
+    # The abandoned call doesn't count against the restarted component
+    assert not health.components['voice'].latencies
+
+
+def test_restarts_respect_the_cooldown():
+    restarts = Restarts()
+    health = Supervisor(cooldown=60)
+    health.register('arduino', restarts.of('arduino'), check=lambda: "link thread stopped")
+    health.check()
+    health.check()
+    assert restarts.calls == ['arduino']
+    assert health.status()['arduino']['last_cause'] == "link thread stopped"
+
+
+def test_stuck_speech_thread_is_replaced():
+    release = threading.Event()
+    spoken = []
+
+    def speak(text, handle):
+        if text == "stuck":
+            release.wait(2)
+        spoken.append(text)
+        return True
+
+    speech = speech_queue.SpeechQueue(speak).start()
+    speech.say("stuck")
+    time.sleep(0.05)
+    speech.restart()
+    assert speech.say("hello").wait(1), "new worker didn't speak"
+    release.set()
+    time.sleep(0.05)
+    assert spoken == ["hello", "stuck"], spoken
+    speech.stop()
+
+
+def test_recognizer_restart_keeps_calibration():
+    import main
+    main.get_listener().energy_threshold = 1234
+    old = main.listener
+    main.restart_recognizer()
+    assert main.listener is not old
+    assert main.listener.energy_threshold == 1234
+    assert main.recognition is None
+
+
+def main():
+    """Run all supervisor tests and print a summary"""
+    print("\n🧪 JARVIS SUPERVISOR TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_healthy_components_are_left_alone,
+        test_only_the_slow_component_is_restarted,
+        test_missed_heartbeat_and_hang_are_detected,
+        test_restarts_respect_the_cooldown,
+        test_stuck_speech_thread_is_replaced,
+        test_recognizer_restart_keeps_calibration,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
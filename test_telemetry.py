@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for Jarvis telemetry
+Checks the per-metric cache, the background sampler and the /sys battery
+reader, using fake readers and a fake power supply directory.
+"""
+
+import os
+import tempfile
+import time
+
+import telemetry
+
+
+class CountingReader(object):
+    """A reader that counts how often it was called"""
+
+    def __init__(self, value="reading"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_readings_are_cached_for_their_ttl():
+    reader = CountingReader()
+    sensors = telemetry.Telemetry(readers={'battery': reader}, ttl={'battery': 60})
+    for _ in range(5):
+        assert sensors.get('battery') == "reading"
+    assert reader.calls == 1
+    assert sensors.hits == 4 and sensors.misses == 1
+
+
+def test_expired_reading_is_read_again():
+    reader = CountingReader()
+    sensors = telemetry.Telemetry(readers={'battery': reader}, ttl={'battery': 0.05})
+    sensors.get('battery')
+    time.sleep(0.1)
+    sensors.get('battery')
+    assert reader.calls == 2
+
+
+def test_sampler_keeps_the_cache_warm():
+    reader = CountingReader()
+    readers = dict((metric, CountingReader()) for metric in telemetry.READERS)
+    readers['network'] = reader
+    sensors = telemetry.Telemetry(readers=readers, ttl={'network': 0.2}).start(interval=0.02)
+    time.sleep(0.3)
+    calls = reader.calls
+    sensors.get('network')
+    sensors.stop()
+    assert calls >= 2, calls
+    assert reader.calls == calls, "get() had to read instead of using the sampled value"
+
+
+def test_battery_is_read_from_sys():
+    root = tempfile.mkdtemp()
+    battery = os.path.join(root, "BAT0")
+    os.mkdir(battery)
+    for name, value in (("capacity", "42"), ("status", "Discharging"), ("energy_now", "20000000"), ("power_now", "10000000")):
+        with open(os.path.join(battery, name), "w") as f:
+            f.write(value + "\n")
+    psutil, power_supply = telemetry._psutil, telemetry.POWER_SUPPLY
+    telemetry._psutil, telemetry.POWER_SUPPLY = (lambda: None), root
+    try:
+        assert telemetry.read_battery() == telemetry.Battery(42, False, 7200)
+        os.rename(battery, os.path.join(root, "AC"))
+        assert telemetry.read_battery() is None
+    finally:
+        telemetry._psutil, telemetry.POWER_SUPPLY = psutil, power_supply
+
+
+def main():
+    """Run all telemetry tests and print a summary"""
+    print("\n🧪 JARVIS TELEMETRY TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_readings_are_cached_for_their_ttl,
+        test_expired_reading_is_read_again,
+        test_sampler_keeps_the_cache_warm,
+        test_battery_is_read_from_sys,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for Jarvis tracing
+Checks the span histograms and their percentiles, that durations added in
+batches land in the same buckets as one by one, that a disabled tracer
+records nothing, the Prometheus text served by the local endpoint, and
+that replayed commands produce the expected spans.
+"""
+
+import contextlib
+import io
+import time
+import urllib.error
+import urllib.request
+
+import tracing
+
+
+def test_spans_fill_histograms():
+    tracer = tracing.Tracer(enabled=True)
+    for _ in range(3):
+        with tracer.span('handler', intent='weather'):
+            time.sleep(0.002)
+    tracer.observe('recognize', 0.3, backend='google')
+    tracer.observe('recognize', 0.7, backend='google')
+    handler = tracer.histograms[('handler', (('intent', 'weather'),))]
+    assert handler.count == 3 and 0.002 <= handler.max < 0.05
+    recognize = tracer.histograms[('recognize', (('backend', 'google'),))]
+    assert 0.25 <= recognize.percentile(50) <= 0.5, "p50 lies in the bucket of the 0.3 s observation"
+    assert recognize.percentile(99) == 0.7, "estimates never exceed the slowest observation"
+    assert "handler intent=weather" in tracer.format_report()
+
+
+def test_batched_durations_match_one_by_one():
+    durations = [0.0001 * (i % 50) for i in range(tracing.FOLD_EVERY * 2 + 7)] + [0.0005, 0.001, 20.0]
+    tracer = tracing.Tracer(enabled=True)
+    for seconds in durations:
+        tracer.observe('http', seconds, endpoint='weather')
+    expected = tracing.Histogram()
+    for seconds in durations:
+        expected.add(seconds)
+    batched = tracer.histograms[('http', (('endpoint', 'weather'),))]
+    assert batched.counts == expected.counts and batched.count == len(durations)
+    assert abs(batched.sum - expected.sum) < 1e-9 and batched.max == 20.0
+    tracer.histograms = {}
+    assert tracer.snapshot() == {}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = tracing.Tracer()
+    with tracer.span('capture') as span:
+        pass
+    tracer.observe('http', 1.0, endpoint='weather')
+    assert span is tracing.NO_SPAN and tracer.histograms == {}
+    try:
+        with tracer.span('handler'):
+            raise KeyError("boom")
+    except KeyError:
+        pass
+
+
+def test_metrics_endpoint_is_local_prometheus_text():
+    tracer = tracing.Tracer(enabled=True)
+    tracer.observe('http', 0.004, endpoint='wea"ther')
+    tracer.observe('http', 20.0, endpoint='wea"ther')
+    try:
+        tracer.serve(0, host="0.0.0.0")
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    server = tracer.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        text = urllib.request.urlopen(url + "/metrics", timeout=2).read().decode()
+        try:
+            urllib.request.urlopen(url + "/", timeout=2)
+            raise AssertionError("expected 404")
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+    finally:
+        tracer.stop_serving()
+    assert "# TYPE jarvis_span_seconds histogram" in text
+    assert 'jarvis_span_seconds_bucket{span="http",endpoint="wea\\"ther",le="0.005"} 1' in text
+    assert 'jarvis_span_seconds_bucket{span="http",endpoint="wea\\"ther",le="+Inf"} 2' in text
+    assert 'jarvis_span_seconds_count{span="http",endpoint="wea\\"ther"} 2' in text
+
+
+def test_replayed_commands_are_traced():
+    import input_sources
+    import replay_benchmark
+    tracer = tracing.get_tracer()
+    tracer.enabled, tracer.histograms = True, {}
+    try:
+        source = input_sources.TranscriptSource(["jarvis what time is it", "jarvis what's the weather in paris"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            replay_benchmark.replay(source, timeout_per_command=5)
+    finally:
+        tracer.enabled = False
+    names = set(name for name, labels in tracer.histograms)
+    assert {'recognize', 'intent_match', 'handler'} <= names, names
+    assert tracer.histograms[('handler', (('intent', 'weather'),))].count == 1
+
+
+def main():
+    """Run all tracing tests and print a summary"""
+    print("\n🧪 JARVIS TRACING TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_spans_fill_histograms,
+        test_batched_durations_match_one_by_one,
+        test_disabled_tracer_records_nothing,
+        test_metrics_endpoint_is_local_prometheus_text,
+        test_replayed_commands_are_traced,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
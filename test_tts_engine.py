@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis TTS engine manager
+Builds engines with a fake init() and checks the backoff after a fault,
+that a rebuild never hands back the stuck engine, and when the cached
+voice and the phrase recordings made with it go stale.
+"""
+
+import collections
+import itertools
+import json
+import os
+import tempfile
+import time
+
+import pyttsx3
+
+import phrase_cache
+import tts_engine
+from tts_engine import EngineManager
+
+Voice = collections.namedtuple('Voice', ['id', 'name'])
+
+VOICES = [Voice("english", "English"), Voice("karen", "Karen"), Voice("daniel", "Daniel")]
+DRIVERS = itertools.count()
+
+
+class FakeEngine(object):
+    """Implements the pyttsx3 calls the manager and speak() use"""
+
+    def __init__(self, voices=VOICES):
+        self.voices = list(voices)
+        self.properties = {'rate': 200, 'volume': 1.0, 'voice': None}
+        self.enumerations = 0
+        self.stopped = 0
+        self._connects = {}
+
+    def getProperty(self, name):
+        if name == 'voices':
+            self.enumerations += 1
+            return self.voices
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        if name == 'voice' and value not in [voice.id for voice in self.voices]:
+            raise ValueError(f"no voice {value}")
+        self.properties[name] = value
+
+    def connect(self, topic, cb):
+        self._connects.setdefault(topic, []).append(cb)
+        return {'topic': topic, 'cb': cb}
+
+    def stop(self):
+        self.stopped += 1
+
+
+def registry_init(voices=VOICES):
+    """An init() that, like pyttsx3.init(), reuses the engine it registered while it is alive"""
+    driver = f"fake-driver-{next(DRIVERS)}"  # one per manager, so tests don't share engines
+
+    def init():
+        engine = pyttsx3._activeEngines.get(driver)
+        if engine is None:
+            engine = FakeEngine(voices)
+            pyttsx3._activeEngines[driver] = engine
+        return engine
+    return init
+
+
+def make_manager(config=None, **kwargs):
+    directory = tempfile.mkdtemp()
+    config_file = os.path.join(directory, "voice.json")
+    if config is not None:
+        with open(config_file, 'w') as f:
+            json.dump(config, f)
+    kwargs.setdefault('init', registry_init())
+    return EngineManager(config_file, os.path.join(directory, "cache.json"), **kwargs)
+
+
+def test_faults_back_off_exponentially():
+    manager = make_manager(backoff_base=10.0, backoff_max=30.0)
+    engine = manager.get()
+    assert engine is not None and manager.get() is engine and manager.builds == 1
+    delays = []
+    for _ in range(3):
+        manager.report_fault(RuntimeError("run loop already started"))
+        assert manager.get() is None, "no rebuild while backing off"
+        delays.append(round(manager.retry_at - time.time()))
+        manager.retry_at = 0.0
+        manager.get()
+    assert delays == [10, 20, 30], delays
+    manager.report_success()
+    manager.report_fault()
+    assert round(manager.retry_at - time.time()) == 10
+
+
+def test_failed_builds_back_off_too():
+    def broken():
+        raise RuntimeError("no audio device")
+    manager = make_manager(init=broken, backoff_base=10.0)
+    assert manager.get() is None and manager.failures == 1
+    assert manager.get() is None and manager.failures == 1, "the next try waits for the backoff"
+
+
+def test_rebuild_does_not_return_the_stuck_engine():
+    manager = make_manager(backoff_base=0.0)
+    stuck = manager.get()
+    # speak()'s barge-in callback, still connected because runAndWait() never returned
+    stuck.connect('started-word', lambda name, location, length: stuck.stop())
+    manager.report_fault(RuntimeError("runAndWait timed out"))
+    rebuilt = manager.get()
+    assert rebuilt is not None and rebuilt is not stuck
+    assert stuck.stopped == 1 and stuck._connects == {}
+    assert manager.builds == 2
+    manager.report_fault()
+
+
+def test_cached_voice_skips_enumeration_until_stale():
+    manager = make_manager({'voice_id': "daniel"})
+    first = manager.get()
+    assert manager.voice_id == "daniel" and first.enumerations == 1
+    manager.report_fault()
+
+    manager = EngineManager(manager.config_file, manager.cache_file, init=lambda: FakeEngine())
+    engine = manager.get()
+    assert manager.voice_id == "daniel" and engine.enumerations == 0, "voice came from the cache"
+
+    # select_voice.py saved another voice: the config changed, so the cache is stale
+    with open(manager.config_file, 'w') as f:
+        json.dump({'voice_id': "karen"}, f)
+    manager = EngineManager(manager.config_file, manager.cache_file, init=lambda: FakeEngine())
+    engine = manager.get()
+    assert manager.voice_id == "karen" and engine.enumerations == 1
+
+    # An old cache entry is checked again
+    with open(manager.cache_file) as f:
+        cache = json.load(f)
+    cache['resolved_at'] -= tts_engine.CACHE_MAX_AGE + 1
+    with open(manager.cache_file, 'w') as f:
+        json.dump(cache, f)
+    manager = EngineManager(manager.config_file, manager.cache_file, init=lambda: FakeEngine())
+    assert manager.get().enumerations == 1
+
+
+def test_uninstalled_cached_voice_is_resolved_again():
+    manager = make_manager()
+    manager.get()
+    assert manager.voice_id == "karen", "the first female voice"
+    manager.report_fault()
+    others = [voice for voice in VOICES if voice.id != "karen"]
+    manager = EngineManager(manager.config_file, manager.cache_file, init=lambda: FakeEngine(others))
+    engine = manager.get()
+    assert manager.voice_id == "daniel" and engine.enumerations == 1
+
+
+def test_phrase_recordings_go_stale_with_the_voice():
+    manager = make_manager({'voice_id': "daniel"}, backoff_base=0.0)
+    cache = phrase_cache.PhraseCache(tempfile.mkdtemp())
+    cache.add("Yes sir?")
+    cache.configure_from(manager.get())
+    old_path = cache.path_for("Yes sir?")
+    with open(old_path, 'wb') as f:
+        f.write(b"RIFF")
+    assert cache.lookup("Yes sir?") == old_path and cache.missing() == []
+
+    with open(manager.config_file, 'w') as f:
+        json.dump({'voice_id': "english"}, f)
+    manager.report_fault()
+    cache.configure_from(manager.get())
+    assert cache.lookup("Yes sir?") is None, "recorded with the old voice"
+    assert cache.missing() == ["Yes sir?"]
+    manager.report_fault()
+
+
+def main():
+    """Run all TTS engine manager tests and print a summary"""
+    print("\n🧪 JARVIS TTS ENGINE TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_faults_back_off_exponentially,
+        test_failed_builds_back_off_too,
+        test_rebuild_does_not_return_the_stuck_engine,
+        test_cached_voice_skips_enumeration_until_stale,
+        test_uninstalled_cached_voice_is_resolved_again,
+        test_phrase_recordings_go_stale_with_the_voice,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the Jarvis wake word spotter
+Checks the open-end DTW matcher on synthetic MFCC sequences, and feeds
+the streaming detector synthetic tones: a "keyword" followed by a command
+is detected with only the command left over, other sounds are not.
+"""
+
+import tempfile
+
+import numpy as np
+
+import wake_word
+from wake_word import WakeWordDetector, dtw_prefix_distance
+
+RATE = 16000
+FRAME_SAMPLES = 320               # 20 ms frames
+ENERGY_THRESHOLD = 300
+
+
+def features(frames, seed):
+    """A random MFCC-like sequence"""
+    return np.random.default_rng(seed).normal(size=(frames, wake_word.MFCC_COUNT))
+
+
+def tones(frequencies, seconds):
+    """16-bit PCM stepping through frequencies, like syllables"""
+    parts = []
+    for frequency in frequencies:
+        t = np.arange(int(RATE * seconds / len(frequencies))) / RATE
+        parts.append(np.sin(2 * np.pi * frequency * t))
+    return (np.concatenate(parts) * 8000).astype('<i2').tobytes()
+
+
+def noise(seconds, level, seed=0):
+    return (np.random.default_rng(seed).normal(size=int(RATE * seconds)) * level).astype('<i2').tobytes()
+
+
+def frames(pcm):
+    size = FRAME_SAMPLES * 2
+    return [pcm[i:i + size] for i in range(0, len(pcm), size)]
+
+
+KEYWORD = tones([300, 600, 1200, 2400], 0.4)
+COMMAND = tones([2000, 500, 1500], 0.6)
+
+
+def make_detector():
+    detector = WakeWordDetector(RATE, template_dir=tempfile.mkdtemp())
+    assert not detector.ready
+    detector.templates = [wake_word.mfcc(KEYWORD, RATE)]
+    detector.max_segment_seconds = len(detector.templates[0]) * 1.6 * wake_word.STEP_SECONDS + wake_word.WINDOW_SECONDS
+    return detector
+
+
+def test_dtw_matches_a_noisy_copy():
+    template = features(40, seed=1)
+    segment = np.vstack([template + 0.1 * features(40, seed=2), features(20, seed=3)])
+    distance, end = dtw_prefix_distance(template, segment)
+    assert distance < wake_word.DEFAULT_THRESHOLD, distance
+    assert abs(end - 40) <= 2, "the match ends where the keyword does"
+
+
+def test_dtw_rejects_a_different_sequence():
+    distance, end = dtw_prefix_distance(features(40, seed=1), features(60, seed=4))
+    assert distance > wake_word.DEFAULT_THRESHOLD, distance
+    assert dtw_prefix_distance(features(40, seed=1), features(0, seed=4)) == (float('inf'), 0)
+
+
+def test_dtw_end_is_open_for_slower_speech():
+    template = features(40, seed=1)
+    slow = np.repeat(template, 3, axis=0)[::2]  # spoken 1.5 times slower
+    segment = np.vstack([slow, features(30, seed=5)])
+    distance, end = dtw_prefix_distance(template, segment)
+    assert distance < wake_word.DEFAULT_THRESHOLD, distance
+    assert abs(end - len(slow)) <= 3
+    # Far too short to be the keyword
+    assert dtw_prefix_distance(template, template[:20])[0] == float('inf')
+
+
+def test_feed_detects_the_keyword_and_keeps_the_command():
+    detector = make_detector()
+    fed = frames(noise(0.2, 20)) + frames(KEYWORD) + frames(COMMAND)
+    keyword_end = len(frames(noise(0.2, 20))) + len(frames(KEYWORD))
+    for index, frame in enumerate(fed):
+        remainder = detector.feed(frame, ENERGY_THRESHOLD)
+        if remainder is not None:
+            break
+    else:
+        raise AssertionError(f"keyword not detected (distance {detector.last_distance})")
+    assert detector.last_distance < detector.threshold
+    assert remainder and remainder == fed[index + 1 - len(remainder):index + 1]
+    assert index + 1 - len(remainder) >= keyword_end - 1, "keyword audio was left in the command"
+    assert detector.segment == [], "the detector starts over"
+
+
+def test_feed_ignores_other_sounds():
+    detector = make_detector()
+    for frame in frames(noise(0.2, 20)) + frames(noise(0.5, 3000, seed=1)) + frames(noise(0.5, 20)):
+        assert detector.feed(frame, ENERGY_THRESHOLD) is None
+    assert detector.last_distance > detector.threshold
+    assert detector.segment == [] and not detector.waiting_for_silence
+
+
+def main():
+    """Run all wake word tests and print a summary"""
+    print("\n🧪 JARVIS WAKE WORD TEST 🧪")
+    print("=" * 50)
+    tests = [
+        test_dtw_matches_a_noisy_copy,
+        test_dtw_rejects_a_different_sequence,
+        test_dtw_end_is_open_for_slower_speech,
+        test_feed_detects_the_keyword_and_keeps_the_command,
+        test_feed_ignores_other_sounds,
+    ]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("-" * 50)
+    print(f"{len(tests) - failures}/{len(tests)} tests passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
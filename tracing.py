@@ -0,0 +1,276 @@
+"""
+Tracing for Jarvis
+Times the steps of every turn (capture, calibration, recognition, intent
+matching, handlers, web requests, speech and serial writes) as spans and
+keeps a histogram per span in memory. The histograms are printed as a
+report (main.py --profile) or served in the Prometheus text format from a
+local-only endpoint (main.py --metrics-port 9464).
+
+Tracing is off until enabled; a disabled span costs one attribute check.
+An enabled span only appends its duration to a list per span; the lists
+are sorted into the histogram buckets in batches and whenever they are read.
+"""
+
+import bisect                     # for finding histogram buckets
+import threading                  # for the histogram lock and the endpoint thread
+import time                       # for span timing
+
+# Upper bounds of the histogram buckets in seconds (Prometheus "le" labels)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC = "jarvis_span_seconds"
+METRICS_PORT = 9464
+FOLD_EVERY = 256                  # durations a span collects before they go into its histogram
+LOOPBACK = ("127.0.0.1", "localhost")
+
+
+class Histogram(object):
+    """Counts per bucket plus count, sum and maximum of the observed durations"""
+
+    __slots__ = ('counts', 'count', 'sum', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def add_batch(self, values):
+        """Add many durations at once (sorts values)"""
+        if not values:
+            return
+        values.sort()
+        start = 0
+        for index, bound in enumerate(BUCKETS):
+            end = bisect.bisect_right(values, bound, start)
+            self.counts[index] += end - start
+            start = end
+        self.counts[-1] += len(values) - start
+        self.count += len(values)
+        self.sum += sum(values)
+        if values[-1] > self.max:
+            self.max = values[-1]
+
+    def percentile(self, p):
+        """Estimate like Prometheus' histogram_quantile(): interpolated inside the bucket"""
+        if not self.count:
+            return None
+        rank = p / 100.0 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(BUCKETS):
+                    return self.max
+                lower = BUCKETS[index - 1] if index else 0.0
+                estimate = lower + (BUCKETS[index] - lower) * (rank - seen) / count
+                return min(estimate, self.max)
+            seen += count
+        return self.max
+
+    def copy(self):
+        other = Histogram()
+        other.counts = list(self.counts)
+        other.count, other.sum, other.max = self.count, self.sum, self.max
+        return other
+
+
+class _Span(object):
+    """Context manager that adds its duration to the span's samples on exit"""
+
+    __slots__ = ('tracer', 'samples', 'started')
+
+    def __init__(self, tracer, samples):
+        self.tracer = tracer
+        self.samples = samples
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        samples = self.samples
+        samples.append(time.perf_counter() - self.started)
+        if len(samples) >= FOLD_EVERY:
+            self.tracer._fold()
+
+
+class _NoSpan(object):
+    """What span() returns while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+def _key(name, labels):
+    if len(labels) > 1:
+        return name, tuple(sorted(labels.items()))
+    return name, tuple(labels.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Tracer(object):
+    """Per-span latency histograms, keyed by span name and labels"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._samples = {}            # durations per key not yet in a histogram
+        self.started = time.time()
+        self.server = None
+        self.collectors = []          # callables returning more metrics in the text format
+        self._lock = threading.Lock()
+
+    def span(self, name, **labels):
+        """Time a block: with tracer.span('handler', intent='weather'): ..."""
+        if not self.enabled:
+            return NO_SPAN
+        return _Span(self, self._samples_for(_key(name, labels)))
+
+    def observe(self, name, seconds, **labels):
+        """Add a duration that was measured elsewhere"""
+        if self.enabled:
+            self._add(_key(name, labels), seconds)
+
+    @property
+    def histograms(self):
+        """{(name, labels): Histogram} with every duration recorded so far"""
+        self._fold()
+        return self._histograms
+
+    @histograms.setter
+    def histograms(self, histograms):
+        with self._lock:
+            self._samples = {}
+            self._histograms = histograms
+
+    def _samples_for(self, key):
+        # dict.setdefault and list.append are atomic, so spans record without taking the lock
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples.setdefault(key, [])
+        return samples
+
+    def _add(self, key, seconds):
+        samples = self._samples_for(key)
+        samples.append(seconds)
+        if len(samples) >= FOLD_EVERY:
+            self._fold()
+
+    def _fold(self):
+        with self._lock:
+            for key, samples in list(self._samples.items()):
+                batch = samples[:]
+                if not batch:
+                    continue
+                del samples[:len(batch)]  # durations appended meanwhile stay for the next fold
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = Histogram()
+                histogram.add_batch(batch)
+
+    def snapshot(self):
+        """A consistent copy of all histograms"""
+        self._fold()
+        with self._lock:
+            return dict((key, histogram.copy()) for key, histogram in self._histograms.items())
+
+    def format_prometheus(self):
+        """All histograms in the Prometheus text exposition format"""
+        lines = [f"# HELP {METRIC} Time spent in each step of a Jarvis turn",
+                 f"# TYPE {METRIC} histogram"]
+        for (name, labels), histogram in sorted(self.snapshot().items()):
+            label_text = ",".join([f'span="{_escape(name)}"'] + [f'{k}="{_escape(v)}"' for k, v in labels])
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float('inf'),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else f"{bound:g}"
+                lines.append(f'{METRIC}_bucket{{{label_text},le="{le}"}} {cumulative}')
+            lines.append(f"{METRIC}_sum{{{label_text}}} {histogram.sum:.6f}")
+            lines.append(f"{METRIC}_count{{{label_text}}} {histogram.count}")
+        text = "\n".join(lines) + "\n"
+        for collect in self.collectors:
+            text += collect()
+        return text
+
+    def format_report(self):
+        """Per-span latency table in milliseconds"""
+        histograms = self.snapshot()
+        lines = [f"Span latency (ms) over {time.time() - self.started:.0f} s:",
+                 f"  {'span':<34}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'total s':>9}"]
+        if not histograms:
+            lines.append("  nothing traced")
+        for (name, labels), histogram in sorted(histograms.items()):
+            label = name + "".join(f" {k}={v}" for k, v in labels)
+            p50, p95, p99 = (histogram.percentile(p) * 1000 for p in (50, 95, 99))
+            lines.append(f"  {label:<34}{histogram.count:>7}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}"
+                         f"{histogram.max * 1000:>9.1f}{histogram.sum:>9.2f}")
+        return "\n".join(lines)
+
+    def serve(self, port=METRICS_PORT, host="127.0.0.1"):
+        """Serve /metrics on a background thread; only loopback addresses are allowed"""
+        import http.server            # for the metrics endpoint (only loaded when serving)
+
+        if host not in LOOPBACK:
+            raise ValueError(f"The metrics endpoint only listens on the local machine, not on {host}")
+        tracer = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = tracer.format_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes would flood the console
+
+        self.server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True).start()
+        return self.server
+
+    def stop_serving(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    """The process-wide tracer"""
+    return _tracer
+
+
+def span(name, **labels):
+    """Time a block with the process-wide tracer"""
+    return _tracer.span(name, **labels)
+
+
+def observe(name, seconds, **labels):
+    """Add a measured duration to the process-wide tracer"""
+    _tracer.observe(name, seconds, **labels)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tracing overhead benchmark for Jarvis
+Measures what a span costs with tracing off and on, counts the spans a
+replayed turn produces, and checks that tracing adds less than 1% to the
+measured headless replay turn, where nothing waits on I/O. Real turns also
+wait for a recognizer call, which is shown for comparison.
+
+Usage:
+    python tracing_benchmark.py [--corpus command_log.txt] [--iterations 200000]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import input_sources
+import replay_benchmark
+import tracing
+from runtime_benchmark import RECOGNIZER_SECONDS
+
+BUDGET = 0.01                     # tracing may add at most 1% to a turn
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def span_cost(tracer, iterations):
+    """Seconds per span (enter, exit and recording) with labels like the handler span"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with tracer.span('handler', intent='weather'):
+            pass
+    return (time.perf_counter() - started) / iterations
+
+
+def replay_turns(transcripts, enabled):
+    """Replay the corpus with tracing on or off; returns (turn times in seconds, spans recorded)"""
+    tracer = tracing.get_tracer()
+    tracer.enabled, tracer.histograms = enabled, {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        results, _ = replay_benchmark.replay(input_sources.TranscriptSource(transcripts))
+    spans = sum(histogram.count for histogram in tracer.histograms.values())
+    tracer.enabled = False
+    return [result['turn'] / 1000.0 for result in results if 'turn' in result], spans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that tracing costs less than 1% of a turn")
+    parser.add_argument("--corpus", default="command_log.txt", help="commands to replay")
+    parser.add_argument("--iterations", type=int, default=200000, help="spans timed per measurement")
+    args = parser.parse_args()
+
+    print_header("Jarvis Tracing Overhead Benchmark")
+
+    disabled = span_cost(tracing.Tracer(enabled=False), args.iterations)
+    enabled = span_cost(tracing.Tracer(enabled=True), args.iterations)
+    print(f"span cost: {disabled * 1e6:.2f} µs off, {enabled * 1e6:.2f} µs on")
+
+    transcripts = input_sources.load_transcripts(args.corpus)
+    if not transcripts:
+        print(f"❌ No commands in {args.corpus}")
+        return 1
+    replay_turns(transcripts, False)  # warm up imports and caches
+    off, _ = replay_turns(transcripts, False)
+    on, spans = replay_turns(transcripts, True)
+    per_turn = spans / max(1, len(on))
+    added = per_turn * (enabled - disabled)
+    replay_turn = replay_benchmark.percentile(off, 50)
+    print(f"{per_turn:.1f} spans per turn, {added * 1e6:.1f} µs added per turn")
+    print(f"replay turn p50: {replay_turn * 1000:.2f} ms off, {replay_benchmark.percentile(on, 50) * 1000:.2f} ms on")
+
+    real_share = added / RECOGNIZER_SECONDS
+    replay_share = added / replay_turn
+    print(f"\noverhead on a headless replay turn: {replay_share * 100:.2f}%")
+    print(f"overhead on a turn with a {RECOGNIZER_SECONDS * 1000:.0f} ms recognizer call: {real_share * 100:.3f}%")
+
+    passed = replay_share < BUDGET
+    if passed:
+        print(f"\n✅ Tracing stays under {BUDGET * 100:.0f}% of a replayed turn")
+    else:
+        print(f"\n❌ Tracing costs more than {BUDGET * 100:.0f}% of a replayed turn")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,191 @@
+"""
+Text-to-speech engine manager for Jarvis
+Owns the single pyttsx3 engine used for the whole process. The voice is
+resolved once from jarvis_voice_config.json and the result is cached on
+disk, so later startups don't have to enumerate the installed voices.
+The engine is only rebuilt after a fault, with exponential backoff.
+"""
+
+import json                       # for the config and cache files
+import os                         # for file paths
+import platform                   # for the cache key
+import threading                  # for the engine lock
+import time                       # for backoff timing
+
+import pyttsx3                    # offline Text to Speech
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(BASE_DIR, "jarvis_voice_config.json")
+CACHE_FILE = os.path.join(BASE_DIR, ".jarvis_voice_cache.json")
+
+# Preferred voices when the config doesn't name one (Siri-like female voices first)
+FEMALE_NAMES = ["karen", "samantha", "siri", "moira", "tessa", "fiona", "female", "woman", "girl"]
+
+DEFAULT_RATE = 170     # slightly slower for clarity
+DEFAULT_VOLUME = 1.0
+CACHE_MAX_AGE = 30 * 24 * 3600  # re-check the installed voices at least monthly
+
+
+def load_voice_config(config_file=CONFIG_FILE):
+    """Read the saved voice preference, returning an empty dict if there is none"""
+    try:
+        with open(config_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error loading voice config: {e}")
+        return {}
+
+
+class EngineManager(object):
+    """Creates, configures and reuses one TTS engine"""
+
+    def __init__(self, config_file=CONFIG_FILE, cache_file=CACHE_FILE, init=None,
+                 backoff_base=0.5, backoff_max=30.0):
+        self.config_file = config_file
+        self.cache_file = cache_file
+        self.init = init or pyttsx3.init
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.engine = None
+        self.voice_id = None
+        self.failures = 0
+        self.retry_at = 0.0
+        self.builds = 0
+        self._lock = threading.RLock()
+
+    def get(self):
+        """Return the shared engine, building it if needed (None while backing off)"""
+        with self._lock:
+            if self.engine is not None:
+                return self.engine
+            if time.time() < self.retry_at:
+                return None
+            try:
+                self.engine = self._build()
+            except Exception as e:
+                print(f"Error initializing TTS engine: {e}")
+                self._schedule_retry()
+            return self.engine
+
+    def report_fault(self, error=None):
+        """Drop the engine after a failure so the next get() rebuilds it (after a backoff)"""
+        with self._lock:
+            if error is not None:
+                print(f"Voice engine fault: {error}")
+            engine, self.engine = self.engine, None
+            self._schedule_retry()
+        if engine is not None:
+            self._discard(engine)
+
+    def _discard(self, engine):
+        """Stop a faulty engine and make sure the next init() builds a new one
+
+        pyttsx3.init() hands back the engine it keeps per driver for as long
+        as anything references it, and a stuck speech thread and its
+        callbacks still do, so the engine is unregistered explicitly.
+        """
+        try:
+            engine.stop()
+        except Exception:
+            pass
+        connects = getattr(engine, '_connects', None)
+        if isinstance(connects, dict):
+            connects.clear()  # e.g. speak()'s barge-in callback, which holds on to the engine
+        active = getattr(pyttsx3, '_activeEngines', {})
+        for driver, cached in list(active.items()):
+            if cached is engine:
+                active.pop(driver, None)
+
+    def report_success(self):
+        """Reset the backoff after the engine spoke successfully"""
+        self.failures = 0
+
+    def _schedule_retry(self):
+        self.failures += 1
+        delay = min(self.backoff_base * (2 ** (self.failures - 1)), self.backoff_max)
+        self.retry_at = time.time() + delay
+
+    def _build(self):
+        """Create and configure a new engine"""
+        print("🔊 Initializing text-to-speech engine...")
+        engine = self.init()
+        self.builds += 1
+        config = load_voice_config(self.config_file)
+        engine.setProperty('rate', config.get('rate', DEFAULT_RATE))
+        engine.setProperty('volume', config.get('volume', DEFAULT_VOLUME))
+
+        voice_id = self._cached_voice(config)
+        if voice_id:
+            try:
+                engine.setProperty('voice', voice_id)
+            except Exception:
+                voice_id = None  # voice was uninstalled, resolve it again
+        if not voice_id:
+            voice_id = self._resolve_voice(engine, config)
+            if voice_id:
+                engine.setProperty('voice', voice_id)
+            self._save_cache(config, voice_id)
+
+        self.voice_id = voice_id
+        print(f"Using voice: {voice_id}")
+        print(f"To select a different voice, run: python select_voice.py")
+        return engine
+
+    def _cache_key(self, config):
+        """Everything that would change which voice gets picked"""
+        try:
+            config_mtime = os.path.getmtime(self.config_file)
+        except OSError:
+            config_mtime = None
+        return {
+            'config_voice_id': config.get('voice_id'),
+            'config_mtime': config_mtime,
+            'platform': platform.platform(),
+        }
+
+    def _cached_voice(self, config):
+        """Voice id from the cache file, or None if missing or stale"""
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except Exception:
+            return None
+        if cache.get('key') != self._cache_key(config):
+            return None
+        if time.time() - cache.get('resolved_at', 0) > CACHE_MAX_AGE:
+            return None
+        return cache.get('voice_id')
+
+    def _save_cache(self, config, voice_id):
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump({'key': self._cache_key(config), 'voice_id': voice_id, 'resolved_at': time.time()}, f, indent=2)
+        except Exception as e:
+            print(f"Could not save voice cache: {e}")
+
+    def _resolve_voice(self, engine, config):
+        """Enumerate the installed voices once and pick the best match"""
+        voices = engine.getProperty('voices') or []
+
+        # Saved preference from select_voice.py
+        saved_id = config.get('voice_id')
+        for voice in voices:
+            if voice.id == saved_id:
+                print(f"Using saved voice preference: {voice.name}")
+                return voice.id
+
+        print("No saved voice preference found, searching for a female voice...")
+        for female_name in FEMALE_NAMES:
+            for voice in voices:
+                if female_name in voice.id.lower() or female_name in (voice.name or "").lower():
+                    print(f"Selected female voice: {voice.name}")
+                    return voice.id
+
+        # Fallback to any available voice (second one is often female in default setup)
+        if voices:
+            fallback = voices[1] if len(voices) > 1 else voices[0]
+            print(f"Using fallback voice: {fallback.name}")
+            return fallback.id
+        return None
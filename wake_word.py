@@ -0,0 +1,271 @@
+"""
+Offline wake word detection for Jarvis
+Runs a small energy VAD plus an MFCC template matcher over the microphone
+stream, so only audio that follows "jarvis" is sent to speech recognition.
+
+Record templates with:  python wake_word.py --enroll
+"""
+
+import audioop                    # for energy and resampling
+import glob                       # for finding template files
+import os                         # for file paths
+import sys                        # for command line arguments
+import time                       # for timing
+import wave                       # for reading and writing WAV files
+
+import numpy as np                # for MFCC features and DTW
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wake_word_templates")
+
+# Feature settings (25 ms windows every 10 ms, 13 cepstral coefficients)
+WINDOW_SECONDS = 0.025
+STEP_SECONDS = 0.010
+MEL_FILTERS = 26
+MFCC_COUNT = 13
+
+# Default DTW distance under which a segment counts as the wake word
+DEFAULT_THRESHOLD = 0.25
+
+
+def read_wav(path, sample_rate=None):
+    """Read a WAV file as mono 16-bit PCM, optionally resampled"""
+    with wave.open(path, 'rb') as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+
+    if channels > 1:
+        data = audioop.tomono(data, width, 0.5, 0.5)
+    if width != 2:
+        data = audioop.lin2lin(data, width, 2)
+    if sample_rate and rate != sample_rate:
+        data, _ = audioop.ratecv(data, 2, 1, rate, sample_rate, None)
+        rate = sample_rate
+    return data, rate
+
+
+def _mel_filterbank(sample_rate, fft_size):
+    """Build triangular mel filters for the given FFT size"""
+    def hz_to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700 * (10 ** (mel / 2595.0) - 1)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sample_rate / 2), MEL_FILTERS + 2)
+    bins = np.floor((fft_size + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+
+    filters = np.zeros((MEL_FILTERS, fft_size // 2 + 1))
+    for i in range(1, MEL_FILTERS + 1):
+        left, center, right = bins[i - 1], bins[i], bins[i + 1]
+        for k in range(left, center):
+            filters[i - 1, k] = (k - left) / max(center - left, 1)
+        for k in range(center, right):
+            filters[i - 1, k] = (right - k) / max(right - center, 1)
+    return filters
+
+
+_filterbank_cache = {}
+
+
+def mfcc(pcm, sample_rate):
+    """Compute normalized MFCC frames (one row per 10 ms) from 16-bit PCM"""
+    signal = np.frombuffer(pcm, dtype='<i2').astype(np.float64)
+    window = int(sample_rate * WINDOW_SECONDS)
+    step = int(sample_rate * STEP_SECONDS)
+    if len(signal) < window:
+        return np.zeros((0, MFCC_COUNT))
+
+    # Pre-emphasis boosts the high frequencies that carry consonants
+    signal = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+
+    frame_count = 1 + (len(signal) - window) // step
+    indices = np.arange(window)[None, :] + step * np.arange(frame_count)[:, None]
+    frames = signal[indices] * np.hamming(window)
+
+    fft_size = 1 << (window - 1).bit_length()
+    key = (sample_rate, fft_size)
+    if key not in _filterbank_cache:
+        _filterbank_cache[key] = _mel_filterbank(sample_rate, fft_size)
+        n = np.arange(MEL_FILTERS)
+        _filterbank_cache[key + ('dct',)] = np.cos(np.pi / MEL_FILTERS * (n[None, :] + 0.5) * np.arange(MFCC_COUNT)[:, None])
+
+    power = (np.abs(np.fft.rfft(frames, fft_size)) ** 2) / fft_size
+    energies = np.log(np.maximum(power @ _filterbank_cache[key].T, 1e-10))
+    features = energies @ _filterbank_cache[key + ('dct',)].T
+
+    # Cepstral mean and variance normalization makes matching robust to volume and mic
+    features -= features.mean(axis=0)
+    features /= features.std(axis=0) + 1e-8
+    return features
+
+
+def dtw_prefix_distance(template, segment):
+    """Best normalized DTW distance between a template and a prefix of segment
+
+    Returns (distance, end_frame) where end_frame is the segment frame at
+    which the template match ends, so audio after it can be kept.
+    """
+    n, m = len(template), len(segment)
+    if n == 0 or m == 0:
+        return float('inf'), 0
+
+    # Cosine distance between every template frame and every segment frame
+    a = template / (np.linalg.norm(template, axis=1, keepdims=True) + 1e-8)
+    b = segment / (np.linalg.norm(segment, axis=1, keepdims=True) + 1e-8)
+    cost = 1 - a @ b.T
+
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0
+    for i in range(1, n + 1):
+        row = cost[i - 1]
+        prev = acc[i - 1]
+        current = acc[i]
+        for j in range(1, m + 1):
+            current[j] = row[j - 1] + min(prev[j], prev[j - 1], current[j - 1])
+
+    # Open end: the spoken keyword may be faster or slower than the template
+    low, high = max(1, int(n * 0.6)), min(m, int(n * 1.6))
+    if low > high:
+        return float('inf'), 0
+    ends = np.arange(low, high + 1)
+    scores = acc[n, low:high + 1] / (n + ends)
+    best = int(np.argmin(scores))
+    return float(scores[best]), int(ends[best])
+
+
+class WakeWordDetector(object):
+    """Streaming keyword spotter fed one audio frame at a time"""
+
+    def __init__(self, sample_rate, sample_width=2, template_dir=TEMPLATE_DIR, threshold=DEFAULT_THRESHOLD):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.threshold = threshold
+        self.templates = []
+        for path in sorted(glob.glob(os.path.join(template_dir, "*.wav"))):
+            pcm, _ = read_wav(path, sample_rate)
+            features = mfcc(pcm, sample_rate)
+            if len(features):
+                self.templates.append(features)
+
+        longest = max((len(t) for t in self.templates), default=0)
+        self.max_segment_seconds = longest * 1.6 * STEP_SECONDS + WINDOW_SECONDS
+        self.pause_seconds = 0.3  # silence that ends a segment
+        self.preroll_frames = 2
+        self.last_distance = None
+        self.reset()
+
+    @property
+    def ready(self):
+        """True when at least one template has been enrolled"""
+        return bool(self.templates)
+
+    def reset(self):
+        """Forget any partial segment"""
+        self.segment = []
+        self.preroll = []
+        self.silence = 0.0
+        self.waiting_for_silence = False
+
+    def feed(self, frame, energy_threshold):
+        """Feed one frame; returns the unread frames after the keyword on a detection, otherwise None"""
+        seconds = len(frame) / float(self.sample_width * self.sample_rate)
+        speaking = audioop.rms(frame, self.sample_width) > energy_threshold
+
+        if self.waiting_for_silence:
+            # A segment already failed to match; skip the rest of that utterance
+            self.silence = 0.0 if speaking else self.silence + seconds
+            if self.silence >= self.pause_seconds:
+                self.reset()
+            return None
+
+        if not self.segment:
+            if not speaking:
+                self.preroll = (self.preroll + [frame])[-self.preroll_frames:]
+                return None
+            self.segment = self.preroll + [frame]
+            self.preroll = []
+            return None
+
+        self.segment.append(frame)
+        self.silence = 0.0 if speaking else self.silence + seconds
+        segment_seconds = sum(len(f) for f in self.segment) / float(self.sample_width * self.sample_rate)
+        if self.silence < self.pause_seconds and segment_seconds < self.max_segment_seconds:
+            return None
+
+        remainder = self._match()
+        if remainder is None:
+            self.waiting_for_silence = self.silence < self.pause_seconds
+            if not self.waiting_for_silence:
+                self.reset()
+            return None
+        self.reset()
+        return remainder
+
+    def _match(self):
+        """Compare the current segment with every template"""
+        pcm = b"".join(self.segment)
+        features = mfcc(pcm, self.sample_rate)
+        best_distance, best_end = float('inf'), 0
+        for template in self.templates:
+            distance, end = dtw_prefix_distance(template, features)
+            if distance < best_distance:
+                best_distance, best_end = distance, end
+        self.last_distance = best_distance
+        if best_distance > self.threshold:
+            return None
+
+        # Return whole frames that start after the matched keyword
+        end_byte = int(best_end * STEP_SECONDS * self.sample_rate) * self.sample_width
+        remainder, offset = [], 0
+        for frame in self.segment:
+            if offset >= end_byte:
+                remainder.append(frame)
+            offset += len(frame)
+        return remainder
+
+
+def wait_for_wake_word(source, detector, recognizer, timeout=None):
+    """Read frames from a BufferedMicrophone until the wake word is heard
+
+    On a detection the audio after the keyword is pushed back into the
+    source, so the recognizer hears the rest of the command. Returns False
+    if the timeout (in seconds of audio) runs out first.
+    """
+    elapsed = 0.0
+    seconds_per_buffer = float(source.CHUNK) / source.SAMPLE_RATE
+    while timeout is None or elapsed < timeout:
+        frame = source.read_frame()
+        if not frame:
+            return False
+        elapsed += seconds_per_buffer
+        remainder = detector.feed(frame, recognizer.energy_threshold)
+        if remainder is not None:
+            source.unread(remainder)
+            return True
+    return False
+
+
+def enroll(count=3):
+    """Record a few samples of the wake word as templates"""
+    import speech_recognition as sr
+
+    os.makedirs(TEMPLATE_DIR, exist_ok=True)
+    recognizer = sr.Recognizer()
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        for i in range(count):
+            print(f"\n🎤 Say 'Jarvis' ({i + 1}/{count})...")
+            audio = recognizer.listen(source, timeout=10, phrase_time_limit=2)
+            path = os.path.join(TEMPLATE_DIR, f"jarvis_{int(time.time())}_{i}.wav")
+            with open(path, 'wb') as f:
+                f.write(audio.get_wav_data(convert_width=2))
+            print(f"✅ Saved {path}")
+
+
+if __name__ == "__main__":
+    if "--enroll" in sys.argv:
+        enroll()
+    else:
+        print("Usage: python wake_word.py --enroll")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Replay harness for the Jarvis wake word detector
+Feeds recorded WAV files through WakeWordDetector and reports detection
+latency and false-accept rate.
+
+Usage:
+    python wake_word_replay.py --positives recordings/jarvis --negatives recordings/background
+"""
+
+import argparse
+import audioop
+import glob
+import math
+import os
+import statistics
+import time
+
+import wake_word
+
+CHUNK = 1024
+
+
+def print_header(text):
+    """Print a formatted header"""
+    print("\n" + "=" * 60)
+    print(f"{text:^60}")
+    print("=" * 60 + "\n")
+
+
+def noise_threshold(pcm, sample_rate, ratio=1.5):
+    """Estimate an energy threshold from the quietest part of a recording"""
+    chunk_bytes = CHUNK * 2
+    energies = sorted(audioop.rms(pcm[i:i + chunk_bytes], 2) for i in range(0, len(pcm) - chunk_bytes + 1, chunk_bytes))
+    if not energies:
+        return 300
+    return max(300, energies[len(energies) // 10] * ratio)
+
+
+def replay_file(detector, path, threshold=None):
+    """Replay one WAV file, returning (detections, audio_seconds, processing_seconds)
+
+    Each detection is the audio time (seconds from the start of the file)
+    at which the detector fired.
+    """
+    pcm, rate = wake_word.read_wav(path, detector.sample_rate)
+    energy_threshold = threshold or noise_threshold(pcm, rate)
+    detector.reset()
+
+    detections = []
+    processing = 0.0
+    chunk_bytes = CHUNK * 2
+    for offset in range(0, len(pcm), chunk_bytes):
+        frame = pcm[offset:offset + chunk_bytes]
+        started = time.perf_counter()
+        remainder = detector.feed(frame, energy_threshold)
+        processing += time.perf_counter() - started
+        if remainder is not None:
+            detections.append((offset + len(frame)) / float(2 * rate))
+
+    # Flush a trailing segment by feeding a little silence
+    silence = b"\x00" * chunk_bytes
+    for _ in range(int(detector.pause_seconds * rate / CHUNK) + 2):
+        if detector.feed(silence, energy_threshold) is not None:
+            detections.append(len(pcm) / float(2 * rate))
+    return detections, len(pcm) / float(2 * rate), processing
+
+
+def speech_end(path, sample_rate):
+    """Audio time at which the loudest part of the recording ends"""
+    pcm, rate = wake_word.read_wav(path, sample_rate)
+    threshold = noise_threshold(pcm, rate)
+    chunk_bytes = CHUNK * 2
+    last = 0.0
+    for offset in range(0, len(pcm), chunk_bytes):
+        if audioop.rms(pcm[offset:offset + chunk_bytes], 2) > threshold:
+            last = (offset + chunk_bytes) / float(2 * rate)
+    return last
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(math.ceil(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay WAV files through the wake word detector")
+    parser.add_argument("--positives", help="directory of WAV files that contain the wake word")
+    parser.add_argument("--negatives", help="directory of WAV files without the wake word")
+    parser.add_argument("--templates", default=wake_word.TEMPLATE_DIR, help="directory of wake word templates")
+    parser.add_argument("--threshold", type=float, default=wake_word.DEFAULT_THRESHOLD, help="DTW distance threshold")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    args = parser.parse_args()
+
+    detector = wake_word.WakeWordDetector(args.sample_rate, template_dir=args.templates, threshold=args.threshold)
+    if not detector.ready:
+        print(f"❌ No templates found in {args.templates}. Run: python wake_word.py --enroll")
+        return 1
+
+    print_header("Wake Word Replay")
+    print(f"Templates: {len(detector.templates)}  Threshold: {args.threshold}")
+
+    positives = sorted(glob.glob(os.path.join(args.positives, "*.wav"))) if args.positives else []
+    negatives = sorted(glob.glob(os.path.join(args.negatives, "*.wav"))) if args.negatives else []
+
+    latencies, processing_times = [], []
+    hits = misses = 0
+    for path in positives:
+        detections, seconds, processing = replay_file(detector, path)
+        processing_times.append(processing / max(seconds, 1e-9))
+        if detections:
+            hits += 1
+            latency = max(0.0, detections[0] - speech_end(path, args.sample_rate))
+            latencies.append(latency)
+            print(f"✅ {os.path.basename(path)}: detected at {detections[0]:.2f}s (latency {latency * 1000:.0f} ms)")
+        else:
+            misses += 1
+            print(f"❌ {os.path.basename(path)}: missed (best distance {detector.last_distance})")
+
+    false_accepts = 0
+    negative_seconds = 0.0
+    negative_files = 0
+    for path in negatives:
+        detections, seconds, processing = replay_file(detector, path)
+        processing_times.append(processing / max(seconds, 1e-9))
+        negative_files += 1
+        negative_seconds += seconds
+        false_accepts += len(detections)
+        if detections:
+            print(f"⚠️  {os.path.basename(path)}: false accept at {', '.join(f'{d:.2f}s' for d in detections)}")
+
+    print_header("Summary")
+    if hits + misses:
+        print(f"Detection rate: {hits}/{hits + misses} ({hits / float(hits + misses) * 100:.1f}%)")
+    if latencies:
+        print(f"Latency after speech end: p50 {percentile(latencies, 50) * 1000:.0f} ms, "
+              f"p95 {percentile(latencies, 95) * 1000:.0f} ms, mean {statistics.mean(latencies) * 1000:.0f} ms")
+    if negative_files:
+        per_hour = false_accepts / (negative_seconds / 3600.0) if negative_seconds else 0.0
+        print(f"False accepts: {false_accepts} in {negative_files} files "
+              f"({false_accepts / float(negative_files):.2f} per file, {per_hour:.1f} per hour of audio)")
+    if processing_times:
+        print(f"Real-time factor: {statistics.mean(processing_times):.3f} (processing time / audio time)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())